@@ -0,0 +1,211 @@
+from concurrent.futures import ProcessPoolExecutor
+from django.db import connections
+from django.db.models import Max, Min, Sum, OuterRef, F, Value, BigIntegerField, DecimalField
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from decimal import Decimal
+from .models import AuditCheckpoint, FinancialAccount, Transaction
+from .snapshots import latest_snapshot
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _audit_shard(bounds, chunk_size):
+    """Process pool entry point; each worker opens its own connection"""
+    start, end = bounds
+    return AccountAuditor.audit_range(start, end, chunk_size)
+
+class AccountAuditor:
+    """Compares stored balances with the sum of each account's transactions.
+
+    Expected balances start from each account's newest ``BalanceSnapshot``
+    plus one grouped ``SUM`` over the transactions after it, per account id
+    range. It is merge-joined against the accounts, with both sides streamed in id
+    order by ``iterator(chunk_size=...)``, so memory stays flat whatever the
+    number of accounts. Ranges can be spread over a process pool. An
+    incremental run only re-audits accounts touched since the last
+    checkpoint.
+    """
+
+    CHUNK_SIZE = 2000
+    CHECKPOINT = 'balances'
+
+    @staticmethod
+    def compare(accounts, totals):
+        """Merge ``(id, balance, snapshot_balance)`` and ``(account_id, total)`` rows
+
+        Both sides must be in id order. Yields a discrepancy dict for each account whose balance differs.
+        """
+        totals = iter(totals)
+        pending = next(totals, None)
+        for account_id, balance, expected in accounts:
+            while pending is not None and pending[0] < account_id:
+                pending = next(totals, None)
+
+            if pending is not None and pending[0] == account_id:
+                expected += pending[1] or Decimal('0')
+                pending = next(totals, None)
+
+            if balance != expected:
+                yield {
+                    'account_id': account_id,
+                    'current_balance': balance,
+                    'expected_balance': expected,
+                    'difference': balance - expected
+                }
+
+    @staticmethod
+    def audit(accounts, transactions, chunk_size=None):
+        """Audit the accounts in ``accounts`` against ``transactions``
+
+        Returns ``(accounts_checked, discrepancies)``.
+        """
+        chunk_size = chunk_size or AccountAuditor.CHUNK_SIZE
+        checked = [0]
+
+        def account_rows():
+            rows = accounts.annotate(
+                snapshot_balance=Coalesce(
+                    latest_snapshot(OuterRef('pk'), 'balance'),
+                    Value(Decimal('0')),
+                    output_field=DecimalField(max_digits=18, decimal_places=8)
+                )
+            ).order_by('id').values_list('id', 'balance', 'snapshot_balance')
+            for row in rows.iterator(chunk_size=chunk_size):
+                checked[0] += 1
+                yield row
+
+        totals = transactions.annotate(
+            snapshot_mark=Coalesce(
+                latest_snapshot(OuterRef('account_id'), 'high_water_mark'),
+                Value(0),
+                output_field=BigIntegerField()
+            )
+        ).filter(
+            id__gt=F('snapshot_mark')
+        ).values('account_id').annotate(
+            total=Sum('amount')
+        ).order_by('account_id').values_list('account_id', 'total').iterator(
+            chunk_size=chunk_size
+        )
+
+        discrepancies = list(AccountAuditor.compare(account_rows(), totals))
+        return checked[0], discrepancies
+
+    @staticmethod
+    def audit_range(start, end, chunk_size=None):
+        """Audit accounts with ``start <= id < end``"""
+        return AccountAuditor.audit(
+            FinancialAccount.objects.filter(id__gte=start, id__lt=end),
+            Transaction.objects.filter(account_id__gte=start, account_id__lt=end),
+            chunk_size
+        )
+
+    @staticmethod
+    def audit_ids(account_ids, chunk_size=None):
+        """Audit a given set of accounts, ``chunk_size`` ids per query"""
+        chunk_size = chunk_size or AccountAuditor.CHUNK_SIZE
+        account_ids = sorted(account_ids)
+        checked, discrepancies = 0, []
+        for i in range(0, len(account_ids), chunk_size):
+            chunk = account_ids[i:i + chunk_size]
+            chunk_checked, chunk_discrepancies = AccountAuditor.audit(
+                FinancialAccount.objects.filter(id__in=chunk),
+                Transaction.objects.filter(account_id__in=chunk),
+                chunk_size
+            )
+            checked += chunk_checked
+            discrepancies.extend(chunk_discrepancies)
+        return checked, discrepancies
+
+    @staticmethod
+    def shard_ranges(shards):
+        """Split the account id range into ``shards`` half-open ranges"""
+        bounds = FinancialAccount.objects.aggregate(low=Min('id'), high=Max('id'))
+        if bounds['low'] is None:
+            return []
+
+        low, high = bounds['low'], bounds['high'] + 1
+        step = max((high - low + shards - 1) // shards, 1)
+        return [(start, min(start + step, high)) for start in range(low, high, step)]
+
+    @staticmethod
+    def audit_all(workers=1, chunk_size=None):
+        """Audit every account, spread over ``workers`` processes"""
+        if workers <= 1:
+            return AccountAuditor.audit(
+                FinancialAccount.objects.all(),
+                Transaction.objects.all(),
+                chunk_size
+            )
+
+        # Several ranges per worker so one dense range does not hold up the run
+        ranges = AccountAuditor.shard_ranges(workers * 4)
+
+        # Forked workers must not share the parent's database connection
+        connections.close_all()
+        checked, discrepancies = 0, []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                _audit_shard,
+                ranges,
+                [chunk_size] * len(ranges)
+            )
+            for shard_checked, shard_discrepancies in results:
+                checked += shard_checked
+                discrepancies.extend(shard_discrepancies)
+        return checked, discrepancies
+
+    @staticmethod
+    def touched_since(since):
+        """Ids of accounts whose balance or transactions changed since ``since``"""
+        touched = set(
+            FinancialAccount.objects.filter(updated_at__gte=since).values_list('id', flat=True)
+        )
+        touched.update(
+            Transaction.objects.filter(updated_at__gte=since).values_list(
+                'account_id', flat=True
+            ).distinct()
+        )
+        return touched
+
+    @staticmethod
+    def run(incremental=False, workers=1, chunk_size=None):
+        """Run an audit and advance the checkpoint
+
+        An incremental run without a previous checkpoint audits everything.
+        The checkpoint is the run's start time, so changes made while it
+        runs are picked up by the next one.
+        """
+        started_at = timezone.now()
+        checkpoint = AuditCheckpoint.objects.filter(name=AccountAuditor.CHECKPOINT).first()
+
+        if incremental and checkpoint:
+            checked, discrepancies = AccountAuditor.audit_ids(
+                AccountAuditor.touched_since(checkpoint.checkpoint_at),
+                chunk_size
+            )
+        else:
+            checked, discrepancies = AccountAuditor.audit_all(workers, chunk_size)
+
+        AuditCheckpoint.objects.update_or_create(
+            name=AccountAuditor.CHECKPOINT,
+            defaults={
+                'checkpoint_at': started_at,
+                'accounts_checked': checked,
+                'discrepancies': len(discrepancies)
+            }
+        )
+        logger.info(f"Audited {checked} accounts, found {len(discrepancies)} discrepancies")
+        return checked, discrepancies
+
+    @staticmethod
+    def fix(discrepancy):
+        """Set the balance to the expected value if it is still the audited one"""
+        return FinancialAccount.objects.filter(
+            pk=discrepancy['account_id'],
+            balance=discrepancy['current_balance']
+        ).update(
+            balance=discrepancy['expected_balance'],
+            updated_at=timezone.now()
+        ) == 1
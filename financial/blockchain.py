@@ -1,184 +1,270 @@
 from .patches import *
-from web3 import Web3
-from bitcoin import rpc
 from django.conf import settings
-import requests
-import json
 from decimal import Decimal
 from .logging import TransactionLogger
+from .rpc import AsyncJsonRpcClient
+import asyncio
+import logging
+import os
+import threading
 
-class BlockchainAPI:
-    def __init__(self):
-        self.logger = TransactionLogger()
-        # Initialize blockchain connections
-        self.btc_client = rpc.RawProxy(service_url=settings.BITCOIN_RPC_URL)
-        self.web3 = Web3(Web3.HTTPProvider(settings.ETHEREUM_RPC_URL))
+logger = logging.getLogger('blockchain')
 
-    def send_transaction(self, network, to_address, amount):
-        """Send transaction to blockchain"""
-        try:
-            tx_hash = None
+class AsyncBlockchainClient:
+    """Process-wide asyncio client for the Bitcoin, Ethereum and Tron nodes.
+
+    Each network gets one pooled ``httpx`` client, created on first use,
+    with a request timeout and a cap on concurrent requests. The clients
+    live on a private event loop in a daemon thread, so every caller shares
+    the same connections: synchronous code calls ``run`` or uses a
+    ``sync_client``, and Channels consumers ``await arun(...)`` without
+    blocking their own loop. The loop thread does not survive a fork, so a
+    forked worker starts its own loop and connections on first use.
+
+    Nothing here signs transactions; withdrawals only go out through
+    ``WithdrawalDispatcher``, which owns the wallet nonces.
+    """
+
+    WEI = Decimal(10) ** 18
+    USDT_UNIT = Decimal('1000000')
+    GAS_LIMIT = 21000
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, clients=None, timeout=None, max_connections=None):
+        self.timeout = timeout or getattr(settings, 'BLOCKCHAIN_TIMEOUT', 10)
+        self.max_connections = max_connections or getattr(
+            settings, 'BLOCKCHAIN_MAX_CONNECTIONS', 10
+        )
+        # {network: AsyncJsonRpcClient or httpx.AsyncClient}, filled lazily
+        self.clients = dict(clients or {})
+        self.sync_clients = {}
+        self._loop = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """Return the process-wide client, creating it on first use"""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    @property
+    def loop(self):
+        if self._loop is None or self._pid != os.getpid():
+            with self._lock:
+                if self._pid is not None and self._pid != os.getpid():
+                    # Forked: the loop thread stayed in the parent, and its
+                    # connections must not be shared with it
+                    self._loop = None
+                    self.clients = {}
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(
+                        target=loop.run_forever,
+                        name='blockchain-client',
+                        daemon=True
+                    ).start()
+                    self._loop = loop
+                    self._pid = os.getpid()
+        return self._loop
+
+    def submit(self, coro):
+        """Schedule ``coro`` on the client loop; returns a concurrent future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro):
+        """Run ``coro`` on the client loop and wait for its result"""
+        return self.submit(coro).result()
+
+    async def arun(self, coro):
+        """Await ``coro`` on the client loop from another event loop"""
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def client(self, network):
+        """Connection for ``network``; only call this on the client loop"""
+        if network not in self.clients:
             if network == 'BTC':
-                tx_hash = self.send_btc(to_address, amount)
+                client = AsyncJsonRpcClient(
+                    settings.BITCOIN_RPC_URL, timeout=self.timeout,
+                    max_connections=self.max_connections
+                )
             elif network == 'ETH':
-                tx_hash = self.send_eth(to_address, amount)
+                client = AsyncJsonRpcClient(
+                    settings.ETHEREUM_RPC_URL, timeout=self.timeout,
+                    max_connections=self.max_connections
+                )
             elif network == 'USDT':
-                tx_hash = self.send_usdt(to_address, amount)
+                client = AsyncJsonRpcClient.create_client(
+                    self.timeout, self.max_connections,
+                    base_url=settings.TRON_API_URL
+                )
+            elif network == 'TRON_RPC':
+                # TronGrid's Ethereum-compatible JSON-RPC endpoint
+                client = AsyncJsonRpcClient(
+                    f'{settings.TRON_API_URL}/jsonrpc', timeout=self.timeout,
+                    max_connections=self.max_connections
+                )
             else:
                 raise ValueError(f"Unsupported network: {network}")
+            self.clients[network] = client
+        return self.clients[network]
 
-            self.logger.log_blockchain_transaction(
-                network=network,
-                tx_type='withdrawal',
-                amount=amount,
-                address=to_address,
-                tx_hash=tx_hash,
-                status='sent'
-            )
-            return tx_hash
+    def sync_client(self, network):
+        """Blocking client for ``network`` over the shared connections"""
+        if network not in self.sync_clients:
+            self.sync_clients[network] = LoopClient(self, network)
+        return self.sync_clients[network]
 
-        except Exception as e:
-            self.logger.log_error(
-                'blockchain_send',
-                str(e),
-                f"Network={network}, Address={to_address}, Amount={amount}"
-            )
-            raise
+    async def get_confirmations(self, network, tx_hash):
+        if network == 'BTC':
+            tx = await self.client('BTC').call('getrawtransaction', tx_hash, True)
+            return (tx or {}).get('confirmations', 0)
 
-    def send_btc(self, to_address, amount):
-        """Send Bitcoin transaction"""
-        try:
-            # Convert amount to BTC (from satoshis if needed)
-            amount_btc = float(amount)
-            
-            # Create and send transaction
-            tx_hash = self.btc_client.sendtoaddress(to_address, amount_btc)
-            
-            return tx_hash
-            
-        except Exception as e:
-            print(f"Error sending BTC: {str(e)}")
-            raise
+        if network == 'ETH':
+            eth = self.client('ETH')
+            tx, tip = await eth.batch([
+                ('eth_getTransactionByHash', [tx_hash]),
+                ('eth_blockNumber', [])
+            ])
+            if tx and tx.get('blockNumber') and tip:
+                return int(tip, 16) - int(tx['blockNumber'], 16)
+            return 0
 
-    def send_eth(self, to_address, amount):
-        """Send Ethereum transaction"""
-        try:
-            # Get nonce
-            nonce = self.web3.eth.get_transaction_count(
-                settings.ETH_WALLET_ADDRESS, 
-                'latest'
+        if network == 'USDT':
+            response = await self.client('USDT').get(
+                '/transaction-info', params={'hash': tx_hash}
             )
-            
-            # Convert amount to Wei
-            amount_wei = self.web3.to_wei(float(amount), 'ether')
-            
-            # Prepare transaction
-            transaction = {
-                'nonce': nonce,
-                'to': to_address,
-                'value': amount_wei,
-                'gas': 21000,
-                'gasPrice': self.web3.eth.gas_price,
-                'chainId': settings.ETH_CHAIN_ID
-            }
-            
-            # Sign transaction
-            signed_txn = self.web3.eth.account.sign_transaction(
-                transaction,
-                settings.ETH_PRIVATE_KEY
+            data = response.json()
+            return data.get('confirmations', 0) if data.get('confirmed', False) else 0
+
+        raise ValueError(f"Unsupported network: {network}")
+
+    async def get_balance(self, network):
+        """Hot wallet balance in whole coins"""
+        if network == 'BTC':
+            return Decimal(str(await self.client('BTC').call('getbalance')))
+
+        if network == 'ETH':
+            balance = await self.client('ETH').call(
+                'eth_getBalance', settings.ETH_WALLET_ADDRESS, 'latest'
             )
-            
-            # Send transaction
-            tx_hash = self.web3.eth.send_raw_transaction(
-                signed_txn.rawTransaction
+            return Decimal(int(balance, 16)) / self.WEI
+
+        if network == 'USDT':
+            response = await self.client('USDT').get(
+                f'/v1/accounts/{settings.TRON_WALLET_ADDRESS}'
             )
-            
-            return self.web3.to_hex(tx_hash)
-            
-        except Exception as e:
-            print(f"Error sending ETH: {str(e)}")
-            raise
+            for account in response.json().get('data', []):
+                for token in account.get('trc20', []):
+                    if settings.USDT_CONTRACT_ADDRESS in token:
+                        return Decimal(token[settings.USDT_CONTRACT_ADDRESS]) / self.USDT_UNIT
+            return Decimal('0')
 
-    def send_usdt(self, to_address, amount):
-        """Send USDT (TRC20) transaction"""
-        try:
-            # Prepare API request
-            url = f"{settings.TRON_API_URL}/wallet/triggersmartcontract"
-            
-            # Convert amount to USDT format (6 decimals)
-            amount_usdt = int(Decimal(amount) * Decimal('1000000'))
-            
-            # Contract function call data
-            data = {
-                "owner_address": settings.TRON_WALLET_ADDRESS,
-                "contract_address": settings.USDT_CONTRACT_ADDRESS,
-                "function_selector": "transfer(address,uint256)",
-                "parameter": f"{to_address},{amount_usdt}",
-                "fee_limit": 1000000,
-                "call_value": 0,
-                "visible": True
-            }
-            
-            # Sign and broadcast transaction
-            response = requests.post(url, json=data)
-            result = response.json()
-            
-            if result.get('result', {}).get('result', False):
-                return result['transaction']['txID']
+        raise ValueError(f"Unsupported network: {network}")
+
+    async def generate_deposit_address(self, network):
+        if network == 'BTC':
+            return await self.client('BTC').call('getnewaddress')
+        if network == 'ETH':
+            from eth_account import Account
+            return Account.create().address
+        if network == 'USDT':
+            # Use a different method or service for USDT address generation
+            raise NotImplementedError("USDT address generation not implemented")
+        raise ValueError(f"Unsupported network: {network}")
+
+    async def aclose(self):
+        clients, self.clients = self.clients, {}
+        for client in clients.values():
+            if isinstance(client, AsyncJsonRpcClient):
+                await client.close()
             else:
-                raise Exception("USDT transaction failed")
-            
-        except Exception as e:
-            print(f"Error sending USDT: {str(e)}")
-            raise
+                await client.aclose()
 
-    def get_btc_confirmations(self, tx_hash):
+    def close(self):
+        """Close every connection and stop the loop thread"""
+        if self._loop is None:
+            return
+        self.run(self.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+
+class LoopClient:
+    """Blocking view of one network's client on the shared loop
+
+    Offers ``call`` and ``batch`` like ``JsonRpcClient`` and ``post`` like
+    a ``requests`` session, so the poller, scanner and wallets can use the
+    process-wide connections from synchronous code.
+    """
+
+    def __init__(self, blockchain, network):
+        self.blockchain = blockchain
+        self.network = network
+
+    def _run(self, name, *args, **kwargs):
+        async def invoke():
+            client = self.blockchain.client(self.network)
+            return await getattr(client, name)(*args, **kwargs)
+        return self.blockchain.run(invoke())
+
+    def call(self, method, *params):
+        return self._run('call', method, *params)
+
+    def batch(self, calls):
+        return self._run('batch', calls)
+
+    def post(self, url, json=None, timeout=None):
+        return self._run('post', url, json=json)
+
+    def close(self):
+        """Connections belong to the shared client, which closes them"""
+        pass
+
+class BlockchainAPI:
+    """Synchronous facade over the shared ``AsyncBlockchainClient``
+
+    Creating one is cheap; every instance uses the same connections.
+    """
+
+    def __init__(self, client=None):
+        self.logger = TransactionLogger()
+        self.client = client or AsyncBlockchainClient.shared()
+
+    def get_confirmations(self, network, tx_hash):
         try:
-            tx = self.btc_client.getrawtransaction(tx_hash, True)
-            if 'confirmations' in tx:
-                return tx['confirmations']
-            return 0
+            return self.client.run(self.client.get_confirmations(network, tx_hash))
         except Exception as e:
-            print(f"Error getting BTC confirmations: {str(e)}")
+            logger.error(f"Error getting {network} confirmations: {str(e)}")
             return 0
 
+    def get_btc_confirmations(self, tx_hash):
+        return self.get_confirmations('BTC', tx_hash)
+
     def get_eth_confirmations(self, tx_hash):
-        try:
-            tx = self.web3.eth.get_transaction(tx_hash)
-            if tx and tx['blockNumber']:
-                current_block = self.web3.eth.block_number
-                return current_block - tx['blockNumber']
-            return 0
-        except Exception as e:
-            print(f"Error getting ETH confirmations: {str(e)}")
-            return 0
+        return self.get_confirmations('ETH', tx_hash)
 
     def get_usdt_confirmations(self, tx_hash):
         """Get USDT (TRC20) confirmations using Tron API directly"""
-        try:
-            url = f"{settings.TRON_API_URL}/transaction-info?hash={tx_hash}"
-            response = requests.get(url)
-            data = response.json()
-            if data.get('confirmed', False):
-                return data.get('confirmations', 0)
-            return 0
-        except Exception as e:
-            print(f"Error getting USDT confirmations: {str(e)}")
-            return 0
+        return self.get_confirmations('USDT', tx_hash)
+
+    def get_btc_balance(self):
+        return self.client.run(self.client.get_balance('BTC'))
+
+    def get_eth_balance(self):
+        return self.client.run(self.client.get_balance('ETH'))
+
+    def get_usdt_balance(self):
+        return self.client.run(self.client.get_balance('USDT'))
 
     def generate_deposit_address(self, network):
         """Generate new deposit address for given network"""
         try:
-            if network == 'BTC':
-                return self.btc_client.getnewaddress()
-            elif network == 'ETH':
-                account = self.web3.eth.account.create()
-                return account.address
-            elif network == 'USDT':
-                # Use a different method or service for USDT address generation
-                raise NotImplementedError("USDT address generation not implemented")
-            else:
-                raise ValueError(f"Unsupported network: {network}")
+            return self.client.run(self.client.generate_deposit_address(network))
         except Exception as e:
             print(f"Error generating address for {network}: {str(e)}")
             raise
@@ -0,0 +1,125 @@
+from .models import Transaction
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _hex_to_int(value):
+    return int(value, 16) if isinstance(value, str) else value
+
+class ConfirmationPoller:
+    """Batched confirmation checks for pending deposits.
+
+    Pending deposits are grouped by network. Each cycle fetches the chain
+    tip once per network, then looks up the deposits' transactions with
+    JSON-RPC batch calls over one pooled keep-alive session per node. All
+    results go to ``DepositService.process_deposit_confirmations`` in one
+    call.
+    """
+
+    BATCH_SIZE = 100
+
+    # network: (tip call or None, per-transaction method)
+    # USDT is read through TronGrid's Ethereum-compatible JSON-RPC endpoint
+    METHODS = {
+        'BTC': (None, 'getrawtransaction'),
+        'ETH': ('eth_blockNumber', 'eth_getTransactionReceipt'),
+        'USDT': ('eth_blockNumber', 'eth_getTransactionReceipt'),
+    }
+
+    _shared = None
+
+    def __init__(self, clients=None):
+        self.clients = clients if clients is not None else self.default_clients()
+
+    @staticmethod
+    def default_clients():
+        """Blocking clients over the process-wide node connections"""
+        from .blockchain import AsyncBlockchainClient
+
+        blockchain = AsyncBlockchainClient.shared()
+        return {
+            'BTC': blockchain.sync_client('BTC'),
+            'ETH': blockchain.sync_client('ETH'),
+            'USDT': blockchain.sync_client('TRON_RPC'),
+        }
+
+    @classmethod
+    def shared(cls):
+        """Process-wide poller, so worker runs reuse open connections"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    @staticmethod
+    def pending_deposits():
+        """Open deposits known only by hash
+
+        Deposits found by ``ChainScanner`` carry their block height and get
+        confirmations from the scanner instead.
+        """
+        return Transaction.objects.filter(
+            transaction_type='deposit',
+            status__in=['pending', 'processing']
+        ).exclude(
+            transaction_hash=''
+        ).exclude(
+            metadata__has_key='block_height'
+        ).select_related('account')
+
+    def fetch_confirmations(self, network, deposits):
+        """Return ``{deposit_id: confirmations}`` for deposits on one network"""
+        tip_method, tx_method = self.METHODS[network]
+        client = self.clients[network]
+
+        tip = _hex_to_int(client.call(tip_method)) if tip_method else None
+
+        confirmations = {}
+        for start in range(0, len(deposits), self.BATCH_SIZE):
+            chunk = deposits[start:start + self.BATCH_SIZE]
+            if network == 'BTC':
+                calls = [(tx_method, [d.transaction_hash, True]) for d in chunk]
+            else:
+                calls = [(tx_method, [d.transaction_hash]) for d in chunk]
+
+            for deposit, result in zip(chunk, client.batch(calls)):
+                confirmations[deposit.id] = self.count_confirmations(result, tip)
+
+        return confirmations
+
+    @staticmethod
+    def count_confirmations(result, tip):
+        if not result:
+            return 0
+        if tip is None:
+            return result.get('confirmations', 0)
+
+        block_number = _hex_to_int(result.get('blockNumber'))
+        if block_number is None:
+            return 0
+        return max(tip - block_number, 0)
+
+    def poll(self, deposits=None):
+        """Check every pending deposit once; returns the updated deposits"""
+        from .services import DepositService
+
+        deposits = list(deposits if deposits is not None else self.pending_deposits())
+        by_network = {}
+        for deposit in deposits:
+            by_network.setdefault(deposit.network, []).append(deposit)
+
+        updates = []
+        for network, network_deposits in by_network.items():
+            if network not in self.clients:
+                logger.warning(f"No confirmation client for network {network}")
+                continue
+            try:
+                confirmations = self.fetch_confirmations(network, network_deposits)
+            except Exception as e:
+                logger.error(f"Error polling {network} confirmations: {e}")
+                continue
+            updates.extend(
+                (deposit, confirmations[deposit.id])
+                for deposit in network_deposits
+            )
+
+        return DepositService.process_deposit_confirmations(updates)
@@ -1,9 +1,13 @@
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 from channels.db import database_sync_to_async
 from .models import WithdrawalRequest
+from .blockchain import AsyncBlockchainClient
 import json
+import logging
 from channels.generic.websocket import AsyncWebsocketConsumer
 
+logger = logging.getLogger(__name__)
+
 class ManagementConsumer(AsyncJsonWebsocketConsumer):
     async def connect(self):
         # Check permissions
@@ -89,8 +93,32 @@ class WithdrawalConsumer(AsyncWebsocketConsumer):
         )
 
     async def receive(self, text_data):
-        """Handle incoming messages (if needed)"""
-        pass
+        """Answer ``check_confirmations`` with a live count from the node"""
+        try:
+            message = json.loads(text_data)
+        except json.JSONDecodeError:
+            return
+        if message.get('type') != 'check_confirmations':
+            return
+
+        withdrawal = await self.get_withdrawal()
+        if not withdrawal.transaction_hash:
+            return
+
+        client = AsyncBlockchainClient.shared()
+        try:
+            confirmations = await client.arun(
+                client.get_confirmations(withdrawal.network, withdrawal.transaction_hash)
+            )
+        except Exception as e:
+            logger.error(f"Error checking withdrawal {withdrawal.id} confirmations: {e}")
+            return
+
+        await self.send(text_data=json.dumps({
+            'type': 'confirmations',
+            'withdrawal_id': withdrawal.id,
+            'confirmations': confirmations
+        }))
 
     async def withdrawal_update(self, event):
         """Handle withdrawal update message"""
@@ -100,6 +128,10 @@ class WithdrawalConsumer(AsyncWebsocketConsumer):
             'data': event['data']
         }))
 
+    @database_sync_to_async
+    def get_withdrawal(self):
+        return WithdrawalRequest.objects.get(id=self.withdrawal_id)
+
     @database_sync_to_async
     def can_access_withdrawal(self):
         """Check if user can access this withdrawal"""
@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from channels.layers import get_channel_layer
+from asgiref.sync import async_to_sync
+from .models import FinancialAccount
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Seconds during which balance changes of one account are coalesced
+BALANCE_EVENT_WINDOW = getattr(settings, 'BALANCE_EVENT_WINDOW', 0.5)
+
+class BalanceEventPublisher:
+    """Coalesced, after-commit ``balance_update`` WebSocket events.
+
+    ``schedule`` only registers an on-commit hook. After commit, the first
+    change in a window claims a cache key and queues one delayed publish;
+    further changes in the same window are absorbed by that publish, which
+    reads the committed balance when it runs.
+    """
+
+    @staticmethod
+    def pending_key(account_id):
+        return f'balance_event_pending:{account_id}'
+
+    @staticmethod
+    def schedule(account_id):
+        """Publish the balance of ``account_id`` once the transaction commits"""
+        transaction.on_commit(lambda: BalanceEventPublisher.enqueue(account_id))
+
+    @staticmethod
+    def enqueue(account_id):
+        """Queue a publish unless one is already pending for the account"""
+        from .tasks import publish_balance_update
+
+        key = BalanceEventPublisher.pending_key(account_id)
+        if not cache.add(key, 1, timeout=int(BALANCE_EVENT_WINDOW) + 30):
+            return
+
+        try:
+            publish_balance_update.apply_async(
+                args=[account_id],
+                countdown=BALANCE_EVENT_WINDOW
+            )
+        except Exception as e:
+            cache.delete(key)
+            logger.error(f"Error queueing balance update for account {account_id}: {e}")
+
+    @staticmethod
+    def publish(account_id):
+        """Send the current balance of ``account_id`` to its owner"""
+        # Clear the marker first so changes committed from now on queue a
+        # new publish instead of being lost
+        cache.delete(BalanceEventPublisher.pending_key(account_id))
+
+        row = FinancialAccount.objects.filter(
+            pk=account_id
+        ).values_list('user_id', 'balance').first()
+        if row is None:
+            return
+
+        user_id, balance = row
+        channel_layer = get_channel_layer()
+        async_to_sync(channel_layer.group_send)(
+            f'user_balance_{user_id}',
+            {
+                'type': 'balance_update',
+                'balance': str(balance)
+            }
+        )
@@ -0,0 +1,170 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import hashlib
+import json
+import threading
+import time
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self._data = data
+        self.status_code = status_code
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise ValueError(f"HTTP {self.status_code}")
+
+class FakeNodeSession:
+    """Drop-in for ``requests.Session`` that answers from a ``FakeNode``"""
+
+    def __init__(self, node):
+        self.node = node
+
+    def post(self, url, json=None, timeout=None):
+        return FakeResponse(self.node.handle(json))
+
+    def close(self):
+        pass
+
+class FakeNode:
+    """In-process stand-in for a Bitcoin or Ethereum-style JSON-RPC node.
+
+    Tests pass ``session()`` to ``JsonRpcClient`` or ``transport()`` to an
+    ``httpx`` client; benchmarks call ``serve``
+    to talk to it over real HTTP. ``requests`` and ``calls`` count HTTP
+    requests and individual RPC calls, and ``latency`` adds a per-request
+    delay.
+    """
+
+    def __init__(self, tip=1000, latency=0):
+        self.tip = tip
+        self.latency = latency
+        self.transactions = {}
+        self.sent = []
+        self.requests = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def add_transaction(self, tx_hash, block_number=None):
+        """Add a transaction; ``None`` leaves it unconfirmed in the mempool"""
+        self.transactions[tx_hash] = block_number
+
+    def mine(self, blocks=1):
+        self.tip += blocks
+
+    def session(self):
+        return FakeNodeSession(self)
+
+    def transport(self):
+        """``httpx`` transport for ``AsyncJsonRpcClient`` tests"""
+        import httpx
+
+        return httpx.MockTransport(
+            lambda request: httpx.Response(200, json=self.handle(json.loads(request.content)))
+        )
+
+    def handle(self, payload):
+        """Answer a single JSON-RPC request or a batch"""
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        if isinstance(payload, list):
+            return [self.dispatch(request) for request in payload]
+        return self.dispatch(payload)
+
+    def dispatch(self, request):
+        with self._lock:
+            self.calls += 1
+
+        handler = getattr(self, f"rpc_{request['method']}", None)
+        if handler is None:
+            return {
+                'jsonrpc': '2.0',
+                'id': request.get('id'),
+                'error': {'code': -32601, 'message': 'Method not found'}
+            }
+        return {
+            'jsonrpc': '2.0',
+            'id': request.get('id'),
+            'result': handler(*request.get('params', []))
+        }
+
+    def rpc_eth_blockNumber(self):
+        return hex(self.tip)
+
+    def rpc_eth_getTransactionReceipt(self, tx_hash):
+        if tx_hash not in self.transactions:
+            return None
+        block_number = self.transactions[tx_hash]
+        return {
+            'transactionHash': tx_hash,
+            'blockNumber': hex(block_number) if block_number is not None else None,
+            'status': '0x1'
+        }
+
+    def rpc_eth_getTransactionByHash(self, tx_hash):
+        if tx_hash not in self.transactions:
+            return None
+        block_number = self.transactions[tx_hash]
+        return {
+            'hash': tx_hash,
+            'blockNumber': hex(block_number) if block_number is not None else None
+        }
+
+    def rpc_getblockcount(self):
+        return self.tip
+
+    def rpc_getrawtransaction(self, tx_hash, verbose=False):
+        if tx_hash not in self.transactions:
+            return None
+        block_number = self.transactions[tx_hash]
+        tx = {'txid': tx_hash}
+        if block_number is not None:
+            tx['confirmations'] = self.tip - block_number + 1
+        return tx
+
+    def rpc_eth_gasPrice(self):
+        return hex(20 * 10 ** 9)
+
+    def rpc_eth_getTransactionCount(self, address, block='latest'):
+        return hex(len(self.sent))
+
+    def rpc_eth_sendRawTransaction(self, raw):
+        with self._lock:
+            self.sent.append(raw)
+        return '0x' + hashlib.sha256(raw.encode()).hexdigest()
+
+    def rpc_sendmany(self, account, amounts):
+        with self._lock:
+            self.sent.append(amounts)
+        return hashlib.sha256(json.dumps(amounts, sort_keys=True).encode()).hexdigest()
+
+    def serve(self, host='127.0.0.1', port=0):
+        """Serve the node over HTTP in a daemon thread; returns (server, url)"""
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.dumps(node.handle(json.loads(self.rfile.read(length))))
+                data = body.encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        return server, f'http://{host}:{server.server_address[1]}/'
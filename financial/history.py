@@ -0,0 +1,95 @@
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from datetime import datetime, time, timedelta
+from .models import Transaction
+import base64
+
+class TransactionHistory:
+    """Keyset pagination over an account's transactions, newest first.
+
+    The cursor is the ``(created_at, id)`` of the last row shown, so every
+    page is an index range scan on ``(account_id, created_at, id)`` that
+    does not get slower with depth, unlike ``OFFSET``.
+    """
+
+    PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 200
+
+    @staticmethod
+    def encode_cursor(transaction):
+        raw = f'{transaction.created_at.isoformat()}|{transaction.id}'
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """Return ``(created_at, id)``; raises ``ValueError`` if malformed"""
+        try:
+            created_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+            created_at = parse_datetime(created_at)
+            pk = int(pk)
+        except (TypeError, ValueError, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+        if created_at is None:
+            raise ValueError(f"Invalid cursor: {cursor}")
+        return created_at, pk
+
+    @staticmethod
+    def parse_filters(params):
+        """Read ``type``, ``start`` and ``end`` (YYYY-MM-DD) from query params"""
+        filters = {}
+        transaction_type = params.get('type')
+        if transaction_type and transaction_type != 'all':
+            filters['transaction_type'] = transaction_type
+
+        for name in ('start', 'end'):
+            value = params.get(name)
+            if not value:
+                continue
+            day = parse_date(value)
+            if day is None:
+                raise ValueError(f"Invalid {name} date: {value}")
+            if name == 'end':
+                # The end date is inclusive
+                day += timedelta(days=1)
+            filters[name] = timezone.make_aware(datetime.combine(day, time.min))
+        return filters
+
+    @staticmethod
+    def page(account, cursor=None, transaction_type=None, start=None, end=None, limit=None):
+        """Return ``(transactions, next_cursor)``; ``next_cursor`` is ``None`` on the last page"""
+        limit = min(limit or TransactionHistory.PAGE_SIZE, TransactionHistory.MAX_PAGE_SIZE)
+
+        transactions = Transaction.objects.filter(account=account)
+        if transaction_type:
+            transactions = transactions.filter(transaction_type=transaction_type)
+        if start:
+            transactions = transactions.filter(created_at__gte=start)
+        if end:
+            transactions = transactions.filter(created_at__lt=end)
+        if cursor:
+            created_at, pk = TransactionHistory.decode_cursor(cursor)
+            transactions = transactions.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            )
+
+        rows = list(transactions.order_by('-created_at', '-id')[:limit + 1])
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = TransactionHistory.encode_cursor(rows[-1])
+        return rows, next_cursor
+
+    @staticmethod
+    def serialize(transaction):
+        return {
+            'id': transaction.id,
+            'created_at': transaction.created_at.isoformat(),
+            'transaction_type': transaction.transaction_type,
+            'transaction_type_display': transaction.get_transaction_type_display(),
+            'amount': str(transaction.amount),
+            'fee': str(transaction.fee),
+            'status': transaction.status,
+            'status_display': transaction.get_status_display(),
+            'description': transaction.description,
+        }
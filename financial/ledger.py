@@ -0,0 +1,126 @@
+from django.db import transaction
+from django.db.models import F, Q, Case, When, Value, DecimalField
+from django.utils import timezone
+from decimal import Decimal
+from .models import FinancialAccount
+from .events import BalanceEventPublisher
+
+BALANCE_FIELDS = (
+    'balance',
+    'frozen_balance',
+    'total_deposited',
+    'total_withdrawn',
+)
+
+# Fields that may never go negative; a debit against them is conditional
+GUARDED_FIELDS = ('balance', 'frozen_balance')
+
+class InsufficientFundsError(ValueError):
+    """Raised when a posting would take a guarded balance below zero"""
+    pass
+
+class Ledger:
+    """Atomic balance postings for ``FinancialAccount``.
+
+    Every posting is a single ``UPDATE ... SET balance = balance + x`` that
+    only touches the balance columns, with debits guarded by
+    ``WHERE balance >= x``. The database applies the change, so concurrent
+    postings against the same account can no longer overwrite each other.
+    """
+
+    @staticmethod
+    def post(account, refresh=True, **deltas):
+        """Apply balance deltas to one account in a single conditional UPDATE
+
+        ``deltas`` maps balance field names to signed amounts, e.g.
+        ``Ledger.post(account, balance=-amount, frozen_balance=amount)``.
+        """
+        deltas = Ledger._clean_deltas(deltas)
+        if not deltas:
+            return account
+
+        account_id = getattr(account, 'pk', account)
+        conditions = Q(pk=account_id)
+        updates = {'updated_at': timezone.now()}
+
+        for field, delta in deltas.items():
+            updates[field] = F(field) + delta
+            if delta < 0 and field in GUARDED_FIELDS:
+                conditions &= Q(**{f'{field}__gte': -delta})
+
+        updated = FinancialAccount.objects.filter(conditions).update(**updates)
+        if not updated:
+            raise InsufficientFundsError("Insufficient balance")
+        BalanceEventPublisher.schedule(account_id)
+
+        if refresh and isinstance(account, FinancialAccount):
+            account.refresh_from_db(fields=list(deltas) + ['updated_at'])
+
+        return account
+
+    @staticmethod
+    def credit(account, amount, **extra):
+        """Add ``amount`` to the available balance"""
+        return Ledger.post(account, balance=amount, **extra)
+
+    @staticmethod
+    def debit(account, amount, **extra):
+        """Take ``amount`` from the available balance if it is covered"""
+        return Ledger.post(account, balance=-amount, **extra)
+
+    @staticmethod
+    @transaction.atomic
+    def post_many(postings, field='balance'):
+        """Apply ``[(account_id, delta), ...]`` to many accounts in one UPDATE
+
+        Deltas for the same account are netted first. If any debited account
+        lacks the funds, nothing is applied and ``InsufficientFundsError`` is
+        raised.
+        """
+        if field not in BALANCE_FIELDS:
+            raise ValueError(f"Unknown balance field: {field}")
+
+        net = {}
+        for account_id, delta in postings:
+            net[account_id] = net.get(account_id, Decimal('0')) + Decimal(delta)
+        net = {account_id: delta for account_id, delta in net.items() if delta}
+        if not net:
+            return 0
+
+        conditions = Q()
+        whens = []
+        for account_id, delta in net.items():
+            if delta < 0 and field in GUARDED_FIELDS:
+                conditions |= Q(pk=account_id, **{f'{field}__gte': -delta})
+            else:
+                conditions |= Q(pk=account_id)
+            whens.append(When(pk=account_id, then=F(field) + Value(delta)))
+
+        updated = FinancialAccount.objects.filter(conditions).update(**{
+            field: Case(
+                *whens,
+                default=F(field),
+                output_field=DecimalField(max_digits=18, decimal_places=8)
+            ),
+            'updated_at': timezone.now()
+        })
+
+        if updated != len(net):
+            raise InsufficientFundsError(
+                f"Insufficient balance on {len(net) - updated} account(s)"
+            )
+
+        for account_id in net:
+            BalanceEventPublisher.schedule(account_id)
+
+        return updated
+
+    @staticmethod
+    def _clean_deltas(deltas):
+        cleaned = {}
+        for field, delta in deltas.items():
+            if field not in BALANCE_FIELDS:
+                raise ValueError(f"Unknown balance field: {field}")
+            if delta:
+                cleaned[field] = Decimal(delta)
+        return cleaned
@@ -1,7 +1,6 @@
 from django.core.management.base import BaseCommand
-from django.db.models import Sum
-from financial.models import FinancialAccount, Transaction
-from decimal import Decimal
+from financial.audit import AccountAuditor
+import json
 
 class Command(BaseCommand):
     help = 'Audit financial accounts for discrepancies'
@@ -17,55 +16,85 @@ class Command(BaseCommand):
             action='store_true',
             help='Email audit report to administrators'
         )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Only audit accounts touched since the last audit'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of processes to spread the account range over'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=AccountAuditor.CHUNK_SIZE,
+            help='Rows fetched per database round trip'
+        )
+        parser.add_argument(
+            '--report',
+            help='Write discrepancies as JSON lines to this file ("-" for stdout)'
+        )
 
     def handle(self, *args, **options):
         fix = options['fix']
         email_report = options['email_report']
-        discrepancies = []
 
-        accounts = FinancialAccount.objects.all()
-        for account in accounts:
-            # Calculate expected balance
-            transactions = Transaction.objects.filter(account=account)
-            expected_balance = transactions.aggregate(
-                total=Sum('amount')
-            )['total'] or Decimal('0')
-
-            # Check for discrepancy
-            if account.balance != expected_balance:
-                discrepancy = {
-                    'account': account,
-                    'current_balance': account.balance,
-                    'expected_balance': expected_balance,
-                    'difference': account.balance - expected_balance
-                }
-                discrepancies.append(discrepancy)
+        checked, discrepancies = AccountAuditor.run(
+            incremental=options['incremental'],
+            workers=options['workers'],
+            chunk_size=options['chunk_size']
+        )
 
-                self.stdout.write(
-                    self.style.WARNING(
-                        f'Account {account.id}: '
-                        f'Balance mismatch of {discrepancy["difference"]}'
-                    )
+        for discrepancy in discrepancies:
+            self.stdout.write(
+                self.style.WARNING(
+                    f'Account {discrepancy["account_id"]}: '
+                    f'Balance mismatch of {discrepancy["difference"]}'
                 )
+            )
 
-                if fix:
-                    account.balance = expected_balance
-                    account.save()
+            if fix:
+                discrepancy['fixed'] = AccountAuditor.fix(discrepancy)
+                if discrepancy['fixed']:
                     self.stdout.write(
                         self.style.SUCCESS(
-                            f'Fixed balance for account {account.id}'
+                            f'Fixed balance for account {discrepancy["account_id"]}'
+                        )
+                    )
+                else:
+                    self.stdout.write(
+                        self.style.WARNING(
+                            f'Balance of account {discrepancy["account_id"]} '
+                            f'changed during the audit; not fixed'
                         )
                     )
 
+        if options['report']:
+            self.write_report(options['report'], discrepancies)
+
         if email_report and discrepancies:
             self.send_audit_report(discrepancies)
 
         self.stdout.write(
             self.style.SUCCESS(
-                f'Audit completed. Found {len(discrepancies)} discrepancies'
+                f'Audit completed. Checked {checked} accounts, '
+                f'found {len(discrepancies)} discrepancies'
             )
         )
 
+    def write_report(self, path, discrepancies):
+        """One JSON object per discrepancy; amounts are decimal strings"""
+        out = self.stdout if path == '-' else open(path, 'w')
+        try:
+            for discrepancy in discrepancies:
+                out.write(json.dumps(discrepancy, default=str) + '\n')
+        finally:
+            if out is not self.stdout:
+                out.close()
+
     def send_audit_report(self, discrepancies):
         # Implementation for sending email report
-        pass 
\ No newline at end of file
+        pass
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from financial.snapshots import BalanceSnapshots
+
+class Command(BaseCommand):
+    help = 'Build balance snapshots from the existing transaction history'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--every',
+            type=int,
+            default=1000,
+            help='Write a snapshot after this many transactions per account'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=BalanceSnapshots.CHUNK_SIZE,
+            help='Accounts processed per batch'
+        )
+        parser.add_argument(
+            '--account',
+            type=int,
+            action='append',
+            dest='accounts',
+            help='Only backfill this account id (repeatable)'
+        )
+
+    def handle(self, *args, **options):
+        # Resumes from each account's newest snapshot, so it is safe to rerun
+        created = BalanceSnapshots.take(
+            account_ids=options['accounts'],
+            every=options['every'],
+            chunk_size=options['chunk_size']
+        )
+        self.stdout.write(self.style.SUCCESS(f'Created {created} balance snapshots'))
@@ -0,0 +1,89 @@
+from django.core.management.base import BaseCommand
+from financial.models import Transaction
+from financial.confirmations import ConfirmationPoller
+from financial.fakenode import FakeNode
+from financial.rpc import JsonRpcClient
+from decimal import Decimal
+import requests
+import time
+
+class Command(BaseCommand):
+    help = 'Benchmark deposit confirmation polling against a local fake node'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--deposits',
+            type=int,
+            default=1000,
+            help='Number of pending deposits to check'
+        )
+        parser.add_argument(
+            '--network',
+            default='ETH',
+            choices=sorted(ConfirmationPoller.METHODS),
+            help='Network to simulate'
+        )
+        parser.add_argument(
+            '--latency-ms',
+            type=float,
+            default=2,
+            help='Simulated node latency per HTTP request'
+        )
+        parser.add_argument(
+            '--legacy',
+            action='store_true',
+            help='Also time one unpooled request per deposit'
+        )
+
+    def handle(self, *args, **options):
+        node = FakeNode(tip=100000, latency=options['latency_ms'] / 1000)
+        server, url = node.serve()
+        network = options['network']
+
+        # Unsaved deposits are enough; only the RPC side is measured
+        deposits = []
+        for i in range(options['deposits']):
+            tx_hash = f'0x{i:064x}'
+            node.add_transaction(tx_hash, block_number=100000 - (i % 20))
+            deposits.append(Transaction(
+                id=i + 1,
+                transaction_type='deposit',
+                amount=Decimal('1'),
+                network=network,
+                transaction_hash=tx_hash
+            ))
+
+        try:
+            poller = ConfirmationPoller(clients={network: JsonRpcClient(url)})
+            start = time.perf_counter()
+            poller.fetch_confirmations(network, deposits)
+            self.report('poller', node, time.perf_counter() - start)
+
+            if options['legacy']:
+                node.requests = node.calls = 0
+                start = time.perf_counter()
+                self.legacy_fetch(url, network, deposits)
+                self.report('legacy', node, time.perf_counter() - start)
+        finally:
+            server.shutdown()
+
+    def legacy_fetch(self, url, network, deposits):
+        """Old pattern: fresh connection, and a tip lookup, per deposit"""
+        tip_method, tx_method = ConfirmationPoller.METHODS[network]
+        for deposit in deposits:
+            params = [deposit.transaction_hash]
+            if network == 'BTC':
+                params.append(True)
+            requests.post(url, json={
+                'jsonrpc': '2.0', 'id': 1, 'method': tx_method, 'params': params
+            }).json()
+            if tip_method:
+                requests.post(url, json={
+                    'jsonrpc': '2.0', 'id': 2, 'method': tip_method, 'params': []
+                }).json()
+
+    def report(self, mode, node, elapsed):
+        self.stdout.write(self.style.SUCCESS(
+            f"{mode:>6}: {node.calls} RPC calls in {node.requests} HTTP requests, "
+            f"{elapsed:.3f}s"
+        ))
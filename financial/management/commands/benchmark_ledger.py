@@ -0,0 +1,113 @@
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from financial.models import FinancialAccount
+from financial.ledger import Ledger, InsufficientFundsError
+from decimal import Decimal
+import threading
+import random
+import time
+
+User = get_user_model()
+
+class Command(BaseCommand):
+    help = 'Benchmark concurrent balance postings against a single account'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=8,
+            help='Number of threads posting concurrently'
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=500,
+            help='Debits posted by each thread'
+        )
+        parser.add_argument(
+            '--amount',
+            default='0.01',
+            help='Amount of each debit'
+        )
+        parser.add_argument(
+            '--legacy',
+            action='store_true',
+            help='Also run the read-modify-save path for comparison'
+        )
+
+    def handle(self, *args, **options):
+        modes = ['ledger']
+        if options['legacy']:
+            modes.append('legacy')
+
+        for mode in modes:
+            result = self.run_mode(mode, options)
+            style = self.style.SUCCESS if not result['lost'] else self.style.WARNING
+            self.stdout.write(style(
+                f"{mode:>6}: {result['ops']} debits in {result['elapsed']:.3f}s "
+                f"({result['ops'] / max(result['elapsed'], 1e-9):.0f}/s), "
+                f"rejected {result['rejected']}, lost updates {result['lost']}"
+            ))
+
+    def run_mode(self, mode, options):
+        threads = options['threads']
+        iterations = options['iterations']
+        amount = Decimal(options['amount'])
+        opening = amount * threads * iterations
+
+        user = User.objects.create(
+            username=f'ledger_bench_{random.randint(0, 10 ** 9)}'
+        )
+        account = FinancialAccount.objects.create(user=user, balance=opening)
+        counters = {'ok': 0, 'rejected': 0}
+        lock = threading.Lock()
+
+        def worker():
+            ok = rejected = 0
+            try:
+                for _ in range(iterations):
+                    try:
+                        if mode == 'ledger':
+                            Ledger.debit(account.pk, amount)
+                        else:
+                            self.legacy_debit(account.pk, amount)
+                        ok += 1
+                    except InsufficientFundsError:
+                        rejected += 1
+            finally:
+                connection.close()
+            with lock:
+                counters['ok'] += ok
+                counters['rejected'] += rejected
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        start = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        account.refresh_from_db()
+        expected = opening - amount * counters['ok']
+        lost = int((account.balance - expected) / amount)
+        user.delete()
+
+        return {
+            'ops': counters['ok'],
+            'rejected': counters['rejected'],
+            'elapsed': elapsed,
+            'lost': lost
+        }
+
+    @staticmethod
+    @transaction.atomic
+    def legacy_debit(account_id, amount):
+        """The previous pattern: read, compute in Python, save every column"""
+        account = FinancialAccount.objects.get(pk=account_id)
+        if account.balance < amount:
+            raise InsufficientFundsError("Insufficient balance")
+        account.balance -= amount
+        account.save()
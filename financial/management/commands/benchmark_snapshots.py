@@ -0,0 +1,106 @@
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from django.db.models import Q, Sum
+from financial.models import FinancialAccount, Transaction
+from financial.snapshots import BalanceSnapshots
+from decimal import Decimal
+import random
+import time
+
+User = get_user_model()
+
+class Command(BaseCommand):
+    help = 'Verify snapshot-based totals against full-history sums and time both'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--accounts',
+            type=int,
+            default=20,
+            help='Number of synthetic accounts to create'
+        )
+        parser.add_argument(
+            '--transactions',
+            type=int,
+            default=5000,
+            help='Transactions per synthetic account'
+        )
+        parser.add_argument(
+            '--tail',
+            type=int,
+            default=50,
+            help='Transactions added after the snapshot'
+        )
+        parser.add_argument(
+            '--every',
+            type=int,
+            default=1000,
+            help='Snapshot interval used for the backfill'
+        )
+
+    def handle(self, *args, **options):
+        prefix = f'snapshot_bench_{random.randint(0, 10 ** 9)}'
+        users = [
+            User.objects.create(username=f'{prefix}_{i}')
+            for i in range(options['accounts'])
+        ]
+        accounts = [FinancialAccount.objects.create(user=user) for user in users]
+
+        try:
+            self.seed(accounts, options['transactions'])
+            start = time.perf_counter()
+            BalanceSnapshots.take(
+                account_ids=[a.id for a in accounts],
+                every=options['every']
+            )
+            self.stdout.write(f"backfill: {time.perf_counter() - start:.3f}s")
+            self.seed(accounts, options['tail'])
+
+            start = time.perf_counter()
+            full = [self.full_history(account) for account in accounts]
+            full_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            snapshot = [BalanceSnapshots.totals(account) for account in accounts]
+            snapshot_elapsed = time.perf_counter() - start
+
+            mismatches = sum(
+                1 for expected, actual in zip(full, snapshot)
+                if any(
+                    (expected[field] or Decimal('0')) != actual[field]
+                    for field in expected
+                )
+            )
+            style = self.style.SUCCESS if not mismatches else self.style.ERROR
+            self.stdout.write(style(
+                f"full history: {full_elapsed:.3f}s, snapshots: {snapshot_elapsed:.3f}s "
+                f"for {len(accounts)} accounts, mismatches {mismatches}"
+            ))
+        finally:
+            User.objects.filter(username__startswith=prefix).delete()
+
+    def seed(self, accounts, count):
+        statuses = ['completed'] * 8 + ['failed', 'pending']
+        types = ['deposit', 'withdrawal', 'bet_win', 'bet_loss']
+        for account in accounts:
+            Transaction.objects.bulk_create([
+                Transaction(
+                    account=account,
+                    transaction_type=random.choice(types),
+                    amount=Decimal(random.randint(1, 10000)) / 100,
+                    status=random.choice(statuses)
+                )
+                for _ in range(count)
+            ], batch_size=1000)
+
+    def full_history(self, account):
+        """The previous approach: aggregate the account's whole history"""
+        return Transaction.objects.filter(account=account).aggregate(
+            balance=Sum('amount'),
+            total_deposited=Sum(
+                'amount', filter=Q(transaction_type='deposit', status='completed')
+            ),
+            total_withdrawn=Sum(
+                'amount', filter=Q(transaction_type='withdrawal', status='completed')
+            )
+        )
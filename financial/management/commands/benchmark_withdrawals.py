@@ -0,0 +1,121 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from financial.models import WithdrawalRequest
+from financial.fakenode import FakeNode
+from financial.rpc import JsonRpcClient
+from financial.withdrawals import BitcoinWallet, EthereumWallet, WithdrawalDispatcher
+from decimal import Decimal
+import requests
+import time
+
+# Well-known development key; never holds real funds
+TEST_PRIVATE_KEY = '0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80'
+TEST_ADDRESS = '0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266'
+
+class Command(BaseCommand):
+    help = 'Benchmark withdrawal sending throughput against a local fake node'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--withdrawals',
+            type=int,
+            default=500,
+            help='Number of withdrawals to send'
+        )
+        parser.add_argument(
+            '--network',
+            default='ETH',
+            choices=['BTC', 'ETH'],
+            help='Network to simulate'
+        )
+        parser.add_argument(
+            '--latency-ms',
+            type=float,
+            default=5,
+            help='Simulated node latency per HTTP request'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=WithdrawalDispatcher.MAX_CONCURRENCY,
+            help='Maximum sends in flight'
+        )
+        parser.add_argument(
+            '--legacy',
+            action='store_true',
+            help='Also time the serial one-by-one path'
+        )
+
+    def handle(self, *args, **options):
+        network = options['network']
+        node = FakeNode(latency=options['latency_ms'] / 1000)
+        server, url = node.serve()
+
+        # Unsaved requests are enough; only the sending side is measured
+        withdrawals = [
+            WithdrawalRequest(
+                id=i + 1,
+                network=network,
+                amount=Decimal('0.01'),
+                address=TEST_ADDRESS if network == 'ETH' else f'bc1qbench{i % 50}'
+            )
+            for i in range(options['withdrawals'])
+        ]
+
+        try:
+            client = JsonRpcClient(url, pool_size=options['concurrency'])
+            if network == 'BTC':
+                wallet = BitcoinWallet(client)
+            else:
+                wallet = EthereumWallet(client, TEST_ADDRESS, TEST_PRIVATE_KEY, 1)
+                wallet.nonces.reset()
+            dispatcher = WithdrawalDispatcher(
+                wallets={network: wallet},
+                max_concurrency=options['concurrency']
+            )
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+                for i in range(0, len(withdrawals), dispatcher.BATCH_SIZE):
+                    batch = withdrawals[i:i + dispatcher.BATCH_SIZE]
+                    dispatcher.send_batch(network, batch, executor)
+            self.report('dispatcher', node, len(withdrawals), time.perf_counter() - start)
+
+            if options['legacy']:
+                node.requests = node.calls = 0
+                start = time.perf_counter()
+                self.legacy_send(url, network, wallet, withdrawals)
+                self.report('legacy', node, len(withdrawals), time.perf_counter() - start)
+        finally:
+            cache.delete(f'wallet_nonce:ETH:{TEST_ADDRESS}')
+            server.shutdown()
+
+    def rpc(self, url, method, *params):
+        return requests.post(url, json={
+            'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': list(params)
+        }).json()['result']
+
+    def legacy_send(self, url, network, wallet, withdrawals):
+        """Old pattern: nonce and gas price lookups and a fresh connection per send"""
+        for withdrawal in withdrawals:
+            if network == 'BTC':
+                self.rpc(url, 'sendmany', '', {withdrawal.address: float(withdrawal.amount)})
+                continue
+            nonce = int(self.rpc(url, 'eth_getTransactionCount', TEST_ADDRESS, 'latest'), 16)
+            gas_price = int(self.rpc(url, 'eth_gasPrice'), 16)
+            raw = wallet.signer({
+                'nonce': nonce,
+                'to': withdrawal.address,
+                'value': int(withdrawal.amount * Decimal(10) ** 18),
+                'gas': wallet.GAS_LIMIT,
+                'gasPrice': gas_price,
+                'chainId': 1
+            })
+            self.rpc(url, 'eth_sendRawTransaction', raw)
+
+    def report(self, mode, node, count, elapsed):
+        self.stdout.write(self.style.SUCCESS(
+            f"{mode:>10}: {count} withdrawals in {elapsed:.3f}s "
+            f"({count / max(elapsed, 1e-9):.0f}/s), {node.requests} HTTP requests"
+        ))
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.17 on 2026-10-18 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("financial", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transaction",
+            name="network",
+            field=models.CharField(blank=True, max_length=10),
+        ),
+        migrations.AddField(
+            model_name="transaction",
+            name="transaction_hash",
+            field=models.CharField(blank=True, db_index=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name="transaction",
+            name="confirmations",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
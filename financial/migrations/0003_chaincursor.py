@@ -0,0 +1,35 @@
+# Generated by Django 4.2.17 on 2026-10-18 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("financial", "0002_transaction_chain_fields"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChainCursor",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("network", models.CharField(max_length=10, unique=True)),
+                ("height", models.BigIntegerField()),
+                ("block_hash", models.CharField(max_length=100)),
+                ("recent_hashes", models.JSONField(default=dict)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "chain_cursors",
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.17 on 2026-10-18 12:40
+
+from decimal import Decimal
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("financial", "0003_chaincursor"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="withdrawalrequest",
+            name="account",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="financial.financialaccount",
+            ),
+        ),
+        migrations.AddField(
+            model_name="withdrawalrequest",
+            name="fee",
+            field=models.DecimalField(
+                decimal_places=8, default=Decimal("0"), max_digits=18
+            ),
+        ),
+        migrations.AddField(
+            model_name="withdrawalrequest",
+            name="transaction_hash",
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name="withdrawalrequest",
+            name="error_message",
+            field=models.TextField(blank=True),
+        ),
+    ]
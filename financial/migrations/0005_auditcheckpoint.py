@@ -0,0 +1,35 @@
+# Generated by Django 4.2.17 on 2026-10-18 13:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("financial", "0004_withdrawalrequest_dispatch_fields"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AuditCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=50, unique=True)),
+                ("checkpoint_at", models.DateTimeField()),
+                ("accounts_checked", models.PositiveIntegerField(default=0)),
+                ("discrepancies", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "audit_checkpoints",
+            },
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 4.2.17 on 2026-10-18 14:05
+
+from decimal import Decimal
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("financial", "0005_auditcheckpoint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BalanceSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("high_water_mark", models.BigIntegerField()),
+                (
+                    "balance",
+                    models.DecimalField(
+                        decimal_places=8, default=Decimal("0"), max_digits=18
+                    ),
+                ),
+                (
+                    "total_deposited",
+                    models.DecimalField(
+                        decimal_places=8, default=Decimal("0"), max_digits=18
+                    ),
+                ),
+                (
+                    "total_withdrawn",
+                    models.DecimalField(
+                        decimal_places=8, default=Decimal("0"), max_digits=18
+                    ),
+                ),
+                ("transaction_count", models.PositiveIntegerField(default=0)),
+                ("open_transactions", models.JSONField(default=list)),
+                ("as_of", models.DateTimeField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "account",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="snapshots",
+                        to="financial.financialaccount",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "balance_snapshots",
+                "indexes": [
+                    models.Index(
+                        fields=["account", "as_of"],
+                        name="balance_sna_account_667b7f_idx",
+                    )
+                ],
+                "unique_together": {("account", "high_water_mark")},
+            },
+        ),
+    ]
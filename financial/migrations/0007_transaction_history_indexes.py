@@ -0,0 +1,27 @@
+# Generated by Django 4.2.17 on 2026-10-18 14:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("financial", "0006_balancesnapshot"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["account", "created_at", "id"],
+                name="financial_t_account_65a494_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["account", "transaction_type", "created_at"],
+                name="financial_t_account_f78334_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.17 on 2026-10-18 21:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("financial", "0007_transaction_history_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="balancesnapshot",
+            unique_together=set(),
+        ),
+        migrations.AddIndex(
+            model_name="balancesnapshot",
+            index=models.Index(
+                fields=["account", "high_water_mark"],
+                name="balance_sna_account_e945ba_idx",
+            ),
+        ),
+    ]
@@ -2,9 +2,6 @@ from django.db import models
 from django.conf import settings
 from django.utils import timezone
 from decimal import Decimal
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
-import json
 
 class FinancialAccount(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -44,26 +41,31 @@ class Transaction(models.Model):
     reference_id = models.CharField(max_length=100, blank=True)  # External reference
     description = models.TextField(blank=True)
     metadata = models.JSONField(default=dict)
+    # On-chain details for deposits and withdrawals
+    network = models.CharField(max_length=10, blank=True)
+    transaction_hash = models.CharField(max_length=100, blank=True, db_index=True)
+    confirmations = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     completed_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of the transaction history, newest first
+            models.Index(fields=['account', 'created_at', 'id']),
+            models.Index(fields=['account', 'transaction_type', 'created_at']),
+        ]
+
     def __str__(self):
         return f"{self.account.user.username} - {self.transaction_type} - {self.amount}"
 
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
         
-        # Send balance update through WebSocket if transaction is completed
+        # Send balance update through WebSocket once the transaction commits
         if self.status == 'completed':
-            channel_layer = get_channel_layer()
-            async_to_sync(channel_layer.group_send)(
-                f'user_balance_{self.account.user.id}',
-                {
-                    'type': 'balance_update',
-                    'balance': str(self.account.user.balance)
-                }
-            )
+            from .events import BalanceEventPublisher
+            BalanceEventPublisher.schedule(self.account_id)
 
 class WithdrawalRequest(models.Model):
     STATUS_CHOICES = (
@@ -87,10 +89,19 @@ class WithdrawalRequest(models.Model):
         null=True,  # Allow null temporarily for migration
         blank=True
     )
+    account = models.ForeignKey(
+        'FinancialAccount',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True
+    )
     amount = models.DecimalField(max_digits=18, decimal_places=8)
+    fee = models.DecimalField(max_digits=18, decimal_places=8, default=Decimal('0'))
     address = models.CharField(max_length=100)
     network = models.CharField(max_length=10, choices=NETWORK_CHOICES)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    transaction_hash = models.CharField(max_length=100, blank=True)
+    error_message = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     processed_at = models.DateTimeField(null=True, blank=True)
     
@@ -116,6 +127,67 @@ class DepositAddress(models.Model):
         db_table = 'deposit_addresses'
         unique_together = ['account', 'network']
 
+class ChainCursor(models.Model):
+    """Last block scanned for deposits on a network"""
+    network = models.CharField(max_length=10, unique=True)
+    height = models.BigIntegerField()
+    block_hash = models.CharField(max_length=100)
+    # {height: hash} for the most recent blocks, used to find reorg forks
+    recent_hashes = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'chain_cursors'
+
+    def __str__(self):
+        return f"{self.network} @ {self.height}"
+
+class BalanceSnapshot(models.Model):
+    """Account totals over every transaction up to ``high_water_mark``
+
+    ``balance`` is the sum of all transaction amounts, the same figure the
+    balance audit expects. ``total_deposited`` and ``total_withdrawn`` only
+    count completed deposits and withdrawals; transactions that were still
+    open are listed in ``open_transactions`` and re-read by later queries.
+    ``as_of`` is when the high-water mark transaction was created, or when
+    carried transactions were seen to settle for a snapshot that only
+    records that. Several snapshots may share a high-water mark; the newest
+    one wins.
+    """
+    account = models.ForeignKey(FinancialAccount, on_delete=models.CASCADE, related_name='snapshots')
+    high_water_mark = models.BigIntegerField()
+    balance = models.DecimalField(max_digits=18, decimal_places=8, default=Decimal('0'))
+    total_deposited = models.DecimalField(max_digits=18, decimal_places=8, default=Decimal('0'))
+    total_withdrawn = models.DecimalField(max_digits=18, decimal_places=8, default=Decimal('0'))
+    transaction_count = models.PositiveIntegerField(default=0)
+    open_transactions = models.JSONField(default=list)
+    as_of = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'balance_snapshots'
+        indexes = [
+            models.Index(fields=['account', 'as_of']),
+            models.Index(fields=['account', 'high_water_mark']),
+        ]
+
+    def __str__(self):
+        return f"Account {self.account_id} @ {self.high_water_mark}"
+
+class AuditCheckpoint(models.Model):
+    """Start time of the last completed balance audit"""
+    name = models.CharField(max_length=50, unique=True)
+    checkpoint_at = models.DateTimeField()
+    accounts_checked = models.PositiveIntegerField(default=0)
+    discrepancies = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'audit_checkpoints'
+
+    def __str__(self):
+        return f"{self.name} @ {self.checkpoint_at}"
+
 class PaymentProvider(models.Model):
     name = models.CharField(max_length=100)
     provider_type = models.CharField(max_length=50)
@@ -0,0 +1,77 @@
+from django.core.cache import cache
+from django.urls import reverse
+import hashlib
+
+class DepositQRCode:
+    """Rendered deposit address QR codes, cached per address and format.
+
+    An address never changes its QR code, so each image is rendered once
+    and kept in the cache without expiry. Its URL carries a digest of the
+    address, which lets browsers cache the response as immutable and lets
+    the view answer ``If-None-Match`` without touching the cache.
+    """
+
+    # Bump to invalidate every cached image after a rendering change
+    VERSION = 1
+
+    CONTENT_TYPES = {
+        'png': 'image/png',
+        'svg': 'image/svg+xml',
+    }
+
+    @staticmethod
+    def digest(network, address):
+        raw = f'{DepositQRCode.VERSION}:{network}:{address}'
+        return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+    @staticmethod
+    def etag(network, address, fmt):
+        return f'"{DepositQRCode.digest(network, address)}-{fmt}"'
+
+    @staticmethod
+    def cache_key(network, address, fmt):
+        return f'deposit_qr:{fmt}:{DepositQRCode.digest(network, address)}'
+
+    @staticmethod
+    def url(deposit_address, fmt='svg'):
+        return reverse('financial:deposit_qr', args=[
+            deposit_address.network,
+            DepositQRCode.digest(deposit_address.network, deposit_address.address),
+            fmt
+        ])
+
+    @staticmethod
+    def render(data, fmt='png'):
+        """Render ``data`` as PNG or SVG bytes"""
+        import qrcode
+        from io import BytesIO
+
+        qr = qrcode.QRCode(
+            version=1,
+            error_correction=qrcode.constants.ERROR_CORRECT_L,
+            box_size=10,
+            border=4,
+        )
+        qr.add_data(data)
+        qr.make(fit=True)
+
+        buffer = BytesIO()
+        if fmt == 'svg':
+            from qrcode.image.svg import SvgPathImage
+            qr.make_image(image_factory=SvgPathImage).save(buffer)
+        else:
+            qr.make_image(fill_color="black", back_color="white").save(buffer, format='PNG')
+        return buffer.getvalue()
+
+    @staticmethod
+    def get(network, address, fmt='png'):
+        """Return the image bytes, rendering them on the first request only"""
+        if fmt not in DepositQRCode.CONTENT_TYPES:
+            raise ValueError(f"Unsupported QR format: {fmt}")
+
+        key = DepositQRCode.cache_key(network, address, fmt)
+        image = cache.get(key)
+        if image is None:
+            image = DepositQRCode.render(address, fmt)
+            cache.set(key, image, timeout=None)
+        return image
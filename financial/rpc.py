@@ -0,0 +1,131 @@
+from requests.adapters import HTTPAdapter
+import asyncio
+import itertools
+import requests
+
+class JsonRpcError(Exception):
+    """Raised when a node rejects a JSON-RPC call or the whole request"""
+    pass
+
+class JsonRpcClient:
+    """Minimal JSON-RPC 2.0 client over a pooled keep-alive session.
+
+    One client per node keeps its TCP connections open between calls, and
+    ``batch`` sends many calls in one HTTP request.
+    """
+
+    def __init__(self, url, session=None, timeout=10, pool_size=4):
+        self.url = url
+        self.timeout = timeout
+        self.session = session or self.create_session(pool_size)
+        self._ids = itertools.count(1)
+
+    @staticmethod
+    def create_session(pool_size=4):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _payload(self, method, params):
+        return {
+            'jsonrpc': '2.0',
+            'id': next(self._ids),
+            'method': method,
+            'params': list(params)
+        }
+
+    def _post(self, payload):
+        response = self.session.post(self.url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def call(self, method, *params):
+        """Make a single call and return its result"""
+        reply = self._post(self._payload(method, params))
+        if reply.get('error'):
+            raise JsonRpcError(f"{method} failed: {reply['error']}")
+        return reply.get('result')
+
+    def batch(self, calls):
+        """Send ``[(method, params), ...]`` as one request
+
+        Returns results in call order. A call that failed on the node
+        gives ``None`` rather than failing the whole batch.
+        """
+        if not calls:
+            return []
+
+        payload = [self._payload(method, params) for method, params in calls]
+        replies = self._post(payload)
+        return self._results(payload, replies)
+
+    @staticmethod
+    def _results(payload, replies):
+        if not isinstance(replies, list):
+            raise JsonRpcError(f"Batch request failed: {replies.get('error')}")
+
+        by_id = {reply.get('id'): reply for reply in replies}
+        results = []
+        for request in payload:
+            reply = by_id.get(request['id'], {})
+            results.append(None if reply.get('error') else reply.get('result'))
+        return results
+
+    def close(self):
+        self.session.close()
+
+class AsyncJsonRpcClient:
+    """Asyncio counterpart of ``JsonRpcClient`` over a pooled ``httpx`` client.
+
+    ``max_connections`` bounds both the connection pool and the number of
+    calls in flight; extra calls wait for a slot instead of failing with a
+    pool timeout. The client must be used from one event loop.
+    """
+
+    def __init__(self, url, client=None, timeout=10, max_connections=10):
+        self.url = url
+        self.client = client or self.create_client(timeout, max_connections)
+        self.limit = asyncio.Semaphore(max_connections)
+        self._ids = itertools.count(1)
+
+    @staticmethod
+    def create_client(timeout=10, max_connections=10, **kwargs):
+        import httpx
+
+        return httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ),
+            **kwargs
+        )
+
+    _payload = JsonRpcClient._payload
+    _results = staticmethod(JsonRpcClient._results)
+
+    async def _post(self, payload):
+        async with self.limit:
+            response = await self.client.post(self.url, json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    async def call(self, method, *params):
+        """Make a single call and return its result"""
+        reply = await self._post(self._payload(method, params))
+        if reply.get('error'):
+            raise JsonRpcError(f"{method} failed: {reply['error']}")
+        return reply.get('result')
+
+    async def batch(self, calls):
+        """Send ``[(method, params), ...]`` as one request; see ``JsonRpcClient.batch``"""
+        if not calls:
+            return []
+
+        payload = [self._payload(method, params) for method, params in calls]
+        return self._results(payload, await self._post(payload))
+
+    async def close(self):
+        await self.client.aclose()
@@ -0,0 +1,309 @@
+from django.db import transaction
+from decimal import Decimal
+from .models import ChainCursor, DepositAddress, Transaction
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Block:
+    """A block reduced to what deposit detection needs"""
+
+    def __init__(self, height, block_hash, parent_hash, outputs):
+        self.height = height
+        self.hash = block_hash
+        self.parent_hash = parent_hash
+        # [(tx_hash, address, amount), ...]
+        self.outputs = outputs
+
+class RpcBlockSource:
+    """Reads blocks from a node through a ``JsonRpcClient``
+
+    Bitcoin outputs come from ``getblock`` verbosity 2; Ethereum outputs are
+    native transfers from ``eth_getBlockByNumber``. Token transfers are
+    log events and are not covered here.
+    """
+
+    WEI = Decimal(10) ** 18
+
+    def __init__(self, network, client):
+        self.network = network
+        self.client = client
+        self.confirmation_offset = 1 if network == 'BTC' else 0
+
+    def get_tip(self):
+        if self.network == 'BTC':
+            return self.client.call('getblockcount')
+        return int(self.client.call('eth_blockNumber'), 16)
+
+    def get_hashes(self, heights):
+        """Return ``{height: hash}`` for the canonical chain"""
+        if self.network == 'BTC':
+            hashes = self.client.batch([('getblockhash', [h]) for h in heights])
+        else:
+            blocks = self.client.batch([
+                ('eth_getBlockByNumber', [hex(h), False]) for h in heights
+            ])
+            hashes = [block['hash'] if block else None for block in blocks]
+        return dict(zip(heights, hashes))
+
+    def get_blocks(self, heights):
+        """Fetch a range of blocks with batched calls"""
+        if self.network == 'BTC':
+            hashes = self.client.batch([('getblockhash', [h]) for h in heights])
+            raw_blocks = self.client.batch([('getblock', [h, 2]) for h in hashes])
+            return [self._btc_block(raw) for raw in raw_blocks]
+
+        raw_blocks = self.client.batch([
+            ('eth_getBlockByNumber', [hex(h), True]) for h in heights
+        ])
+        return [self._eth_block(raw) for raw in raw_blocks]
+
+    def _btc_block(self, raw):
+        outputs = []
+        for tx in raw['tx']:
+            for vout in tx.get('vout', []):
+                script = vout.get('scriptPubKey', {})
+                addresses = script.get('addresses') or [script.get('address')]
+                for address in filter(None, addresses):
+                    outputs.append((tx['txid'], address, Decimal(str(vout['value']))))
+        return Block(raw['height'], raw['hash'], raw.get('previousblockhash'), outputs)
+
+    def _eth_block(self, raw):
+        outputs = [
+            (tx['hash'], tx['to'].lower(), Decimal(int(tx['value'], 16)) / self.WEI)
+            for tx in raw['transactions']
+            if tx.get('to') and int(tx['value'], 16)
+        ]
+        return Block(int(raw['number'], 16), raw['hash'], raw['parentHash'], outputs)
+
+class RecordedBlockSource:
+    """Serves blocks from a recorded JSON fixture, for tests and replays
+
+    The fixture is ``{"network": ..., "blocks": [{"height", "hash",
+    "parent_hash", "outputs": [[tx_hash, address, amount], ...]}]}``.
+    ``reorg`` swaps in a competing branch.
+    """
+
+    def __init__(self, network, blocks, confirmation_offset=1):
+        self.network = network
+        self.confirmation_offset = confirmation_offset
+        self.blocks = {}
+        self.extend(blocks)
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data['network'], data['blocks'])
+
+    def extend(self, blocks):
+        for raw in blocks:
+            self.blocks[raw['height']] = Block(
+                raw['height'],
+                raw['hash'],
+                raw.get('parent_hash'),
+                [(tx, address, Decimal(str(amount))) for tx, address, amount in raw['outputs']]
+            )
+
+    def reorg(self, blocks):
+        """Replace the chain from the first given height with ``blocks``"""
+        fork = min(raw['height'] for raw in blocks)
+        for height in [h for h in self.blocks if h >= fork]:
+            del self.blocks[height]
+        self.extend(blocks)
+
+    def get_tip(self):
+        return max(self.blocks)
+
+    def get_hashes(self, heights):
+        return {h: self.blocks[h].hash for h in heights if h in self.blocks}
+
+    def get_blocks(self, heights):
+        return [self.blocks[h] for h in heights]
+
+class ChainScanner:
+    """Detects deposits by walking new blocks once.
+
+    Each scan reads blocks after the persisted ``ChainCursor`` in batches,
+    and matches their outputs against an in-memory map of every active
+    deposit address on the network. The cost grows with the number of
+    blocks, not the number of pending deposits. Confirmations of open
+    deposits come from the stored block height, so no per-transaction RPC
+    is needed. If a new block's parent does not match the cursor, the
+    scanner walks back to the fork, cancels pending deposits from orphaned
+    blocks and rescans from there.
+    """
+
+    NETWORKS = ('BTC', 'ETH')
+    BATCH_SIZE = 50
+    REORG_DEPTH = 64
+
+    def __init__(self, source):
+        self.source = source
+        self.network = source.network
+
+    def load_addresses(self):
+        """Return ``{address: account_id}`` for active deposit addresses"""
+        addresses = DepositAddress.objects.filter(
+            network=self.network,
+            is_active=True
+        ).values_list('address', 'account_id')
+        return {self.normalize(address): account_id for address, account_id in addresses}
+
+    def normalize(self, address):
+        return address if self.network == 'BTC' else address.lower()
+
+    def get_cursor(self, tip):
+        """Return the cursor, starting at the current tip on first run"""
+        cursor = ChainCursor.objects.filter(network=self.network).first()
+        if cursor is None:
+            block_hash = self.source.get_hashes([tip])[tip]
+            cursor = ChainCursor.objects.create(
+                network=self.network,
+                height=tip,
+                block_hash=block_hash,
+                recent_hashes={str(tip): block_hash}
+            )
+        return cursor
+
+    def scan(self, max_blocks=None):
+        """Scan new blocks up to the tip; returns the deposits created"""
+        tip = self.source.get_tip()
+        cursor = self.get_cursor(tip)
+        addresses = self.load_addresses()
+        created = []
+
+        while cursor.height < tip:
+            end = min(cursor.height + self.BATCH_SIZE, tip)
+            if max_blocks is not None:
+                end = min(end, cursor.height + max_blocks)
+            heights = list(range(cursor.height + 1, end + 1))
+            blocks = self.source.get_blocks(heights)
+
+            if blocks[0].parent_hash != cursor.block_hash:
+                self.rewind(cursor)
+                continue
+
+            created.extend(self.apply_blocks(cursor, blocks, addresses))
+            if max_blocks is not None:
+                max_blocks -= len(blocks)
+                if max_blocks <= 0:
+                    break
+
+        self.update_confirmations(tip)
+        return created
+
+    @transaction.atomic
+    def apply_blocks(self, cursor, blocks, addresses):
+        """Record deposits from a contiguous run of blocks and advance the cursor"""
+        matches = []
+        parent_hash = cursor.block_hash
+        for block in blocks:
+            if block.parent_hash != parent_hash:
+                # The chain changed while the batch was fetched; stop here
+                break
+            parent_hash = block.hash
+            for tx_hash, address, amount in block.outputs:
+                account_id = addresses.get(self.normalize(address))
+                if account_id is not None:
+                    matches.append((block, tx_hash, address, amount, account_id))
+            cursor.height = block.height
+            cursor.block_hash = block.hash
+            cursor.recent_hashes[str(block.height)] = block.hash
+
+        existing = set(
+            Transaction.objects.filter(
+                network=self.network,
+                transaction_type='deposit',
+                transaction_hash__in=[m[1] for m in matches]
+            ).exclude(status='cancelled').values_list('transaction_hash', 'reference_id')
+        )
+        deposits = [
+            Transaction(
+                account_id=account_id,
+                transaction_type='deposit',
+                amount=amount,
+                status='pending',
+                network=self.network,
+                transaction_hash=tx_hash,
+                reference_id=address,
+                metadata={'block_height': block.height, 'block_hash': block.hash}
+            )
+            for block, tx_hash, address, amount, account_id in matches
+            if (tx_hash, address) not in existing
+        ]
+        Transaction.objects.bulk_create(deposits)
+
+        horizon = cursor.height - self.REORG_DEPTH
+        cursor.recent_hashes = {
+            height: block_hash
+            for height, block_hash in cursor.recent_hashes.items()
+            if int(height) > horizon
+        }
+        cursor.save()
+
+        if deposits:
+            logger.info(f"Detected {len(deposits)} {self.network} deposits up to block {cursor.height}")
+        return deposits
+
+    @transaction.atomic
+    def rewind(self, cursor):
+        """Move the cursor back to the last block still on the canonical chain"""
+        known = {int(h): block_hash for h, block_hash in cursor.recent_hashes.items()}
+        canonical = self.source.get_hashes(sorted(known))
+
+        fork = min(known) - 1
+        for height in sorted(known, reverse=True):
+            if canonical.get(height) == known[height]:
+                fork = height
+                break
+
+        if fork < min(known):
+            logger.critical(
+                f"{self.network} reorg deeper than {self.REORG_DEPTH} blocks at height {cursor.height}"
+            )
+            raise RuntimeError(f"{self.network} reorg deeper than the tracked window")
+
+        orphaned = Transaction.objects.filter(
+            network=self.network,
+            transaction_type='deposit',
+            metadata__block_height__gt=fork
+        )
+        credited = orphaned.filter(status='completed').count()
+        if credited:
+            logger.critical(
+                f"{credited} completed {self.network} deposits were in orphaned blocks above {fork}"
+            )
+        cancelled = orphaned.filter(status__in=['pending', 'processing']).update(
+            status='cancelled'
+        )
+
+        logger.warning(
+            f"{self.network} reorg: rewound from {cursor.height} to {fork}, "
+            f"cancelled {cancelled} pending deposits"
+        )
+        cursor.height = fork
+        cursor.block_hash = known[fork]
+        cursor.recent_hashes = {
+            str(h): block_hash for h, block_hash in known.items() if h <= fork
+        }
+        cursor.save()
+
+    def update_confirmations(self, tip):
+        """Recompute confirmations of open deposits from their block height"""
+        from .services import DepositService
+
+        deposits = Transaction.objects.filter(
+            network=self.network,
+            transaction_type='deposit',
+            status__in=['pending', 'processing'],
+            metadata__has_key='block_height'
+        ).select_related('account')
+
+        offset = self.source.confirmation_offset
+        updates = [
+            (deposit, max(tip - deposit.metadata['block_height'] + offset, 0))
+            for deposit in deposits
+        ]
+        return DepositService.process_deposit_confirmations(updates)
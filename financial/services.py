@@ -9,6 +9,8 @@ from django.conf import settings
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 from .blockchain import BlockchainAPI
+from .ledger import Ledger, InsufficientFundsError
+from .confirmations import ConfirmationPoller
 
 class FinancialService:
     @staticmethod
@@ -16,6 +18,20 @@ class FinancialService:
     def create_transaction(account, transaction_type, amount, fee=Decimal('0'), 
                           reference_id='', description='', metadata=None):
         """Create a new financial transaction"""
+        # Update account balance based on transaction type
+        deltas = {}
+        if transaction_type in ['deposit', 'bet_win', 'refund']:
+            deltas['balance'] = amount
+        elif transaction_type in ['withdrawal', 'bet_loss', 'fee']:
+            deltas['balance'] = -amount
+            
+        if transaction_type == 'deposit':
+            deltas['total_deposited'] = amount
+        elif transaction_type == 'withdrawal':
+            deltas['total_withdrawn'] = amount
+            
+        Ledger.post(account, **deltas)
+        
         transaction = Transaction.objects.create(
             account=account,
             transaction_type=transaction_type,
@@ -25,19 +41,6 @@ class FinancialService:
             description=description,
             metadata=metadata or {}
         )
-        
-        # Update account balance based on transaction type
-        if transaction_type in ['deposit', 'bet_win', 'refund']:
-            account.balance += amount
-        elif transaction_type in ['withdrawal', 'bet_loss', 'fee']:
-            account.balance -= amount
-            
-        if transaction_type == 'deposit':
-            account.total_deposited += amount
-        elif transaction_type == 'withdrawal':
-            account.total_withdrawn += amount
-            
-        account.save()
         return transaction
 
     @staticmethod
@@ -112,24 +115,20 @@ class FinancialService:
     @transaction.atomic
     def freeze_balance(account, amount):
         """Freeze balance for pending operations"""
-        if account.balance < amount:
+        try:
+            Ledger.post(account, balance=-amount, frozen_balance=amount)
+        except InsufficientFundsError:
             return False
-            
-        account.balance -= amount
-        account.frozen_balance += amount
-        account.save()
         return True
 
     @staticmethod
     @transaction.atomic
     def unfreeze_balance(account, amount):
         """Unfreeze previously frozen balance"""
-        if account.frozen_balance < amount:
+        try:
+            Ledger.post(account, frozen_balance=-amount, balance=amount)
+        except InsufficientFundsError:
             return False
-            
-        account.frozen_balance -= amount
-        account.balance += amount
-        account.save()
         return True
 
 class SecurityService:
@@ -208,16 +207,14 @@ class DepositService:
     def check_deposit_confirmations(self, deposit):
         """Check deposit confirmations using blockchain API"""
         try:
-            if deposit.network == 'BTC':
-                confirmations = self.blockchain.get_btc_confirmations(deposit.transaction_hash)
-            elif deposit.network == 'ETH':
-                confirmations = self.blockchain.get_eth_confirmations(deposit.transaction_hash)
-            elif deposit.network == 'USDT':
-                confirmations = self.blockchain.get_usdt_confirmations(deposit.transaction_hash)
-            else:
+            if deposit.network not in ConfirmationPoller.METHODS:
                 raise ValueError(f"Unsupported network: {deposit.network}")
             
-            return confirmations
+            confirmations = ConfirmationPoller.shared().fetch_confirmations(
+                deposit.network,
+                [deposit]
+            )
+            return confirmations[deposit.id]
             
         except Exception as e:
             print(f"Error checking confirmations: {str(e)}")
@@ -250,21 +247,68 @@ class DepositService:
     @staticmethod
     def process_deposit_confirmation(deposit, confirmations):
         """Process deposit confirmation update"""
-        deposit.confirmations = confirmations
+        return DepositService.process_deposit_confirmations([(deposit, confirmations)])
+    
+    @staticmethod
+    @transaction.atomic
+    def process_deposit_confirmations(updates):
+        """Apply ``[(deposit, confirmations), ...]`` in bulk
         
-        # Check if deposit is confirmed
-        if confirmations >= settings.CONFIRMATIONS_REQUIRED[deposit.network]:
-            deposit.status = 'completed'
-            deposit.account.balance += deposit.amount
-            deposit.account.save()
+        Confirmation counts are written with one bulk UPDATE. Deposits that
+        reach the required confirmations are completed and credited with
+        one ledger posting. Only deposits still open under a row lock are
+        credited, so overlapping polls cannot credit a deposit twice.
+        Returns the deposits whose confirmations changed.
+        """
+        changed = [
+            (deposit, confirmations)
+            for deposit, confirmations in updates
+            if confirmations != deposit.confirmations
+        ]
+        if not changed:
+            return []
         
-        deposit.save()
-        DepositService.notify_deposit_update(deposit)
+        for deposit, confirmations in changed:
+            deposit.confirmations = confirmations
+        Transaction.objects.bulk_update(
+            [deposit for deposit, _ in changed],
+            ['confirmations']
+        )
+        
+        confirmed = {
+            deposit.pk: deposit
+            for deposit, confirmations in changed
+            if confirmations >= settings.CONFIRMATIONS_REQUIRED[deposit.network]
+        }
+        open_ids = list(
+            Transaction.objects.select_for_update().filter(
+                pk__in=confirmed.keys(),
+                status__in=['pending', 'processing']
+            ).values_list('pk', flat=True)
+        )
+        
+        if open_ids:
+            completed_at = timezone.now()
+            Transaction.objects.filter(pk__in=open_ids).update(
+                status='completed',
+                completed_at=completed_at
+            )
+            postings = []
+            for pk in open_ids:
+                deposit = confirmed[pk]
+                deposit.status = 'completed'
+                deposit.completed_at = completed_at
+                postings.append((deposit.account_id, deposit.amount))
+            Ledger.post_many(postings)
+            Ledger.post_many(postings, field='total_deposited')
+        
+        deposits = [deposit for deposit, _ in changed]
+        transaction.on_commit(
+            lambda: [DepositService.notify_deposit_update(d) for d in deposits]
+        )
+        return deposits
 
 class WithdrawalService:
-    def __init__(self):
-        self.blockchain = BlockchainAPI()
-
     def create_withdrawal_request(self, user, network, amount, address):
         """Create a new withdrawal request"""
         try:
@@ -277,24 +321,23 @@ class WithdrawalService:
             fee = Decimal(settings.NETWORK_FEES[network])
             total_amount = amount + fee
 
-            # Check user balance
-            if user.financialaccount.balance < total_amount:
-                raise ValueError("Insufficient balance")
-
-            # Create withdrawal request
-            withdrawal = WithdrawalRequest.objects.create(
-                account=user.financialaccount,
-                network=network,
-                amount=amount,
-                fee=fee,
-                address=address,
-                status='pending'
-            )
-
-            # Freeze the withdrawal amount
-            user.financialaccount.balance -= total_amount
-            user.financialaccount.frozen_balance += total_amount
-            user.financialaccount.save()
+            with transaction.atomic():
+                # Freeze the withdrawal amount; fails if the balance is short
+                Ledger.post(
+                    user.financialaccount,
+                    balance=-total_amount,
+                    frozen_balance=total_amount
+                )
+
+                # Create withdrawal request
+                withdrawal = WithdrawalRequest.objects.create(
+                    account=user.financialaccount,
+                    network=network,
+                    amount=amount,
+                    fee=fee,
+                    address=address,
+                    status='pending'
+                )
 
             return withdrawal
 
@@ -302,66 +345,55 @@ class WithdrawalService:
             print(f"Error creating withdrawal: {str(e)}")
             raise
 
-    def process_withdrawal(self, withdrawal):
-        """Process a pending withdrawal request"""
-        try:
-            if withdrawal.status != 'pending':
-                raise ValueError("Invalid withdrawal status")
-
-            # Update status to processing
-            withdrawal.status = 'processing'
-            withdrawal.save()
-
-            # Create blockchain transaction
-            tx_hash = self.blockchain.send_transaction(
-                withdrawal.network,
-                withdrawal.address,
-                withdrawal.amount
-            )
-
-            # Update withdrawal with transaction hash
-            withdrawal.transaction_hash = tx_hash
-            withdrawal.processed_at = timezone.now()
-            withdrawal.status = 'completed'
-            withdrawal.save()
-
-            # Move from frozen balance to withdrawn
-            account = withdrawal.account
-            account.frozen_balance -= (withdrawal.amount + withdrawal.fee)
-            account.total_withdrawn += withdrawal.amount
-            account.save()
-
-            # Create transaction record
-            Transaction.objects.create(
-                account=account,
-                transaction_type='withdrawal',
-                amount=withdrawal.amount,
-                fee=withdrawal.fee,
-                network=withdrawal.network,
-                transaction_hash=tx_hash,
-                status='completed'
-            )
-
-            # Notify user
-            self.notify_withdrawal_update(withdrawal)
-
-            return withdrawal
+    @staticmethod
+    @transaction.atomic
+    def complete_withdrawal(withdrawal, tx_hash):
+        """Record a sent withdrawal and settle its frozen funds"""
+        withdrawal.transaction_hash = tx_hash
+        withdrawal.processed_at = timezone.now()
+        withdrawal.status = 'completed'
+        withdrawal.save()
+
+        # Move from frozen balance to withdrawn
+        account = withdrawal.account
+        Ledger.post(
+            account,
+            frozen_balance=-(withdrawal.amount + withdrawal.fee),
+            total_withdrawn=withdrawal.amount
+        )
 
-        except Exception as e:
-            # Handle failure
-            withdrawal.status = 'failed'
-            withdrawal.error_message = str(e)
-            withdrawal.save()
+        # Create transaction record
+        Transaction.objects.create(
+            account=account,
+            transaction_type='withdrawal',
+            amount=withdrawal.amount,
+            fee=withdrawal.fee,
+            network=withdrawal.network,
+            transaction_hash=tx_hash,
+            status='completed'
+        )
 
-            # Return frozen balance to available
-            account = withdrawal.account
-            account.frozen_balance -= (withdrawal.amount + withdrawal.fee)
-            account.balance += (withdrawal.amount + withdrawal.fee)
-            account.save()
+        # Notify user
+        transaction.on_commit(
+            lambda: WithdrawalService.notify_withdrawal_update(withdrawal)
+        )
 
-            # Notify user of failure
-            self.notify_withdrawal_update(withdrawal)
-            raise
+    @staticmethod
+    @transaction.atomic
+    def fail_withdrawal(withdrawal, error):
+        """Mark a withdrawal failed and return its frozen funds"""
+        withdrawal.status = 'failed'
+        withdrawal.error_message = str(error)
+        withdrawal.save()
+
+        # Return frozen balance to available
+        total = withdrawal.amount + withdrawal.fee
+        Ledger.post(withdrawal.account, frozen_balance=-total, balance=total)
+
+        # Notify user of failure
+        transaction.on_commit(
+            lambda: WithdrawalService.notify_withdrawal_update(withdrawal)
+        )
 
     @staticmethod
     def notify_withdrawal_update(withdrawal):
@@ -0,0 +1,239 @@
+from django.db.models import OuterRef, Q, Subquery, Sum, Count, F, Value, BigIntegerField, DecimalField
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from datetime import timedelta
+from decimal import Decimal
+from .models import BalanceSnapshot, FinancialAccount, Transaction
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Transactions that can still change status
+OPEN_STATUSES = ('pending', 'processing')
+
+def latest_snapshot(account_ref, field):
+    """Subquery for ``field`` of the newest snapshot of ``account_ref``"""
+    return Subquery(
+        BalanceSnapshot.objects.filter(
+            account_id=account_ref
+        ).order_by('-high_water_mark', '-id').values(field)[:1]
+    )
+
+class BalanceSnapshots:
+    """Periodic per-account checkpoints of balance and totals.
+
+    A snapshot covers every transaction of an account up to its
+    ``high_water_mark`` id. Amounts never change, so the balance is final.
+    Deposits and withdrawals that were still open are kept aside in
+    ``open_transactions`` and folded into the totals once they settle.
+    Balance, total, statement and audit queries start from the newest
+    snapshot and only read the transactions after it.
+
+    Ids are assigned at insert, not at commit, so a transaction with a
+    lower id can become visible after a higher one. Snapshots therefore
+    stop at each account's first transaction younger than ``COMMIT_LAG``.
+    Snapshots are never changed once written; carried transactions that
+    settle are recorded in a new snapshot.
+    """
+
+    CHUNK_SIZE = 500
+    # Longest a transaction is expected to stay uncommitted after insert
+    COMMIT_LAG = timedelta(minutes=5)
+
+    @staticmethod
+    def take(account_ids=None, every=None, chunk_size=None):
+        """Snapshot accounts with new or newly settled transactions
+
+        Only transactions after each account's newest snapshot, and the
+        open ones it carries, are read. With ``every``, a snapshot is also
+        written after each ``every`` transactions, which is how the
+        backfill builds history. Returns the number of snapshots created.
+        """
+        chunk_size = chunk_size or BalanceSnapshots.CHUNK_SIZE
+        accounts = FinancialAccount.objects.order_by('id')
+        if account_ids is not None:
+            accounts = accounts.filter(id__in=account_ids)
+
+        created = 0
+        chunk = []
+        for account_id in accounts.values_list('id', flat=True).iterator(chunk_size=chunk_size):
+            chunk.append(account_id)
+            if len(chunk) >= chunk_size:
+                created += BalanceSnapshots._take_chunk(chunk, every)
+                chunk = []
+        if chunk:
+            created += BalanceSnapshots._take_chunk(chunk, every)
+
+        if created:
+            logger.info(f"Created {created} balance snapshots")
+        return created
+
+    @staticmethod
+    def _take_chunk(account_ids, every):
+        now = timezone.now()
+        cutoff = now - BalanceSnapshots.COMMIT_LAG
+        previous = {
+            snapshot.account_id: snapshot
+            for snapshot in BalanceSnapshot.objects.filter(
+                id__in=FinancialAccount.objects.filter(id__in=account_ids).annotate(
+                    snapshot_id=latest_snapshot(OuterRef('pk'), 'id')
+                ).exclude(snapshot_id=None).values('snapshot_id')
+            )
+        }
+        current = {
+            account_id: BalanceSnapshots._start(account_id, snapshot)
+            for account_id, snapshot in previous.items()
+        }
+
+        # Settle what the previous snapshots left open
+        carried = [tx_id for s in previous.values() for tx_id in s.open_transactions]
+        for tx_id, account_id, amount, tx_type, status in Transaction.objects.filter(
+            id__in=carried
+        ).values_list('id', 'account_id', 'amount', 'transaction_type', 'status'):
+            if status not in OPEN_STATUSES:
+                snapshot = current[account_id]
+                snapshot.open_transactions.remove(tx_id)
+                BalanceSnapshots._add_total(snapshot, amount, tx_type, status)
+
+        rows = Transaction.objects.filter(
+            account_id__in=account_ids
+        ).annotate(
+            snapshot_mark=Coalesce(
+                latest_snapshot(OuterRef('account_id'), 'high_water_mark'),
+                Value(0),
+                output_field=BigIntegerField()
+            )
+        ).filter(
+            id__gt=F('snapshot_mark')
+        ).order_by('account_id', 'id').values_list(
+            'account_id', 'id', 'amount', 'transaction_type', 'status', 'created_at'
+        )
+
+        snapshots = []
+        recent = set()
+        for account_id, tx_id, amount, tx_type, status, created_at in rows.iterator():
+            if account_id in recent:
+                continue
+            if created_at >= cutoff:
+                # Lower ids may still be uncommitted; the next run covers this
+                recent.add(account_id)
+                continue
+            if account_id not in current:
+                current[account_id] = BalanceSnapshots._start(account_id, None)
+            snapshot = current[account_id]
+
+            snapshot.balance += amount
+            if status in OPEN_STATUSES:
+                if tx_type in ('deposit', 'withdrawal'):
+                    snapshot.open_transactions.append(tx_id)
+            else:
+                BalanceSnapshots._add_total(snapshot, amount, tx_type, status)
+            snapshot.transaction_count += 1
+            snapshot.high_water_mark = tx_id
+            snapshot.as_of = created_at
+
+            if every and snapshot.transaction_count % every == 0:
+                snapshots.append(snapshot)
+                current[account_id] = BalanceSnapshots._start(account_id, snapshot)
+
+        for account_id, snapshot in current.items():
+            if snapshot.high_water_mark != snapshot.start_mark:
+                snapshots.append(snapshot)
+            elif account_id in previous and (
+                snapshot.open_transactions != previous[account_id].open_transactions
+            ):
+                # No new transactions, but some carried ones settled. The
+                # previous snapshot stays as it was for point-in-time reads.
+                snapshot.as_of = now
+                snapshots.append(snapshot)
+
+        BalanceSnapshot.objects.bulk_create(snapshots)
+        return len(snapshots)
+
+    @staticmethod
+    def _start(account_id, base):
+        """Unsaved snapshot carrying on from ``base``"""
+        snapshot = BalanceSnapshot(account_id=account_id, high_water_mark=0)
+        if base is not None:
+            for field in ('high_water_mark', 'balance', 'total_deposited',
+                          'total_withdrawn', 'transaction_count', 'as_of'):
+                setattr(snapshot, field, getattr(base, field))
+            snapshot.open_transactions = list(base.open_transactions)
+        snapshot.start_mark = snapshot.high_water_mark
+        return snapshot
+
+    @staticmethod
+    def _add_total(snapshot, amount, tx_type, status):
+        if status == 'completed' and tx_type == 'deposit':
+            snapshot.total_deposited += amount
+        elif status == 'completed' and tx_type == 'withdrawal':
+            snapshot.total_withdrawn += amount
+
+    @staticmethod
+    def latest(account, when=None):
+        """Newest snapshot of ``account``, or the newest as of ``when``"""
+        snapshots = BalanceSnapshot.objects.filter(account=account)
+        if when is not None:
+            snapshots = snapshots.filter(as_of__lte=when)
+        return snapshots.order_by('-high_water_mark', '-id').first()
+
+    @staticmethod
+    def totals(account, when=None):
+        """Balance and completed deposit and withdrawal totals
+
+        Reads the newest snapshot, then aggregates only the transactions
+        after it and the ones it left open. With ``when``, the totals are
+        as of that moment.
+        """
+        snapshot = BalanceSnapshots.latest(account, when)
+        mark = snapshot.high_water_mark if snapshot else 0
+        after = Q(id__gt=mark)
+        tail = Transaction.objects.filter(account=account).filter(
+            after | Q(id__in=snapshot.open_transactions) if snapshot else after
+        )
+        if when is not None:
+            tail = tail.filter(created_at__lte=when)
+
+        def total(condition):
+            return Coalesce(
+                Sum('amount', filter=condition),
+                Value(Decimal('0')),
+                output_field=DecimalField(max_digits=18, decimal_places=8)
+            )
+
+        delta = tail.aggregate(
+            balance=total(after),
+            total_deposited=total(Q(transaction_type='deposit', status='completed')),
+            total_withdrawn=total(Q(transaction_type='withdrawal', status='completed')),
+            transaction_count=Count('id', filter=after)
+        )
+
+        if snapshot is not None:
+            for field in delta:
+                delta[field] += getattr(snapshot, field)
+        return delta
+
+    @staticmethod
+    def balance_at(account, when=None):
+        """Sum of the account's transaction amounts as of ``when``"""
+        return BalanceSnapshots.totals(account, when)['balance']
+
+    @staticmethod
+    def statement(account, start, end):
+        """Opening balance, transactions and closing balance for a period"""
+        opening = BalanceSnapshots.balance_at(account, start)
+        transactions = list(
+            Transaction.objects.filter(
+                account=account,
+                created_at__gt=start,
+                created_at__lte=end
+            ).order_by('created_at', 'id')
+        )
+        return {
+            'opening_balance': opening,
+            'transactions': transactions,
+            'closing_balance': opening + sum(
+                (t.amount for t in transactions),
+                Decimal('0')
+            )
+        }
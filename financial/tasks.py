@@ -4,30 +4,18 @@ from .models import Transaction, DepositAddress, WithdrawalRequest
 from .services import DepositService, WithdrawalService
 from celery import shared_task
 from .monitoring import MonitoringService
+from .events import BalanceEventPublisher
+from .confirmations import ConfirmationPoller
+from .scanner import ChainScanner, RpcBlockSource
+from .withdrawals import WithdrawalDispatcher
+from .snapshots import BalanceSnapshots
 
 class DepositMonitor:
     @staticmethod
     def check_deposit_confirmations():
         """Check confirmations for pending deposits"""
-        # Get all pending deposits
-        pending_deposits = Transaction.objects.filter(
-            transaction_type='deposit',
-            status__in=['pending', 'processing']
-        ).select_related('account')
-
-        for deposit in pending_deposits:
-            try:
-                # Get current confirmations from blockchain
-                confirmations = DepositMonitor.get_blockchain_confirmations(
-                    deposit.network,
-                    deposit.transaction_hash
-                )
-                
-                # Update deposit status
-                DepositService.process_deposit_confirmation(deposit, confirmations)
-                
-            except Exception as e:
-                print(f"Error checking deposit {deposit.id}: {str(e)}")
+        # One batched poll per network instead of one RPC per deposit
+        return ConfirmationPoller.shared().poll()
 
     @staticmethod
     def get_blockchain_confirmations(network, tx_hash):
@@ -70,30 +58,44 @@ class DepositMonitor:
         pass 
 
 @shared_task
-def process_pending_withdrawals():
-    """Process all pending withdrawals"""
-    withdrawal_service = WithdrawalService()
-    
-    # Get pending withdrawals
-    pending_withdrawals = WithdrawalRequest.objects.filter(
-        status='pending'
-    ).select_related('account')
+def check_deposit_confirmations():
+    """Poll confirmations for all pending deposits"""
+    updated = DepositMonitor.check_deposit_confirmations()
+    return len(updated)
 
-    for withdrawal in pending_withdrawals:
+@shared_task
+def scan_deposit_blocks():
+    """Scan new blocks on each network for deposits to our addresses"""
+    clients = ConfirmationPoller.shared().clients
+    created = 0
+    for network in ChainScanner.NETWORKS:
         try:
-            withdrawal_service.process_withdrawal(withdrawal)
+            scanner = ChainScanner(RpcBlockSource(network, clients[network]))
+            created += len(scanner.scan())
         except Exception as e:
-            print(f"Error processing withdrawal {withdrawal.id}: {str(e)}")
+            print(f"Error scanning {network} blocks: {str(e)}")
+    return created
+
+@shared_task
+def process_pending_withdrawals():
+    """Process all pending withdrawals"""
+    summary = WithdrawalDispatcher.shared().dispatch()
+    
+    # Keep draining while any network returned a full batch
+    if any(
+        counts['sent'] + counts['failed'] >= WithdrawalDispatcher.BATCH_SIZE
+        for counts in summary.values()
+    ):
+        process_pending_withdrawals.delay()
+    return summary
 
 @shared_task
 def process_single_withdrawal(withdrawal_id):
     """Process a single withdrawal request"""
     try:
-        withdrawal = WithdrawalRequest.objects.get(id=withdrawal_id)
-        withdrawal_service = WithdrawalService()
-        withdrawal_service.process_withdrawal(withdrawal)
-    except WithdrawalRequest.DoesNotExist:
-        print(f"Withdrawal {withdrawal_id} not found")
+        result = WithdrawalDispatcher.shared().dispatch_one(withdrawal_id)
+        if result is None:
+            print(f"Withdrawal {withdrawal_id} not found or not pending")
     except Exception as e:
         print(f"Error processing withdrawal {withdrawal_id}: {str(e)}")
 
@@ -109,10 +111,12 @@ def monitor_system():
     # Check pending withdrawals
     monitoring.check_pending_withdrawals()
 
-# Add to CELERY_BEAT_SCHEDULE in settings.py
-CELERY_BEAT_SCHEDULE.update({
-    'monitor_system': {
-        'task': 'financial.tasks.monitor_system',
-        'schedule': 300.0,  # Run every 5 minutes
-    },
-}) 
\ No newline at end of file
+@shared_task
+def take_balance_snapshots():
+    """Checkpoint every account with new settled transactions"""
+    return BalanceSnapshots.take()
+
+@shared_task
+def publish_balance_update(account_id):
+    """Publish a coalesced balance update for an account"""
+    BalanceEventPublisher.publish(account_id)
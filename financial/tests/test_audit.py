@@ -0,0 +1,98 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+import json
+from ..audit import AccountAuditor
+from ..models import AuditCheckpoint, FinancialAccount, Transaction
+
+User = get_user_model()
+
+class AccountAuditorTests(TestCase):
+    def setUp(self):
+        self.accounts = []
+        for i in range(5):
+            account = FinancialAccount.objects.create(
+                user=User.objects.create_user(username=f'user{i}', password='testpass123'),
+                balance=Decimal('10.00')
+            )
+            Transaction.objects.create(
+                account=account,
+                transaction_type='deposit',
+                amount=Decimal('10.00'),
+                status='completed'
+            )
+            self.accounts.append(account)
+
+    def break_balance(self, account, balance='7.00'):
+        FinancialAccount.objects.filter(pk=account.pk).update(balance=Decimal(balance))
+
+    def test_finds_discrepancies(self):
+        self.break_balance(self.accounts[2])
+        empty = FinancialAccount.objects.create(
+            user=User.objects.create_user(username='empty', password='testpass123'),
+            balance=Decimal('1.00')
+        )
+
+        checked, discrepancies = AccountAuditor.audit_all()
+
+        self.assertEqual(checked, 6)
+        self.assertEqual(
+            [(d['account_id'], d['difference']) for d in discrepancies],
+            [(self.accounts[2].id, Decimal('-3.00')), (empty.id, Decimal('1.00'))]
+        )
+
+    def test_query_count_does_not_grow_with_accounts(self):
+        with CaptureQueriesContext(connection) as queries:
+            AccountAuditor.audit_all(chunk_size=2)
+
+        # One streamed query per side, not one aggregate per account
+        self.assertEqual(len(queries), 2)
+
+    def test_shard_ranges_cover_every_account(self):
+        ranges = AccountAuditor.shard_ranges(2)
+        checked = sum(AccountAuditor.audit_range(start, end)[0] for start, end in ranges)
+
+        self.assertEqual(checked, 5)
+
+    def test_incremental_only_audits_touched_accounts(self):
+        AccountAuditor.run()
+        AuditCheckpoint.objects.update(checkpoint_at=timezone.now() - timedelta(minutes=1))
+        old = timezone.now() - timedelta(hours=1)
+        FinancialAccount.objects.update(updated_at=old)
+        Transaction.objects.update(updated_at=old)
+
+        # Changed without touching updated_at; an incremental run cannot see it
+        self.break_balance(self.accounts[0])
+        Transaction.objects.create(
+            account=self.accounts[1],
+            transaction_type='deposit',
+            amount=Decimal('5.00')
+        )
+
+        checked, discrepancies = AccountAuditor.run(incremental=True)
+
+        self.assertEqual(checked, 1)
+        self.assertEqual([d['account_id'] for d in discrepancies], [self.accounts[1].id])
+
+    def test_command_fixes_and_reports(self):
+        self.break_balance(self.accounts[3])
+        out = StringIO()
+
+        call_command('audit_accounts', '--fix', '--report', '-', stdout=out)
+
+        self.accounts[3].refresh_from_db()
+        self.assertEqual(self.accounts[3].balance, Decimal('10.00'))
+        report = [
+            json.loads(line) for line in out.getvalue().splitlines()
+            if line.startswith('{')
+        ]
+        self.assertEqual(len(report), 1)
+        self.assertEqual(report[0]['account_id'], self.accounts[3].id)
+        self.assertTrue(report[0]['fixed'])
+        self.assertEqual(AuditCheckpoint.objects.get(name='balances').discrepancies, 1)
@@ -0,0 +1,88 @@
+from django.test import SimpleTestCase
+from unittest.mock import patch
+import asyncio
+import httpx
+from ..blockchain import AsyncBlockchainClient, BlockchainAPI, LoopClient
+from ..confirmations import ConfirmationPoller
+from ..fakenode import FakeNode
+from ..rpc import AsyncJsonRpcClient
+
+class AsyncBlockchainClientTests(SimpleTestCase):
+    def setUp(self):
+        self.btc_node = FakeNode(tip=500)
+        self.eth_node = FakeNode(tip=1000)
+        self.client = AsyncBlockchainClient(clients={
+            'BTC': AsyncJsonRpcClient(
+                'http://btc',
+                client=httpx.AsyncClient(transport=self.btc_node.transport())
+            ),
+            'ETH': AsyncJsonRpcClient(
+                'http://eth',
+                client=httpx.AsyncClient(transport=self.eth_node.transport())
+            ),
+        })
+        self.addCleanup(self.client.close)
+
+    def test_sync_wrapper(self):
+        self.btc_node.add_transaction('btc0', block_number=498)
+
+        self.assertEqual(BlockchainAPI(self.client).get_btc_confirmations('btc0'), 3)
+
+    def test_eth_confirmations_use_one_request(self):
+        self.eth_node.add_transaction('eth0', block_number=990)
+
+        self.assertEqual(BlockchainAPI(self.client).get_eth_confirmations('eth0'), 10)
+        self.assertEqual(self.eth_node.requests, 1)
+
+    def test_awaitable_from_another_loop(self):
+        self.btc_node.add_transaction('btc0', block_number=None)
+
+        async def consumer():
+            return await asyncio.gather(*[
+                self.client.arun(self.client.get_confirmations('BTC', 'btc0'))
+                for _ in range(5)
+            ])
+
+        self.assertEqual(asyncio.run(consumer()), [0] * 5)
+
+    def test_connections_are_reused(self):
+        loop = self.client.loop
+        BlockchainAPI(self.client).get_btc_confirmations('missing')
+        BlockchainAPI(self.client).get_btc_confirmations('missing')
+
+        self.assertIs(self.client.loop, loop)
+        self.assertEqual(self.btc_node.requests, 2)
+
+    def test_unknown_network_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.client.run(self.client.get_confirmations('DOGE', 'tx'))
+
+    def test_shared_client(self):
+        self.assertIs(AsyncBlockchainClient.shared(), AsyncBlockchainClient.shared())
+        self.assertIs(BlockchainAPI().client, AsyncBlockchainClient.shared())
+
+    def test_sync_client_uses_shared_connections(self):
+        rpc = self.client.sync_client('ETH')
+        self.assertIs(self.client.sync_client('ETH'), rpc)
+
+        self.assertEqual(rpc.call('eth_blockNumber'), hex(1000))
+        self.assertEqual(rpc.batch([('eth_blockNumber', []), ('eth_gasPrice', [])])[0], hex(1000))
+        self.assertEqual(self.eth_node.requests, 2)
+
+    def test_poller_uses_shared_client(self):
+        clients = ConfirmationPoller.default_clients()
+        self.assertIsInstance(clients['ETH'], LoopClient)
+        self.assertIs(clients['ETH'].blockchain, AsyncBlockchainClient.shared())
+
+    def test_forked_process_starts_its_own_loop(self):
+        loop = self.client.loop
+        self.client.clients['BTC'] = object()
+
+        with patch('financial.blockchain.os.getpid', return_value=-1):
+            child_loop = self.client.loop
+
+        self.assertIsNot(child_loop, loop)
+        # Connections opened in the parent are not reused
+        self.assertEqual(self.client.clients, {})
+        loop.call_soon_threadsafe(loop.stop)
+        child_loop.call_soon_threadsafe(child_loop.stop)
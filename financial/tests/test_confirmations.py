@@ -0,0 +1,80 @@
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from decimal import Decimal
+from unittest.mock import patch
+from ..models import FinancialAccount, Transaction
+from ..confirmations import ConfirmationPoller
+from ..fakenode import FakeNode
+from ..rpc import JsonRpcClient
+from ..services import DepositService
+
+User = get_user_model()
+
+@override_settings(CONFIRMATIONS_REQUIRED={'BTC': 2, 'ETH': 12, 'USDT': 20})
+@patch('financial.services.DepositService.notify_deposit_update')
+class ConfirmationPollerTests(TestCase):
+    def setUp(self):
+        self.account = FinancialAccount.objects.create(
+            user=User.objects.create_user(username='testuser', password='testpass123')
+        )
+        self.eth_node = FakeNode(tip=1000)
+        self.btc_node = FakeNode(tip=500)
+        self.poller = ConfirmationPoller(clients={
+            'ETH': JsonRpcClient('http://eth', session=self.eth_node.session()),
+            'BTC': JsonRpcClient('http://btc', session=self.btc_node.session()),
+        })
+
+    def deposit(self, network, tx_hash, amount='1.00'):
+        return Transaction.objects.create(
+            account=self.account,
+            transaction_type='deposit',
+            amount=Decimal(amount),
+            network=network,
+            transaction_hash=tx_hash
+        )
+
+    def test_one_request_per_network(self, mock_notify):
+        for i in range(30):
+            self.eth_node.add_transaction(f'eth{i}', block_number=995)
+            self.deposit('ETH', f'eth{i}')
+        self.btc_node.add_transaction('btc0', block_number=480)
+        self.deposit('BTC', 'btc0')
+
+        self.poller.poll()
+
+        # Tip plus one batch for ETH; BTC needs no tip
+        self.assertEqual(self.eth_node.requests, 2)
+        self.assertEqual(self.btc_node.requests, 1)
+        self.assertEqual(
+            Transaction.objects.filter(network='ETH', confirmations=5).count(),
+            30
+        )
+
+    def test_confirmed_deposits_are_credited_once(self, mock_notify):
+        self.eth_node.add_transaction('ready', block_number=980)
+        self.eth_node.add_transaction('waiting')
+        ready = self.deposit('ETH', 'ready', '2.50')
+        waiting = self.deposit('ETH', 'waiting')
+
+        updated = self.poller.poll()
+        self.assertEqual(updated, [ready])
+
+        self.eth_node.mine(5)
+        self.poller.poll()
+
+        ready.refresh_from_db()
+        waiting.refresh_from_db()
+        self.account.refresh_from_db()
+        self.assertEqual(ready.status, 'completed')
+        self.assertEqual(waiting.status, 'pending')
+        self.assertEqual(self.account.balance, Decimal('2.50'))
+        self.assertEqual(self.account.total_deposited, Decimal('2.50'))
+
+    def test_stale_deposit_is_not_credited_again(self, mock_notify):
+        deposit = self.deposit('ETH', 'done')
+        Transaction.objects.filter(pk=deposit.pk).update(status='completed')
+
+        DepositService.process_deposit_confirmations([(deposit, 30)])
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('0'))
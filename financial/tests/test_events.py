@@ -0,0 +1,64 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from decimal import Decimal
+from unittest.mock import patch, AsyncMock
+from ..models import FinancialAccount, Transaction
+from ..events import BalanceEventPublisher
+
+User = get_user_model()
+
+class BalanceEventPublisherTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.account = FinancialAccount.objects.create(
+            user=self.user,
+            balance=Decimal('10.00')
+        )
+
+    @patch('financial.tasks.publish_balance_update.apply_async')
+    def test_changes_are_coalesced_after_commit(self, mock_publish):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            for _ in range(3):
+                Transaction.objects.create(
+                    account=self.account,
+                    transaction_type='deposit',
+                    amount=Decimal('1.00'),
+                    status='completed'
+                )
+            # Nothing is published while the transaction is open
+            mock_publish.assert_not_called()
+
+        self.assertEqual(len(callbacks), 3)
+        mock_publish.assert_called_once()
+        self.assertEqual(mock_publish.call_args.kwargs['args'], [self.account.id])
+
+    @patch('financial.tasks.publish_balance_update.apply_async')
+    def test_pending_transactions_are_not_published(self, mock_publish):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            Transaction.objects.create(
+                account=self.account,
+                transaction_type='deposit',
+                amount=Decimal('1.00')
+            )
+
+        self.assertEqual(len(callbacks), 0)
+        mock_publish.assert_not_called()
+
+    @patch('financial.events.get_channel_layer')
+    def test_publish_sends_authoritative_balance(self, mock_layer):
+        mock_layer.return_value.group_send = AsyncMock()
+        cache.set(BalanceEventPublisher.pending_key(self.account.id), 1)
+
+        BalanceEventPublisher.publish(self.account.id)
+        self.account.refresh_from_db()
+
+        mock_layer.return_value.group_send.assert_awaited_once_with(
+            f'user_balance_{self.user.id}',
+            {'type': 'balance_update', 'balance': str(self.account.balance)}
+        )
+        self.assertIsNone(cache.get(BalanceEventPublisher.pending_key(self.account.id)))
@@ -0,0 +1,95 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from datetime import timedelta
+from decimal import Decimal
+from ..history import TransactionHistory
+from ..models import FinancialAccount, Transaction
+from users.models import UserIPAddress
+
+User = get_user_model()
+
+class TransactionHistoryTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.account = FinancialAccount.objects.create(user=self.user)
+        # The test client connects from 127.0.0.1; verify it for IPTrackingMiddleware
+        UserIPAddress.objects.create(user=self.user, ip_address='127.0.0.1')
+        self.client.login(username='testuser', password='testpass123')
+
+        # Several rows share a timestamp so the id tiebreak is exercised
+        now = timezone.now()
+        self.transactions = []
+        for i in range(7):
+            tx = Transaction.objects.create(
+                account=self.account,
+                transaction_type='deposit' if i % 2 else 'withdrawal',
+                amount=Decimal(i + 1),
+                status='completed'
+            )
+            Transaction.objects.filter(pk=tx.pk).update(
+                created_at=now - timedelta(days=i // 2)
+            )
+            self.transactions.append(tx)
+
+    def collect(self, **kwargs):
+        seen, cursor = [], None
+        while True:
+            rows, cursor = TransactionHistory.page(self.account, cursor=cursor, limit=3, **kwargs)
+            seen.extend(t.id for t in rows)
+            if cursor is None:
+                return seen
+
+    def test_pages_cover_every_row_once_in_order(self):
+        expected = list(
+            Transaction.objects.filter(account=self.account).order_by(
+                '-created_at', '-id'
+            ).values_list('id', flat=True)
+        )
+
+        self.assertEqual(self.collect(), expected)
+
+    def test_type_filter(self):
+        ids = self.collect(transaction_type='deposit')
+
+        self.assertEqual(
+            set(ids),
+            {t.id for t in self.transactions if t.transaction_type == 'deposit'}
+        )
+
+    def test_date_filter_end_is_inclusive(self):
+        today = timezone.now().date()
+        filters = TransactionHistory.parse_filters({
+            'start': str(today - timedelta(days=1)),
+            'end': str(today - timedelta(days=1)),
+        })
+
+        self.assertEqual(len(self.collect(**filters)), 2)
+
+    def test_bad_cursor(self):
+        with self.assertRaises(ValueError):
+            TransactionHistory.decode_cursor('not-a-cursor')
+
+    def test_json_endpoint(self):
+        url = reverse('financial:transaction_history_json')
+        response = self.client.get(url, {'limit': 4, 'type': 'all'})
+        data = response.json()
+
+        self.assertEqual(len(data['transactions']), 4)
+        self.assertIn('cursor=', data['next_url'])
+
+        response = self.client.get(url, {'limit': 4, 'cursor': data['next_cursor']})
+        data = response.json()
+        self.assertEqual(len(data['transactions']), 3)
+        self.assertIsNone(data['next_cursor'])
+
+        response = self.client.get(url, {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_html_view_is_paginated(self):
+        response = self.client.get(reverse('financial:transaction_history'), {'limit': 5})
+
+        self.assertEqual(len(response.context['transactions']), 5)
+        self.assertIsNotNone(response.context['next_url'])
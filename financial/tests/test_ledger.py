@@ -0,0 +1,77 @@
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.contrib.auth import get_user_model
+from decimal import Decimal
+from ..models import FinancialAccount
+from ..ledger import Ledger, InsufficientFundsError
+from ..services import FinancialService
+
+User = get_user_model()
+
+class LedgerTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.account = FinancialAccount.objects.create(
+            user=self.user,
+            balance=Decimal('100.00')
+        )
+        self.other = FinancialAccount.objects.create(
+            user=User.objects.create_user(username='other', password='testpass123'),
+            balance=Decimal('5.00')
+        )
+
+    def test_debit_and_credit(self):
+        Ledger.debit(self.account, Decimal('40.00'))
+        self.assertEqual(self.account.balance, Decimal('60.00'))
+
+        Ledger.credit(self.account, Decimal('15.00'), total_deposited=Decimal('15.00'))
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('75.00'))
+        self.assertEqual(self.account.total_deposited, Decimal('15.00'))
+
+    def test_debit_rejected_when_balance_short(self):
+        with self.assertRaises(InsufficientFundsError):
+            Ledger.debit(self.account, Decimal('100.01'))
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('100.00'))
+
+    def test_post_many_single_statement(self):
+        with CaptureQueriesContext(connection) as queries:
+            updated = Ledger.post_many([
+                (self.account.pk, Decimal('-10.00')),
+                (self.other.pk, Decimal('2.50')),
+                (self.account.pk, Decimal('1.00')),
+            ])
+
+        self.assertEqual(updated, 2)
+        updates = [q for q in queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.account.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('91.00'))
+        self.assertEqual(self.other.balance, Decimal('7.50'))
+
+    def test_post_many_all_or_nothing(self):
+        with self.assertRaises(InsufficientFundsError):
+            Ledger.post_many([
+                (self.account.pk, Decimal('-10.00')),
+                (self.other.pk, Decimal('-6.00')),
+            ])
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('100.00'))
+
+    def test_freeze_and_unfreeze(self):
+        self.assertTrue(FinancialService.freeze_balance(self.account, Decimal('30.00')))
+        self.assertEqual(self.account.balance, Decimal('70.00'))
+        self.assertEqual(self.account.frozen_balance, Decimal('30.00'))
+
+        self.assertFalse(FinancialService.unfreeze_balance(self.account, Decimal('31.00')))
+        self.assertTrue(FinancialService.unfreeze_balance(self.account, Decimal('30.00')))
+        self.assertEqual(self.account.balance, Decimal('100.00'))
+        self.assertEqual(self.account.frozen_balance, Decimal('0'))
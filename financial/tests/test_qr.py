@@ -0,0 +1,68 @@
+from django.test import TestCase, Client
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from unittest.mock import patch
+from ..models import DepositAddress, FinancialAccount
+from ..qr import DepositQRCode
+from users.models import UserIPAddress
+
+User = get_user_model()
+
+class DepositQRCodeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.account = FinancialAccount.objects.create(user=self.user)
+        # The test client connects from 127.0.0.1; verify it for IPTrackingMiddleware
+        UserIPAddress.objects.create(user=self.user, ip_address='127.0.0.1')
+        self.address = DepositAddress.objects.create(
+            account=self.account,
+            network='BTC',
+            address='bc1qexampleaddress0000000000000000000000'
+        )
+        self.client.login(username='testuser', password='testpass123')
+
+    def test_renders_once_per_address_and_format(self):
+        url = DepositQRCode.url(self.address, 'svg')
+
+        with patch.object(DepositQRCode, 'render', wraps=DepositQRCode.render) as render:
+            first = self.client.get(url)
+            second = self.client.get(url)
+
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first['Content-Type'], 'image/svg+xml')
+        self.assertIn('immutable', first['Cache-Control'])
+
+    def test_both_formats(self):
+        png = DepositQRCode.get('BTC', self.address.address, 'png')
+        svg = DepositQRCode.get('BTC', self.address.address, 'svg')
+
+        self.assertTrue(png.startswith(b'\x89PNG'))
+        self.assertIn(b'<svg', svg)
+
+    def test_etag_answers_not_modified(self):
+        url = DepositQRCode.url(self.address, 'png')
+        etag = self.client.get(url)['ETag']
+
+        with patch.object(DepositQRCode, 'get') as get:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        get.assert_not_called()
+
+    def test_stale_digest_and_other_users_are_rejected(self):
+        url = DepositQRCode.url(self.address, 'png')
+        self.address.address = 'bc1qrotatedaddress'
+        self.address.save()
+
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        other = User.objects.create_user(username='other', password='testpass123')
+        UserIPAddress.objects.create(user=other, ip_address='127.0.0.1')
+        self.client.login(username='other', password='testpass123')
+        self.assertEqual(
+            self.client.get(DepositQRCode.url(self.address, 'png')).status_code,
+            404
+        )
@@ -0,0 +1,87 @@
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from decimal import Decimal
+from unittest.mock import patch
+import os
+from ..models import FinancialAccount, DepositAddress, ChainCursor, Transaction
+from ..scanner import ChainScanner, RecordedBlockSource
+
+User = get_user_model()
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'recorded_blocks.json')
+
+@override_settings(CONFIRMATIONS_REQUIRED={'BTC': 3})
+@patch('financial.services.DepositService.notify_deposit_update')
+class ChainScannerTests(TestCase):
+    def setUp(self):
+        self.alice = self.create_account('alice', '1DepositAlice')
+        self.bob = self.create_account('bob', '1DepositBob')
+        self.source = RecordedBlockSource.from_file(FIXTURE)
+        ChainCursor.objects.create(
+            network='BTC',
+            height=100,
+            block_hash='0000a100',
+            recent_hashes={'100': '0000a100'}
+        )
+        self.scanner = ChainScanner(self.source)
+
+    def create_account(self, username, address):
+        account = FinancialAccount.objects.create(
+            user=User.objects.create_user(username=username, password='testpass123')
+        )
+        DepositAddress.objects.create(account=account, network='BTC', address=address)
+        return account
+
+    def test_scan_detects_deposits_and_confirms(self, mock_notify):
+        created = self.scanner.scan()
+
+        self.assertEqual(
+            sorted(d.transaction_hash for d in created),
+            ['tx102b', 'tx104a']
+        )
+        cursor = ChainCursor.objects.get(network='BTC')
+        self.assertEqual((cursor.height, cursor.block_hash), (106, '0000a106'))
+
+        # Tip 106: block 102 has 5 confirmations, block 104 has 3
+        alice_deposit = Transaction.objects.get(transaction_hash='tx102b')
+        self.assertEqual(alice_deposit.confirmations, 5)
+        self.assertEqual(alice_deposit.status, 'completed')
+        self.alice.refresh_from_db()
+        self.assertEqual(self.alice.balance, Decimal('0.25'))
+
+        # A second scan with no new blocks finds nothing new
+        self.assertEqual(self.scanner.scan(), [])
+        self.assertEqual(Transaction.objects.filter(transaction_type='deposit').count(), 2)
+
+    # Confirmations count against the real tip (106), so block 104 has 3;
+    # require 4 to keep it pending until the reorg orphans it
+    @override_settings(CONFIRMATIONS_REQUIRED={'BTC': 4})
+    def test_reorg_cancels_orphaned_deposits(self, mock_notify):
+        self.scanner.scan(max_blocks=4)
+        self.assertEqual(
+            Transaction.objects.get(transaction_hash='tx104a').confirmations,
+            3
+        )
+        self.assertEqual(
+            Transaction.objects.get(transaction_hash='tx104a').status,
+            'pending'
+        )
+
+        self.source.reorg([
+            {'height': 104, 'hash': '0000b104', 'parent_hash': '0000a103', 'outputs': []},
+            {'height': 105, 'hash': '0000b105', 'parent_hash': '0000b104',
+             'outputs': [['tx105b', '1DepositBob', '0.75']]},
+            {'height': 106, 'hash': '0000b106', 'parent_hash': '0000b105', 'outputs': []},
+            {'height': 107, 'hash': '0000b107', 'parent_hash': '0000b106', 'outputs': []},
+        ])
+        created = self.scanner.scan()
+
+        self.assertEqual([d.transaction_hash for d in created], ['tx105b'])
+        self.assertEqual(
+            Transaction.objects.get(transaction_hash='tx104a').status,
+            'cancelled'
+        )
+        self.assertEqual(
+            ChainCursor.objects.get(network='BTC').block_hash,
+            '0000b107'
+        )
@@ -0,0 +1,151 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+from ..audit import AccountAuditor
+from ..models import BalanceSnapshot, FinancialAccount, Transaction
+from ..snapshots import BalanceSnapshots
+
+User = get_user_model()
+
+@patch.object(BalanceSnapshots, 'COMMIT_LAG', timedelta(0))
+class BalanceSnapshotTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.account = FinancialAccount.objects.create(user=self.user)
+
+    def transact(self, transaction_type, amount, status='completed'):
+        return Transaction.objects.create(
+            account=self.account,
+            transaction_type=transaction_type,
+            amount=Decimal(amount),
+            status=status
+        )
+
+    def test_snapshot_plus_tail_matches_full_history(self):
+        self.transact('deposit', '10.00')
+        self.transact('withdrawal', '4.00')
+        BalanceSnapshots.take()
+        self.transact('deposit', '1.50')
+
+        totals = BalanceSnapshots.totals(self.account)
+
+        self.assertEqual(totals['balance'], Decimal('15.50'))
+        self.assertEqual(totals['total_deposited'], Decimal('11.50'))
+        self.assertEqual(totals['total_withdrawn'], Decimal('4.00'))
+        self.assertEqual(totals['transaction_count'], 3)
+
+    def test_only_reads_transactions_after_snapshot(self):
+        for _ in range(20):
+            self.transact('deposit', '1.00')
+        BalanceSnapshots.take()
+        self.transact('deposit', '1.00')
+
+        # History behind the snapshot is not read again
+        Transaction.objects.filter(amount=Decimal('1.00')).exclude(
+            id=Transaction.objects.order_by('-id').values('id')[:1]
+        ).update(amount=Decimal('100.00'))
+
+        with CaptureQueriesContext(connection) as queries:
+            totals = BalanceSnapshots.totals(self.account)
+
+        self.assertEqual(totals['balance'], Decimal('21.00'))
+        self.assertEqual(len(queries), 2)
+
+    def test_open_deposit_is_counted_once_it_settles(self):
+        pending = self.transact('deposit', '5.00', status='pending')
+        self.transact('deposit', '2.00')
+        BalanceSnapshots.take()
+
+        snapshot = BalanceSnapshot.objects.get(account=self.account)
+        self.assertEqual(snapshot.high_water_mark, pending.id + 1)
+        self.assertEqual(snapshot.open_transactions, [pending.id])
+        self.assertEqual(BalanceSnapshots.totals(self.account)['total_deposited'], Decimal('2.00'))
+
+        Transaction.objects.filter(pk=pending.pk).update(status='completed')
+        self.assertEqual(BalanceSnapshots.totals(self.account)['total_deposited'], Decimal('7.00'))
+
+        self.assertEqual(BalanceSnapshots.take(), 1)
+        latest = BalanceSnapshots.latest(self.account)
+        self.assertEqual(latest.high_water_mark, snapshot.high_water_mark)
+        self.assertEqual(latest.open_transactions, [])
+        self.assertEqual(latest.total_deposited, Decimal('7.00'))
+        self.assertEqual(BalanceSnapshots.totals(self.account)['total_deposited'], Decimal('7.00'))
+
+        # The earlier snapshot is left as it was
+        snapshot.refresh_from_db()
+        self.assertEqual(snapshot.open_transactions, [pending.id])
+        self.assertEqual(snapshot.total_deposited, Decimal('2.00'))
+
+    def test_take_skips_unchanged_accounts(self):
+        self.transact('deposit', '1.00')
+
+        self.assertEqual(BalanceSnapshots.take(), 1)
+        self.assertEqual(BalanceSnapshots.take(), 0)
+
+    def test_backfill_writes_history(self):
+        for _ in range(5):
+            self.transact('deposit', '1.00')
+
+        self.assertEqual(BalanceSnapshots.take(every=2), 3)
+        self.assertEqual(
+            list(BalanceSnapshot.objects.order_by('high_water_mark').values_list(
+                'balance', flat=True
+            )),
+            [Decimal('2.00'), Decimal('4.00'), Decimal('5.00')]
+        )
+
+    def test_balance_at_and_statement(self):
+        old = self.transact('deposit', '10.00')
+        Transaction.objects.filter(pk=old.pk).update(
+            created_at=timezone.now() - timedelta(days=2)
+        )
+        BalanceSnapshots.take()
+        self.transact('deposit', '3.00')
+        yesterday = timezone.now() - timedelta(days=1)
+
+        self.assertEqual(BalanceSnapshots.balance_at(self.account, yesterday), Decimal('10.00'))
+        statement = BalanceSnapshots.statement(self.account, yesterday, timezone.now())
+        self.assertEqual(statement['opening_balance'], Decimal('10.00'))
+        self.assertEqual(len(statement['transactions']), 1)
+        self.assertEqual(statement['closing_balance'], Decimal('13.00'))
+
+    def test_user_total_balance(self):
+        self.transact('deposit', '10.00')
+        self.transact('withdrawal', '3.00')
+        BalanceSnapshots.take()
+        self.transact('withdrawal', '1.00', status='failed')
+
+        self.assertEqual(self.user.get_total_balance(), Decimal('7.00'))
+
+    def test_audit_starts_from_snapshot(self):
+        self.transact('deposit', '10.00')
+        BalanceSnapshots.take()
+        self.transact('deposit', '5.00')
+        FinancialAccount.objects.filter(pk=self.account.pk).update(balance=Decimal('15.00'))
+
+        self.assertEqual(AccountAuditor.audit_all(), (1, []))
+
+    def test_recent_transactions_wait_for_commit_lag(self):
+        old = self.transact('deposit', '10.00')
+        Transaction.objects.filter(pk=old.pk).update(
+            created_at=timezone.now() - timedelta(minutes=10)
+        )
+        recent = self.transact('deposit', '1.00')
+        later = self.transact('deposit', '2.00')
+        Transaction.objects.filter(pk=later.pk).update(
+            created_at=timezone.now() - timedelta(minutes=10)
+        )
+
+        with patch.object(BalanceSnapshots, 'COMMIT_LAG', timedelta(minutes=5)):
+            BalanceSnapshots.take()
+
+        # The mark stops before the recent row, even though a higher id is old
+        snapshot = BalanceSnapshot.objects.get(account=self.account)
+        self.assertEqual(snapshot.high_water_mark, old.id)
+        self.assertLess(snapshot.high_water_mark, recent.id)
+        self.assertEqual(BalanceSnapshots.totals(self.account)['balance'], Decimal('13.00'))
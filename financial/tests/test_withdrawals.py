@@ -0,0 +1,198 @@
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from decimal import Decimal
+from unittest.mock import patch
+import json
+from ..models import FinancialAccount, WithdrawalRequest, Transaction
+from ..fakenode import FakeNode
+from ..rpc import JsonRpcClient
+from ..withdrawals import BitcoinWallet, EthereumWallet, WithdrawalDispatcher
+
+User = get_user_model()
+
+class FlakyNode(FakeNode):
+    """Rejects the first ``failures[nonce]`` sends of each listed nonce"""
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = dict(failures)
+
+    def rpc_eth_sendRawTransaction(self, raw):
+        nonce = json.loads(raw)['nonce']
+        if self.failures.get(nonce, 0):
+            self.failures[nonce] -= 1
+            raise ConnectionError(f'nonce {nonce} rejected')
+        return super().rpc_eth_sendRawTransaction(raw)
+
+@patch('financial.services.WithdrawalService.notify_withdrawal_update')
+class WithdrawalDispatcherTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.account = FinancialAccount.objects.create(
+            user=User.objects.create_user(username='testuser', password='testpass123'),
+            frozen_balance=Decimal('100.00')
+        )
+        self.btc_node = FakeNode()
+        self.eth_node = FakeNode()
+        self.eth_wallet = EthereumWallet(
+            JsonRpcClient('http://eth', session=self.eth_node.session()),
+            '0xhot',
+            'unused',
+            1,
+            signer=lambda tx: json.dumps(tx)
+        )
+        self.dispatcher = WithdrawalDispatcher(wallets={
+            'BTC': BitcoinWallet(JsonRpcClient('http://btc', session=self.btc_node.session())),
+            'ETH': self.eth_wallet,
+        })
+
+    def withdraw(self, network, count, amount='1.00'):
+        return [
+            WithdrawalRequest.objects.create(
+                account=self.account,
+                network=network,
+                amount=Decimal(amount),
+                fee=Decimal('0.10'),
+                address=f'{network.lower()}-addr-{i}'
+            )
+            for i in range(count)
+        ]
+
+    def test_btc_batch_is_one_sendmany(self, mock_notify):
+        self.withdraw('BTC', 5)
+
+        summary = self.dispatcher.dispatch()
+
+        self.assertEqual(summary['BTC'], {'sent': 5, 'failed': 0})
+        self.assertEqual(len(self.btc_node.sent), 1)
+        self.assertEqual(len(self.btc_node.sent[0]), 5)
+        self.assertEqual(
+            WithdrawalRequest.objects.filter(status='completed').count(),
+            5
+        )
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.frozen_balance, Decimal('94.50'))
+        self.assertEqual(self.account.total_withdrawn, Decimal('5.00'))
+        self.assertEqual(
+            Transaction.objects.filter(transaction_type='withdrawal').count(),
+            5
+        )
+
+    def test_eth_nonces_are_unique_across_batches(self, mock_notify):
+        self.withdraw('ETH', 4)
+        self.dispatcher.dispatch(batch_size=2)
+        self.dispatcher.dispatch(batch_size=2)
+
+        nonces = sorted(json.loads(raw)['nonce'] for raw in self.eth_node.sent)
+        self.assertEqual(nonces, [0, 1, 2, 3])
+        # Gas price and nonce are fetched once per batch, not per send
+        self.assertEqual(self.eth_node.calls, 1 + 2 + 4)
+
+    def test_claimed_withdrawals_are_not_claimed_again(self, mock_notify):
+        self.withdraw('BTC', 3)
+
+        self.assertEqual(len(WithdrawalDispatcher.claim('BTC', 10)), 3)
+        self.assertEqual(WithdrawalDispatcher.claim('BTC', 10), [])
+
+    def test_failed_send_refunds_frozen_funds(self, mock_notify):
+        self.withdraw('BTC', 2)
+
+        with patch.object(JsonRpcClient, 'call', side_effect=ConnectionError('node down')):
+            summary = self.dispatcher.dispatch()
+
+        self.assertEqual(summary['BTC'], {'sent': 0, 'failed': 2})
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.frozen_balance, Decimal('97.80'))
+        self.assertEqual(self.account.balance, Decimal('2.20'))
+
+    def test_single_withdrawal_shares_eth_nonces(self, mock_notify):
+        first, second, third = self.withdraw('ETH', 3)
+
+        self.assertEqual(
+            self.dispatcher.dispatch_one(second.id),
+            {'sent': 1, 'failed': 0}
+        )
+        self.dispatcher.dispatch()
+
+        nonces = sorted(json.loads(raw)['nonce'] for raw in self.eth_node.sent)
+        self.assertEqual(nonces, [0, 1, 2])
+        self.assertEqual(
+            WithdrawalRequest.objects.filter(status='completed').count(),
+            3
+        )
+
+    def test_single_withdrawal_skips_claimed_request(self, mock_notify):
+        withdrawal, = self.withdraw('BTC', 1)
+        WithdrawalDispatcher.claim('BTC', 10)
+
+        self.assertIsNone(self.dispatcher.dispatch_one(withdrawal.id))
+        self.assertEqual(self.btc_node.sent, [])
+
+    @override_settings(CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    })
+    def test_nonces_need_a_shared_cache(self, mock_notify):
+        with self.assertRaises(ImproperlyConfigured):
+            self.eth_wallet.nonces.reserve()
+
+    def use_eth_node(self, node):
+        self.eth_node = node
+        self.eth_wallet.client = JsonRpcClient('http://eth', session=node.session())
+
+    def test_failed_eth_send_is_resent(self, mock_notify):
+        self.use_eth_node(FlakyNode({1: 1}))
+        self.withdraw('ETH', 3)
+
+        summary = self.dispatcher.dispatch()
+
+        self.assertEqual(summary['ETH'], {'sent': 3, 'failed': 0})
+        nonces = sorted(json.loads(raw)['nonce'] for raw in self.eth_node.sent)
+        self.assertEqual(nonces, [0, 1, 2])
+
+    def test_unsendable_nonce_is_filled_with_self_transfer(self, mock_notify):
+        self.use_eth_node(FlakyNode({1: 2}))
+        first, second, third = self.withdraw('ETH', 3)
+
+        summary = self.dispatcher.dispatch()
+
+        self.assertEqual(summary['ETH'], {'sent': 2, 'failed': 1})
+        sent = [json.loads(raw) for raw in self.eth_node.sent]
+        self.assertEqual(
+            [(tx['to'], tx['value']) for tx in sent if tx['nonce'] == 1],
+            [('0xhot', 0)]
+        )
+        second.refresh_from_db()
+        third.refresh_from_db()
+        self.assertEqual(second.status, 'failed')
+        self.assertEqual(third.status, 'completed')
+        # The next batch carries on after the reservation instead of re-reading the node
+        self.assertEqual(self.eth_wallet.nonces.reserve(), 3)
+
+    def test_sends_behind_unfilled_gap_are_held(self, mock_notify):
+        self.use_eth_node(FlakyNode({1: 3}))
+        first, second, third = self.withdraw('ETH', 3)
+
+        self.dispatcher.dispatch()
+
+        statuses = [
+            WithdrawalRequest.objects.get(pk=w.pk).status
+            for w in (first, second, third)
+        ]
+        self.assertEqual(statuses, ['completed', 'failed', 'processing'])
+        third.refresh_from_db()
+        self.assertIn('unfilled nonce 1', third.error_message)
+        self.account.refresh_from_db()
+        # Only the request that never reached the node is refunded
+        self.assertEqual(self.account.balance, Decimal('1.10'))
+
+    def test_btc_amounts_keep_eight_decimals(self, mock_notify):
+        self.withdraw('BTC', 2, amount='0.12345678')
+
+        self.dispatcher.dispatch()
+
+        self.assertEqual(
+            self.btc_node.sent,
+            [{'btc-addr-0': '0.12345678', 'btc-addr-1': '0.12345678'}]
+        )
@@ -8,8 +8,10 @@ urlpatterns = [
     # Account management
     path('account/', views.account_overview, name='account_overview'),
     path('deposit/', views.deposit_request, name='deposit_request'),
+    path('deposit/qr/<str:network>/<slug:digest>.<slug:fmt>', views.deposit_qr, name='deposit_qr'),
     path('withdraw/', views.withdrawal_request, name='withdrawal_request'),
     path('transactions/', views.transaction_history, name='transaction_history'),
+    path('transactions/json/', views.transaction_history_json, name='transaction_history_json'),
     path('test-balance-update/', views.test_balance_update, name='test_balance_update'),
     
     # Keep any existing URLs...
@@ -1,7 +1,7 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import JsonResponse, HttpResponse, Http404
 from django.db import transaction
 from django.utils import timezone
 from .models import (
@@ -12,7 +12,9 @@ from groups.models import GroupFund
 from decimal import Decimal
 from .forms import WithdrawalForm, DepositForm
 from .services import FinancialService, WithdrawalService
-from .utils import generate_qr_code, create_financial_notification
+from .history import TransactionHistory
+from .utils import create_financial_notification
+from .qr import DepositQRCode
 from django.utils.decorators import method_decorator
 from django.conf import settings
 from django.urls import reverse
@@ -38,16 +40,7 @@ class FinancialViews:
     @staticmethod
     @login_required
     def transaction_history(request):
-        account = FinancialAccount.objects.get(user=request.user)
-        transaction_type = request.GET.get('type')
-        
-        transactions = FinancialService.get_transaction_history(
-            account, transaction_type
-        )
-        
-        return render(request, 'financial/transaction_history.html', {
-            'transactions': transactions
-        })
+        return transaction_history(request)
 
     @staticmethod
     @method_decorator(login_required)
@@ -155,7 +148,7 @@ class FinancialViews:
         
         # Get or create deposit address for selected network
         address = None
-        qr_code = None
+        qr_url = None
         if selected_network:
             address, created = DepositAddress.objects.get_or_create(
                 account=request.user.financialaccount,
@@ -165,9 +158,9 @@ class FinancialViews:
                     'confirmations_required': 2 if selected_network == 'USDT' else 3
                 }
             )
-            # Generate QR code for the address
+            # The QR image is served, and cached, by deposit_qr
             if address:
-                qr_code = generate_qr_code(address.address)
+                qr_url = DepositQRCode.url(address)
         
         # Get recent deposits
         recent_deposits = Transaction.objects.filter(
@@ -179,7 +172,7 @@ class FinancialViews:
             'networks': networks,
             'selected_network': selected_network,
             'address': address,
-            'qr_code': qr_code,
+            'qr_url': qr_url,
             'recent_deposits': recent_deposits,
         }
         
@@ -442,15 +435,89 @@ def deposit_request(request):
     
     return render(request, 'financial/deposit_form.html', {'form': form})
 
+def _history_page(request):
+    """Shared by the HTML and JSON history views; raises ``ValueError`` on bad params"""
+    account = FinancialAccount.objects.get_or_create(user=request.user)[0]
+    filters = TransactionHistory.parse_filters(request.GET)
+    try:
+        limit = int(request.GET.get('limit', TransactionHistory.PAGE_SIZE))
+    except ValueError:
+        limit = TransactionHistory.PAGE_SIZE
+
+    transactions, next_cursor = TransactionHistory.page(
+        account,
+        cursor=request.GET.get('cursor'),
+        limit=max(limit, 1),
+        **filters
+    )
+
+    next_url = None
+    if next_cursor:
+        params = request.GET.copy()
+        params['cursor'] = next_cursor
+        next_url = f"{reverse('financial:transaction_history_json')}?{params.urlencode()}"
+    return transactions, next_cursor, next_url
+
 @login_required
 def transaction_history(request):
-    """Show transaction history"""
-    account = request.user.financialaccount
-    transactions = Transaction.objects.filter(account=account).order_by('-created_at')
+    """Show transaction history, one keyset page at a time"""
+    try:
+        transactions, next_cursor, next_url = _history_page(request)
+    except ValueError as e:
+        messages.error(request, str(e))
+        return redirect('financial:transaction_history')
+
     return render(request, 'financial/transaction_history.html', {
-        'transactions': transactions
+        'transactions': transactions,
+        'next_cursor': next_cursor,
+        'next_url': next_url,
+        'filters': {
+            'type': request.GET.get('type', ''),
+            'start': request.GET.get('start', ''),
+            'end': request.GET.get('end', ''),
+        }
+    })
+
+@login_required
+def transaction_history_json(request):
+    """JSON pages of the transaction history for infinite scroll"""
+    try:
+        transactions, next_cursor, next_url = _history_page(request)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    return JsonResponse({
+        'transactions': [TransactionHistory.serialize(t) for t in transactions],
+        'next_cursor': next_cursor,
+        'next_url': next_url
     })
 
+@login_required
+def deposit_qr(request, network, digest, fmt):
+    """Serve the QR code of the user's deposit address for ``network``"""
+    address = get_object_or_404(
+        DepositAddress,
+        account__user=request.user,
+        network=network
+    )
+    if fmt not in DepositQRCode.CONTENT_TYPES:
+        raise Http404("Unknown QR format")
+    if digest != DepositQRCode.digest(network, address.address):
+        raise Http404("Unknown QR code")
+
+    etag = DepositQRCode.etag(network, address.address, fmt)
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponse(status=304)
+    else:
+        response = HttpResponse(
+            DepositQRCode.get(network, address.address, fmt),
+            content_type=DepositQRCode.CONTENT_TYPES[fmt]
+        )
+    response['ETag'] = etag
+    # The URL changes with the address, so the image never goes stale
+    response['Cache-Control'] = 'private, max-age=31536000, immutable'
+    return response
+
 @login_required
 def test_balance_update(request):
     # Simulate a transaction
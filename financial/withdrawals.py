@@ -0,0 +1,346 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from decimal import Decimal
+from juryim.cache import require_shared_cache
+from .models import WithdrawalRequest
+from .rpc import JsonRpcClient
+import logging
+
+logger = logging.getLogger(__name__)
+
+class NonceGapError(Exception):
+    """A send reached the node but waits behind a nonce that never did"""
+    pass
+
+class NonceAllocator:
+    """Hands out consecutive nonces for one hot wallet.
+
+    The next nonce lives in the shared cache and is advanced with ``incr``,
+    so workers on several hosts never sign two transactions with the same
+    nonce. It is seeded from the node's pending transaction count on first
+    use and after ``reset``. A process-local cache would give every worker
+    its own counter, so ``reserve`` refuses to run on one.
+    """
+
+    def __init__(self, network, address, fetch_pending_nonce):
+        self.key = f'wallet_nonce:{network}:{address}'
+        self.fetch_pending_nonce = fetch_pending_nonce
+
+    def reserve(self, count=1):
+        """Reserve ``count`` nonces and return the first one"""
+        require_shared_cache('Wallet nonces')
+        if cache.get(self.key) is None:
+            cache.add(self.key, self.fetch_pending_nonce(), timeout=None)
+        return cache.incr(self.key, count) - count
+
+    def reset(self):
+        """Re-read the nonce from the node on the next reservation
+
+        Only safe while no reserved nonce is still waiting to be sent;
+        otherwise the node's pending count is behind the reservations.
+        """
+        cache.delete(self.key)
+
+class BitcoinWallet:
+    """Pays a whole batch of withdrawals with one ``sendmany``"""
+
+    network = 'BTC'
+
+    def __init__(self, client):
+        self.client = client
+
+    def send(self, withdrawals, executor):
+        amounts = {}
+        for withdrawal in withdrawals:
+            amounts[withdrawal.address] = amounts.get(withdrawal.address, Decimal('0')) + withdrawal.amount
+
+        try:
+            # Strings keep all 8 decimal places; bitcoind parses them exactly
+            txid = self.client.call(
+                'sendmany',
+                '',
+                {address: str(amount) for address, amount in amounts.items()}
+            )
+        except Exception as e:
+            return {withdrawal.id: e for withdrawal in withdrawals}
+        return {withdrawal.id: txid for withdrawal in withdrawals}
+
+class EthereumWallet:
+    """Signs with locally allocated nonces and pipelines the sends"""
+
+    network = 'ETH'
+    GAS_LIMIT = 21000
+
+    def __init__(self, client, address, private_key, chain_id, signer=None):
+        self.client = client
+        self.address = address
+        self.private_key = private_key
+        self.chain_id = chain_id
+        self.signer = signer or self.sign
+        self.nonces = NonceAllocator(
+            self.network,
+            address,
+            lambda: int(self.client.call('eth_getTransactionCount', address, 'pending'), 16)
+        )
+
+    def sign(self, tx):
+        from eth_account import Account
+
+        signed = Account.sign_transaction(tx, self.private_key)
+        raw = getattr(signed, 'raw_transaction', None) or signed.rawTransaction
+        return '0x' + bytes(raw).hex()
+
+    def transaction(self, nonce, to, value, gas_price):
+        return self.signer({
+            'nonce': nonce,
+            'to': to,
+            'value': value,
+            'gas': self.GAS_LIMIT,
+            'gasPrice': gas_price,
+            'chainId': self.chain_id
+        })
+
+    def fill_gap(self, nonce, raw, error, gas_price):
+        """Make sure ``nonce`` reaches the node after its send failed
+
+        Re-sends the withdrawal once, then falls back to a zero-value
+        transfer to the hot wallet. Returns ``(filled, result)``, where
+        ``result`` is the withdrawal's tx hash or the original error.
+        """
+        try:
+            return True, self.client.call('eth_sendRawTransaction', raw)
+        except Exception as e:
+            logger.warning(f"Re-sending nonce {nonce} failed: {e}")
+        try:
+            self.client.call(
+                'eth_sendRawTransaction',
+                self.transaction(nonce, self.address, 0, gas_price)
+            )
+            return True, error
+        except Exception as e:
+            logger.error(f"Could not fill nonce gap {nonce}: {e}")
+            return False, error
+
+    def send(self, withdrawals, executor):
+        # One gas price and one nonce reservation for the whole batch
+        gas_price = int(self.client.call('eth_gasPrice'), 16)
+        first_nonce = self.nonces.reserve(len(withdrawals))
+
+        raw_transactions = [
+            self.transaction(
+                first_nonce + i,
+                withdrawal.address,
+                int(withdrawal.amount * Decimal(10) ** 18),
+                gas_price
+            )
+            for i, withdrawal in enumerate(withdrawals)
+        ]
+        futures = {
+            withdrawal.id: executor.submit(
+                self.client.call, 'eth_sendRawTransaction', raw
+            )
+            for withdrawal, raw in zip(withdrawals, raw_transactions)
+        }
+
+        results = {}
+        for withdrawal_id, future in futures.items():
+            try:
+                results[withdrawal_id] = future.result()
+            except Exception as e:
+                results[withdrawal_id] = e
+
+        # Later nonces only confirm once every earlier one has reached the
+        # node, so each failed send's nonce is filled before moving on. The
+        # allocator is never reset here: other batches may hold reservations.
+        gap = None
+        for i, (withdrawal, raw) in enumerate(zip(withdrawals, raw_transactions)):
+            result = results[withdrawal.id]
+            if gap is not None:
+                if not isinstance(result, Exception):
+                    results[withdrawal.id] = NonceGapError(
+                        f"Sent as {result} with nonce {first_nonce + i}, "
+                        f"but stuck behind unfilled nonce {gap}"
+                    )
+            elif isinstance(result, Exception):
+                filled, results[withdrawal.id] = self.fill_gap(
+                    first_nonce + i, raw, result, gas_price
+                )
+                if not filled:
+                    gap = first_nonce + i
+        return results
+
+class TronWallet:
+    """Sends TRC20 USDT transfers concurrently over one keep-alive session"""
+
+    network = 'USDT'
+
+    def __init__(self, api_url, owner_address, contract_address, session=None):
+        self.url = f'{api_url}/wallet/triggersmartcontract'
+        self.owner_address = owner_address
+        self.contract_address = contract_address
+        self.session = session or JsonRpcClient.create_session()
+
+    def send_one(self, withdrawal):
+        amount = int(withdrawal.amount * Decimal('1000000'))
+        response = self.session.post(self.url, json={
+            'owner_address': self.owner_address,
+            'contract_address': self.contract_address,
+            'function_selector': 'transfer(address,uint256)',
+            'parameter': f'{withdrawal.address},{amount}',
+            'fee_limit': 1000000,
+            'call_value': 0,
+            'visible': True
+        })
+        result = response.json()
+        if not result.get('result', {}).get('result', False):
+            raise Exception("USDT transaction failed")
+        return result['transaction']['txID']
+
+    def send(self, withdrawals, executor):
+        futures = {w.id: executor.submit(self.send_one, w) for w in withdrawals}
+        results = {}
+        for withdrawal_id, future in futures.items():
+            try:
+                results[withdrawal_id] = future.result()
+            except Exception as e:
+                results[withdrawal_id] = e
+        return results
+
+class WithdrawalDispatcher:
+    """Sends pending withdrawals in per-network batches.
+
+    Each worker claims its own batch with ``SELECT ... FOR UPDATE SKIP
+    LOCKED`` and marks it ``processing``, so several workers never pick the
+    same request. BTC batches go out as one ``sendmany``. ETH and TRC20
+    sends run on a bounded thread pool, and ETH nonces come from a shared
+    ``NonceAllocator``.
+    """
+
+    BATCH_SIZE = 50
+    MAX_CONCURRENCY = 8
+
+    _shared = None
+
+    def __init__(self, wallets=None, max_concurrency=None):
+        self.wallets = wallets if wallets is not None else self.default_wallets()
+        self.max_concurrency = max_concurrency or self.MAX_CONCURRENCY
+
+    @classmethod
+    def shared(cls):
+        """Process-wide dispatcher, so worker runs reuse open connections"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    @staticmethod
+    def default_wallets():
+        """Wallets over the process-wide node connections"""
+        from .blockchain import AsyncBlockchainClient
+
+        blockchain = AsyncBlockchainClient.shared()
+        return {
+            'BTC': BitcoinWallet(blockchain.sync_client('BTC')),
+            'ETH': EthereumWallet(
+                blockchain.sync_client('ETH'),
+                settings.ETH_WALLET_ADDRESS,
+                settings.ETH_PRIVATE_KEY,
+                settings.ETH_CHAIN_ID
+            ),
+            'USDT': TronWallet(
+                settings.TRON_API_URL,
+                settings.TRON_WALLET_ADDRESS,
+                settings.USDT_CONTRACT_ADDRESS,
+                session=blockchain.sync_client('USDT')
+            ),
+        }
+
+    @staticmethod
+    @transaction.atomic
+    def claim(network, limit, withdrawal_ids=None):
+        """Take up to ``limit`` pending withdrawals on ``network``"""
+        queryset = WithdrawalRequest.objects.select_for_update(
+            skip_locked=True,
+            of=('self',)
+        ).filter(
+            network=network,
+            status='pending'
+        )
+        if withdrawal_ids is not None:
+            queryset = queryset.filter(pk__in=withdrawal_ids)
+        withdrawals = list(
+            queryset.select_related('account').order_by('id')[:limit]
+        )
+        WithdrawalRequest.objects.filter(
+            pk__in=[w.pk for w in withdrawals]
+        ).update(status='processing')
+        for withdrawal in withdrawals:
+            withdrawal.status = 'processing'
+        return withdrawals
+
+    def send_batch(self, network, withdrawals, executor):
+        """Send a batch; returns ``{withdrawal_id: tx_hash or exception}``"""
+        return self.wallets[network].send(withdrawals, executor)
+
+    def send_claimed(self, network, withdrawals, executor):
+        """Send claimed withdrawals and record each outcome
+
+        Sends stuck behind a nonce gap stay ``processing`` with the error
+        recorded: their transaction is already on the node and may still
+        confirm, so refunding them could pay out twice.
+        """
+        from .services import WithdrawalService
+
+        results = self.send_batch(network, withdrawals, executor)
+        sent = failed = 0
+        for withdrawal in withdrawals:
+            result = results[withdrawal.id]
+            if isinstance(result, NonceGapError):
+                logger.error(f"Withdrawal {withdrawal.id} held: {result}")
+                withdrawal.error_message = str(result)
+                withdrawal.save(update_fields=['error_message'])
+                failed += 1
+            elif isinstance(result, Exception):
+                logger.error(f"Withdrawal {withdrawal.id} failed: {result}")
+                WithdrawalService.fail_withdrawal(withdrawal, result)
+                failed += 1
+            else:
+                WithdrawalService.complete_withdrawal(withdrawal, result)
+                sent += 1
+        return {'sent': sent, 'failed': failed}
+
+    def dispatch(self, batch_size=None):
+        """Claim and send one batch per network; returns counts per network"""
+        batch_size = batch_size or self.BATCH_SIZE
+        summary = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            for network in self.wallets:
+                withdrawals = self.claim(network, batch_size)
+                if not withdrawals:
+                    continue
+                summary[network] = self.send_claimed(network, withdrawals, executor)
+
+        return summary
+
+    def dispatch_one(self, withdrawal_id):
+        """Claim and send a single withdrawal through its network's wallet
+
+        Goes through the same claim and wallet path as ``dispatch``, so ETH
+        nonces still come from the shared allocator. Returns the counts for
+        that network, or ``None`` if the request is not pending or was
+        already claimed by another worker.
+        """
+        network = WithdrawalRequest.objects.filter(
+            pk=withdrawal_id
+        ).values_list('network', flat=True).first()
+        if network not in self.wallets:
+            return None
+
+        withdrawals = self.claim(network, 1, withdrawal_ids=[withdrawal_id])
+        if not withdrawals:
+            return None
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return self.send_claimed(network, withdrawals, executor)
@@ -3,7 +3,7 @@ from django.db import models
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils import timezone
-from .models import GamblingGame, GamblingBet, GamblingTransaction, Game, Bet
+from .models import GamblingGame, GamblingBet, GamblingTransaction, EmailOutbox, Game, Bet
 
 @admin.register(GamblingGame)
 class GamblingGameAdmin(admin.ModelAdmin):
@@ -12,16 +12,19 @@ class GamblingGameAdmin(admin.ModelAdmin):
     search_fields = ('title', 'description')
     readonly_fields = ('get_total_pool', 'get_total_bets', 'get_unique_players')
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_stats()
+
     def get_total_pool(self, obj):
-        return obj.bets.aggregate(total=models.Sum('amount'))['total'] or 0
+        return obj.total_pool
     get_total_pool.short_description = 'Total Pool'
 
     def get_total_bets(self, obj):
-        return obj.bets.count()
+        return obj.total_bets
     get_total_bets.short_description = 'Total Bets'
 
     def get_unique_players(self, obj):
-        return obj.bets.values('user').distinct().count()
+        return obj.unique_players
     get_unique_players.short_description = 'Unique Players'
 
 @admin.register(GamblingBet)
@@ -71,6 +74,13 @@ class GamblingTransactionAdmin(admin.ModelAdmin):
         return format_html('<a href="{}">{}</a>', url, obj.bet.id)
     bet_link.short_description = 'Bet'
 
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'recipient', 'game', 'status', 'attempts', 'next_attempt_at')
+    list_filter = ('kind', 'status')
+    search_fields = ('recipient', 'dedupe_key')
+    readonly_fields = ('dedupe_key', 'created_at', 'sent_at', 'last_error')
+
 @admin.register(Game)
 class GameAdmin(admin.ModelAdmin):
     list_display = ('name', 'min_bet', 'max_bet', 'created_at')
@@ -1,6 +1,8 @@
 from django.contrib import admin, messages
 from django.utils import timezone
 from .services import GamblingService
+from .aggregates import GameAggregateService
+from .coordinator import SettlementCoordinator
 
 @admin.action(description="Complete selected games")
 def complete_games(modeladmin, request, queryset):
@@ -8,9 +10,15 @@ def complete_games(modeladmin, request, queryset):
     completed = 0
     errors = 0
     
-    for game in queryset.filter(status='active'):
+    # Games already claimed by a settlement worker are skipped
+    claimed = SettlementCoordinator.claim_batch(
+        limit=queryset.count(),
+        game_ids=list(queryset.values_list('id', flat=True)),
+        expired_only=False
+    )
+    for game in claimed:
         try:
-            GamblingService.complete_game(game)
+            SettlementCoordinator.settle_claimed(game)
             completed += 1
         except Exception as e:
             errors += 1
@@ -68,10 +76,7 @@ def recalculate_stats(modeladmin, request, queryset):
     
     for game in queryset:
         try:
-            stats = GamblingService.calculate_game_stats(game)
-            game.total_bets = stats['total_bets']
-            game.unique_players = stats['unique_players']
-            game.save(update_fields=['total_bets', 'unique_players'])
+            GameAggregateService.reconcile(game, fix=True)
             updated += 1
         except Exception as e:
             errors += 1
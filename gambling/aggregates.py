@@ -0,0 +1,342 @@
+from decimal import Decimal
+from django.db import IntegrityError, transaction
+from django.db.models import Sum, Count, F, Q
+from .models import GameAggregate, GamblingBet, PlayerStats
+from .utils import get_bet_option_key
+
+STAT_FIELDS = (
+    'total_pool',
+    'total_bets',
+    'unique_players',
+    'fee_collected',
+    'option_totals',
+)
+
+class GameAggregateService:
+    """Maintains ``GameAggregate`` rows so game stats are O(1) to read"""
+
+    @staticmethod
+    def get_for_update(game):
+        """Return ``(aggregate, created)`` with the row locked
+
+        A missing row is seeded from the bets table, so a game that already
+        has bets never starts counting from zero.
+        """
+        aggregate = GameAggregate.objects.select_for_update().filter(game=game).first()
+        if aggregate is not None:
+            return aggregate, False
+        created = GameAggregateService._create(game)
+        return GameAggregate.objects.select_for_update().get(game=game), created
+
+    @staticmethod
+    def _create(game):
+        """Create the row from the bets table; returns False if it already existed"""
+        total_paid_out = GamblingBet.objects.filter(
+            game=game,
+            status='won'
+        ).aggregate(total=Sum('win_amount'))['total']
+        try:
+            with transaction.atomic():
+                GameAggregate.objects.create(
+                    game=game,
+                    total_paid_out=total_paid_out or Decimal('0'),
+                    **GameAggregateService.compute(game)
+                )
+            return True
+        except IntegrityError:
+            return False
+
+    @staticmethod
+    def record_bet(bet):
+        """Add a newly placed bet to its game's aggregate
+
+        Must run inside the transaction that created the bet; the aggregate
+        row stays locked until that transaction commits.
+        """
+        aggregate, created = GameAggregateService.get_for_update(bet.game)
+        if created:
+            # A new row is computed from the bets table, which already has this bet
+            return aggregate
+
+        is_new_player = not GamblingBet.objects.filter(
+            game_id=bet.game_id,
+            user_id=bet.user_id
+        ).exclude(pk=bet.pk).exists()
+
+        key = get_bet_option_key(bet.bet_data)
+        option = aggregate.option_totals.get(key, {'amount': '0', 'bets': 0})
+        option['amount'] = str(Decimal(option['amount']) + bet.amount)
+        option['bets'] += 1
+        aggregate.option_totals[key] = option
+
+        aggregate.total_pool += bet.amount
+        aggregate.total_bets += 1
+        aggregate.fee_collected += bet.fee_amount or Decimal('0')
+        if is_new_player:
+            aggregate.unique_players += 1
+
+        aggregate.save(update_fields=list(STAT_FIELDS) + ['updated_at'])
+        return aggregate
+
+    @staticmethod
+    def record_settlement(game, total_won):
+        """Add settled winnings to the game's paid out total"""
+        if not total_won:
+            return
+        GameAggregate.objects.filter(game=game).update(
+            total_paid_out=F('total_paid_out') + total_won
+        )
+
+    @staticmethod
+    def get_stats(game):
+        """Return game statistics from the aggregate row"""
+        try:
+            aggregate = game.aggregate
+        except GameAggregate.DoesNotExist:
+            aggregate = GameAggregate(game=game)
+
+        average_bet = Decimal('0')
+        if aggregate.total_bets > 0:
+            average_bet = aggregate.total_pool / aggregate.total_bets
+
+        return {
+            'total_bets': aggregate.total_bets,
+            'unique_players': aggregate.unique_players,
+            'average_bet': average_bet,
+            'total_pool': aggregate.total_pool,
+            'fee_collected': aggregate.fee_collected,
+            'option_totals': aggregate.option_totals
+        }
+
+    @staticmethod
+    def compute(game):
+        """Compute the aggregate values from the raw bets table"""
+        bets = GamblingBet.objects.filter(game=game)
+        totals = bets.aggregate(
+            total_pool=Sum('amount'),
+            total_bets=Count('id'),
+            unique_players=Count('user', distinct=True),
+            fee_collected=Sum('fee_amount')
+        )
+
+        option_totals = {}
+        for bet_data, amount in bets.values_list('bet_data', 'amount').iterator():
+            key = get_bet_option_key(bet_data)
+            option = option_totals.setdefault(key, {'amount': Decimal('0'), 'bets': 0})
+            option['amount'] += amount
+            option['bets'] += 1
+
+        return {
+            'total_pool': totals['total_pool'] or Decimal('0'),
+            'total_bets': totals['total_bets'],
+            'unique_players': totals['unique_players'],
+            'fee_collected': totals['fee_collected'] or Decimal('0'),
+            'option_totals': {
+                key: {'amount': str(option['amount']), 'bets': option['bets']}
+                for key, option in option_totals.items()
+            }
+        }
+
+    @staticmethod
+    def reconcile(game, fix=False):
+        """Compare the aggregate with the raw bets and optionally repair it
+
+        Returns ``{field: (stored, expected)}`` for every mismatching field.
+        """
+        expected = GameAggregateService.compute(game)
+        aggregate = GameAggregate.objects.filter(game=game).first()
+        if aggregate is None:
+            GameAggregateService._create(game)
+            aggregate = GameAggregate.objects.get(game=game)
+
+        mismatches = {}
+        for field in STAT_FIELDS:
+            stored = getattr(aggregate, field)
+            if field == 'option_totals':
+                same = GameAggregateService._normalize_options(stored) == \
+                    GameAggregateService._normalize_options(expected[field])
+            else:
+                same = stored == expected[field]
+            if not same:
+                mismatches[field] = (stored, expected[field])
+
+        if fix and mismatches:
+            for field in mismatches:
+                setattr(aggregate, field, expected[field])
+            aggregate.save(update_fields=list(mismatches) + ['updated_at'])
+
+        return mismatches
+
+    @staticmethod
+    def _normalize_options(option_totals):
+        return {
+            key: (Decimal(option['amount']), option['bets'])
+            for key, option in option_totals.items()
+        }
+
+PLAYER_STAT_FIELDS = (
+    'active_bets',
+    'total_bets',
+    'won_bets',
+    'total_wagered',
+    'total_won',
+)
+
+class PlayerStatsService:
+    """Maintains ``PlayerStats`` rows so per-user counters are O(1) to read"""
+
+    @staticmethod
+    def compute(user_id):
+        """Compute a user's counters from the raw bets table"""
+        totals = GamblingBet.objects.filter(user_id=user_id).aggregate(
+            active_bets=Count('id', filter=Q(status='placed')),
+            total_bets=Count('id'),
+            won_bets=Count('id', filter=Q(status='won')),
+            total_wagered=Sum('amount'),
+            total_won=Sum('win_amount', filter=Q(status='won'))
+        )
+        totals['total_wagered'] = totals['total_wagered'] or Decimal('0')
+        totals['total_won'] = totals['total_won'] or Decimal('0')
+        return totals
+
+    @staticmethod
+    def get(user_id):
+        """Return the user's counters as a dict, creating the row if needed"""
+        stats = PlayerStats.objects.filter(user_id=user_id).values(
+            *PLAYER_STAT_FIELDS
+        ).first()
+        if stats is None:
+            PlayerStatsService._create(user_id)
+            stats = PlayerStats.objects.filter(user_id=user_id).values(
+                *PLAYER_STAT_FIELDS
+            ).first()
+        return stats
+
+    @staticmethod
+    def _create(user_id):
+        """Create the row from the bets table; returns False if it already existed"""
+        try:
+            with transaction.atomic():
+                PlayerStats.objects.create(
+                    user_id=user_id,
+                    **PlayerStatsService.compute(user_id)
+                )
+            return True
+        except IntegrityError:
+            return False
+
+    @staticmethod
+    def record_bet(bet):
+        """Count a newly placed bet; runs in the transaction that created it"""
+        updated = PlayerStats.objects.filter(user_id=bet.user_id).update(
+            active_bets=F('active_bets') + 1,
+            total_bets=F('total_bets') + 1,
+            total_wagered=F('total_wagered') + bet.amount
+        )
+        # A new row is computed from the bets table, which already has this bet
+        if not updated and not PlayerStatsService._create(bet.user_id):
+            PlayerStatsService.record_bet(bet)
+
+    @staticmethod
+    def record_settled(bet_ids, result_time):
+        """Move bets settled at ``result_time`` from active to won or lost
+
+        Runs inside the settlement chunk's transaction, one grouped query
+        plus one update per player in the chunk.
+        """
+        rows = GamblingBet.objects.filter(
+            pk__in=bet_ids,
+            result_time=result_time
+        ).values('user_id').annotate(
+            settled=Count('id'),
+            won=Count('id', filter=Q(status='won')),
+            won_amount=Sum('win_amount', filter=Q(status='won'))
+        ).order_by()
+
+        for row in rows:
+            PlayerStats.objects.filter(user_id=row['user_id']).update(
+                active_bets=F('active_bets') - row['settled'],
+                won_bets=F('won_bets') + row['won'],
+                total_won=F('total_won') + (row['won_amount'] or Decimal('0'))
+            )
+
+    @staticmethod
+    def record_refund(bet):
+        """A placed bet was refunded and is no longer active"""
+        PlayerStats.objects.filter(user_id=bet.user_id, active_bets__gt=0).update(
+            active_bets=F('active_bets') - 1
+        )
+
+    @staticmethod
+    def reconcile(user_id, fix=False):
+        """Compare the counters with the raw bets and optionally repair them
+
+        Returns ``{field: (stored, expected)}`` for every mismatching field.
+        """
+        expected = PlayerStatsService.compute(user_id)
+        stored = PlayerStatsService.get(user_id)
+        mismatches = {
+            field: (stored[field], expected[field])
+            for field in PLAYER_STAT_FIELDS
+            if stored[field] != expected[field]
+        }
+        if fix and mismatches:
+            PlayerStats.objects.filter(user_id=user_id).update(
+                **{field: expected[field] for field in mismatches}
+            )
+        return mismatches
+
+class UserGameStatsService:
+    """One user's bets per game, loaded for a whole page of games at once"""
+
+    ATTRIBUTE = 'user_stats'
+
+    @staticmethod
+    def empty():
+        return {
+            'total_bets': 0,
+            'total_amount': Decimal('0'),
+            'won_amount': Decimal('0'),
+        }
+
+    @staticmethod
+    def load(user, games):
+        """Map game id to the user's stats for ``games`` in one grouped query"""
+        game_ids = [game.pk for game in games]
+        stats = {game_id: UserGameStatsService.empty() for game_id in game_ids}
+        if not game_ids:
+            return stats
+
+        rows = GamblingBet.objects.filter(
+            user=user,
+            game_id__in=game_ids
+        ).values('game_id').annotate(
+            total_bets=Count('id'),
+            total_amount=Sum('amount'),
+            won_amount=Sum('win_amount', filter=Q(status='won'))
+        ).order_by()
+
+        for row in rows:
+            stats[row['game_id']] = {
+                'total_bets': row['total_bets'],
+                'total_amount': row['total_amount'] or Decimal('0'),
+                'won_amount': row['won_amount'] or Decimal('0'),
+            }
+        return stats
+
+    @staticmethod
+    def attach(user, games):
+        """Set ``game.user_stats`` on each game; read back with ``get``"""
+        games = list(games)
+        stats = UserGameStatsService.load(user, games)
+        for game in games:
+            setattr(game, UserGameStatsService.ATTRIBUTE, stats[game.pk])
+        return games
+
+    @staticmethod
+    def get(user, game):
+        """Attached stats for ``game``, loading them alone if none were attached"""
+        stats = getattr(game, UserGameStatsService.ATTRIBUTE, None)
+        if stats is None:
+            stats = UserGameStatsService.load(user, [game])[game.pk]
+        return stats
@@ -4,6 +4,8 @@ from django.db import models
 from decimal import Decimal
 from ..models import GamblingGame, GamblingBet
 from ..utils import validate_bet_data, calculate_win_probability
+from ..aggregates import GameAggregateService
+from ..pools import PoolIndex
 
 class GamblingGameSerializer(serializers.ModelSerializer):
     time_remaining = serializers.SerializerMethodField()
@@ -15,7 +17,7 @@ class GamblingGameSerializer(serializers.ModelSerializer):
             'minimum_single_bet', 'maximum_single_bet',
             'fee_percentage', 'total_pool', 'status',
             'start_time', 'end_time', 'time_remaining',
-            'result'
+            'result', 'server_seed_hash', 'server_seed', 'client_seed'
         ]
     
     def get_time_remaining(self, obj):
@@ -31,7 +33,7 @@ class GamblingBetSerializer(serializers.ModelSerializer):
         model = GamblingBet
         fields = [
             'id', 'game', 'game_title', 'amount',
-            'fee_amount', 'bet_data', 'status',
+            'fee_amount', 'bet_data', 'client_seed', 'status',
             'placed_at', 'result_time', 'win_probability'
         ]
     
@@ -48,6 +50,11 @@ class PlaceBetSerializer(serializers.Serializer):
         min_value=Decimal('0.00000001')
     )
     bet_data = serializers.JSONField()
+    client_seed = serializers.CharField(
+        max_length=64,
+        required=False,
+        allow_blank=True
+    )
     
     def validate(self, data):
         game = self.context.get('game')
@@ -70,27 +77,42 @@ class PlaceBetSerializer(serializers.Serializer):
         return data
 
 class GameStatsSerializer(serializers.ModelSerializer):
-    total_bets = serializers.IntegerField(source='gamblingbet_set.count')
+    total_pool = serializers.SerializerMethodField()
+    total_bets = serializers.SerializerMethodField()
     unique_players = serializers.SerializerMethodField()
     average_bet = serializers.SerializerMethodField()
     total_fees = serializers.SerializerMethodField()
+    odds = serializers.SerializerMethodField()
     
     class Meta:
         model = GamblingGame
         fields = [
             'id', 'title', 'total_pool', 'total_bets',
-            'unique_players', 'average_bet', 'total_fees'
+            'unique_players', 'average_bet', 'total_fees', 'odds'
         ]
     
+    def get_stats(self, obj):
+        if not hasattr(obj, '_aggregate_stats'):
+            obj._aggregate_stats = GameAggregateService.get_stats(obj)
+        return obj._aggregate_stats
+    
+    def get_total_pool(self, obj):
+        return self.get_stats(obj)['total_pool']
+    
+    def get_total_bets(self, obj):
+        return self.get_stats(obj)['total_bets']
+    
+    def get_odds(self, obj):
+        return {
+            key: str(multiplier)
+            for key, multiplier in PoolIndex.get_odds(obj).items()
+        }
+    
     def get_unique_players(self, obj):
-        return obj.gamblingbet_set.values('user').distinct().count()
+        return self.get_stats(obj)['unique_players']
     
     def get_average_bet(self, obj):
-        if obj.total_bets > 0:
-            return obj.total_pool / obj.total_bets
-        return Decimal('0')
+        return self.get_stats(obj)['average_bet']
     
     def get_total_fees(self, obj):
-        return obj.gamblingbet_set.aggregate(
-            total=models.Sum('fee_amount')
-        )['total'] or Decimal('0') 
\ No newline at end of file
+        return self.get_stats(obj)['fee_collected']
@@ -2,9 +2,11 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.http import Http404
 from django.utils import timezone
 from ..models import GamblingGame, GamblingBet
 from ..services import GamblingService
+from ..cache import GameCache
 from .serializers import (
     GamblingGameSerializer, GamblingBetSerializer,
     PlaceBetSerializer, GameStatsSerializer
@@ -25,6 +27,22 @@ class GamblingGameViewSet(viewsets.ReadOnlyModelViewSet):
             queryset = queryset.filter(game_type=game_type)
             
         return queryset.order_by('-created_at')
+
+    def get_cached_object(self):
+        """Like ``get_object`` but served from the game cache; for reads only"""
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            game = GameCache.get(int(lookup))
+        except (TypeError, ValueError):
+            game = None
+        if game is None:
+            raise Http404("Game not found")
+        self.check_object_permissions(self.request, game)
+        return game
+
+    def retrieve(self, request, *args, **kwargs):
+        serializer = self.get_serializer(self.get_cached_object())
+        return Response(serializer.data)
     
     @action(detail=True, methods=['post'])
     def place_bet(self, request, pk=None):
@@ -43,7 +61,8 @@ class GamblingGameViewSet(viewsets.ReadOnlyModelViewSet):
                     game=game,
                     user=request.user,
                     amount=serializer.validated_data['amount'],
-                    bet_data=serializer.validated_data['bet_data']
+                    bet_data=serializer.validated_data['bet_data'],
+                    client_seed=serializer.validated_data.get('client_seed')
                 )
                 return Response(
                     GamblingBetSerializer(bet).data,
@@ -61,7 +80,7 @@ class GamblingGameViewSet(viewsets.ReadOnlyModelViewSet):
     
     @action(detail=True)
     def stats(self, request, pk=None):
-        game = self.get_object()
+        game = self.get_cached_object()
         serializer = GameStatsSerializer(game)
         return Response(serializer.data)
 
@@ -1,10 +1,219 @@
+from collections import OrderedDict
 from django.core.cache import cache
+from django.db import transaction
+from .models import GamblingGame, GameAggregate
+from .settings import (
+    GAMBLING_CACHE_PREFIX,
+    GAMBLING_CACHE_TIMEOUT,
+    GAMBLING_GAME_CACHE_L1_SIZE,
+    GAMBLING_GAME_CACHE_L1_TIMEOUT
+)
+import copy
+import threading
+import time
+
+class GameCache:
+    """Two-tier read-through cache of games with their stats and aggregate.
+
+    Entries are plain field dicts under a versioned key in the shared cache
+    (L2), fronted by a small per-process LRU (L1). Invalidation bumps the
+    game's version, so every process stops using its old copy; L1 trusts
+    its copy for ``GAMBLING_GAME_CACHE_L1_TIMEOUT`` seconds before checking
+    the version again. A miss is recomputed once: threads in a process wait
+    on the one loading, and processes wait on whoever holds the L2 lock.
+    """
+
+    SCHEMA = 1
+    LOCK_TIMEOUT = 10
+    WAIT_TIMEOUT = 2.0
+    WAIT_INTERVAL = 0.02
+    STATS = ('total_pool', 'total_bets', 'unique_players')
+
+    _local = OrderedDict()
+    _inflight = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def version_key(game_id):
+        return f'{GAMBLING_CACHE_PREFIX}:game_version:{game_id}'
+
+    @staticmethod
+    def data_key(game_id, version):
+        return f'{GAMBLING_CACHE_PREFIX}:game:{GameCache.SCHEMA}:{game_id}:{version}'
+
+    @staticmethod
+    def get_version(game_id):
+        key = GameCache.version_key(game_id)
+        version = cache.get(key)
+        if version is None:
+            # A fresh version after eviction, so old entries are never reused
+            version = time.time_ns()
+            if not cache.add(key, version, None):
+                version = cache.get(key, version)
+        return version
+
+    @staticmethod
+    def get(game_id):
+        """The game with stats and aggregate, or ``None`` if it does not exist"""
+        now = time.monotonic()
+        with GameCache._lock:
+            entry = GameCache._local.get(game_id)
+            if entry is not None:
+                GameCache._local.move_to_end(game_id)
+        if entry is not None and now - entry[2] < GAMBLING_GAME_CACHE_L1_TIMEOUT:
+            return GameCache.build(entry[1])
+
+        version = GameCache.get_version(game_id)
+        if entry is not None and entry[0] == version:
+            payload = entry[1]
+        else:
+            payload = cache.get(GameCache.data_key(game_id, version))
+            if payload is None:
+                payload = GameCache._load_once(game_id, version)
+            if payload is None:
+                return None
+
+        GameCache._remember(game_id, version, payload, now)
+        return GameCache.build(payload)
+
+    @staticmethod
+    def peek(game_id):
+        """The cached game, without loading it on a miss"""
+        with GameCache._lock:
+            entry = GameCache._local.get(game_id)
+        if entry is not None:
+            return GameCache.build(entry[1])
+        payload = cache.get(GameCache.data_key(game_id, GameCache.get_version(game_id)))
+        return GameCache.build(payload) if payload is not None else None
+
+    @staticmethod
+    def invalidate(game_id):
+        """Drop the game everywhere by moving it to a new version"""
+        GameCache._forget(game_id)
+        key = GameCache.version_key(game_id)
+        version = cache.get(key)
+        if version is not None:
+            cache.delete(GameCache.data_key(game_id, version))
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+    @staticmethod
+    def invalidate_on_commit(game_id):
+        """Invalidate now and again once the change is visible to readers"""
+        GameCache.invalidate(game_id)
+        transaction.on_commit(lambda: GameCache.invalidate(game_id))
+
+    @staticmethod
+    def load(game_id):
+        """Read the game, its stats and its aggregate in one query"""
+        game = GamblingGame.objects.with_stats().select_related(
+            'aggregate'
+        ).filter(pk=game_id).first()
+        if game is None:
+            return None
+
+        try:
+            aggregate = game.aggregate
+        except GameAggregate.DoesNotExist:
+            aggregate = None
+
+        return {
+            'game': {
+                field.attname: getattr(game, field.attname)
+                for field in GamblingGame._meta.concrete_fields
+            },
+            'stats': {name: getattr(game, name) for name in GameCache.STATS},
+            'aggregate': {
+                field.attname: getattr(aggregate, field.attname)
+                for field in GameAggregate._meta.concrete_fields
+            } if aggregate is not None else None
+        }
+
+    @staticmethod
+    def build(payload):
+        """A detached game instance from a cached payload"""
+        payload = copy.deepcopy(payload)
+        fields = payload['game']
+        game = GamblingGame.from_db(
+            GamblingGame.objects.db,
+            list(fields),
+            list(fields.values())
+        )
+        for name, value in payload['stats'].items():
+            setattr(game, name, value)
+        if payload['aggregate'] is not None:
+            aggregate = payload['aggregate']
+            game.aggregate = GameAggregate.from_db(
+                GamblingGame.objects.db,
+                list(aggregate),
+                list(aggregate.values())
+            )
+        return game
+
+    @staticmethod
+    def _load_once(game_id, version):
+        key = GameCache.data_key(game_id, version)
+        with GameCache._lock:
+            event = GameCache._inflight.get(key)
+            leader = event is None
+            if leader:
+                event = GameCache._inflight[key] = threading.Event()
+
+        if not leader:
+            event.wait(GameCache.WAIT_TIMEOUT)
+            payload = cache.get(key)
+            return payload if payload is not None else GameCache.load(game_id)
+
+        try:
+            lock_key = f'{key}:lock'
+            if cache.add(lock_key, 1, GameCache.LOCK_TIMEOUT):
+                try:
+                    payload = GameCache.load(game_id)
+                    if payload is not None:
+                        cache.set(key, payload, GAMBLING_CACHE_TIMEOUT)
+                finally:
+                    cache.delete(lock_key)
+                return payload
+
+            # Another process is loading it
+            deadline = time.monotonic() + GameCache.WAIT_TIMEOUT
+            while time.monotonic() < deadline:
+                time.sleep(GameCache.WAIT_INTERVAL)
+                payload = cache.get(key)
+                if payload is not None:
+                    return payload
+            return GameCache.load(game_id)
+        finally:
+            with GameCache._lock:
+                GameCache._inflight.pop(key, None)
+            event.set()
+
+    @staticmethod
+    def _remember(game_id, version, payload, now):
+        with GameCache._lock:
+            GameCache._local[game_id] = (version, payload, now)
+            GameCache._local.move_to_end(game_id)
+            while len(GameCache._local) > GAMBLING_GAME_CACHE_L1_SIZE:
+                GameCache._local.popitem(last=False)
+
+    @staticmethod
+    def _forget(game_id):
+        with GameCache._lock:
+            GameCache._local.pop(game_id, None)
+
+    @staticmethod
+    def clear_local():
+        with GameCache._lock:
+            GameCache._local.clear()
 
 def get_cached_game(game_id):
-    return cache.get(f'game:{game_id}')
+    return GameCache.peek(game_id)
 
 def cache_game(game):
-    cache.set(f'game:{game.id}', game, timeout=300)
+    # Read-through: loads the current row rather than storing ``game`` as is
+    GameCache.get(game.id)
 
 def get_cached_game_stats(game_id):
     return cache.get(f'game_stats:{game_id}')
@@ -13,11 +222,59 @@ def cache_game_stats(game_id, stats):
     cache.set(f'game_stats:{game_id}', stats, timeout=300)
 
 def invalidate_game_cache(game_id):
-    cache.delete(f'game:{game_id}')
+    GameCache.invalidate(game_id)
     cache.delete(f'game_stats:{game_id}')
 
 def get_user_active_bets_cache_key(user_id):
     return f'user_active_bets:{user_id}'
 
+def get_player_stats_key(user_id):
+    return f'{GAMBLING_CACHE_PREFIX}:player_stats:{user_id}'
+
+def get_active_games_count_key():
+    return f'{GAMBLING_CACHE_PREFIX}:active_games_count'
+
+def get_gambling_counters(user):
+    """The user's ``PlayerStats`` counters plus ``active_games``
+
+    Both come from one ``get_many``; misses are filled from the counter
+    row and a single COUNT of active games.
+    """
+    from .aggregates import PlayerStatsService
+
+    stats_key = get_player_stats_key(user.id)
+    games_key = get_active_games_count_key()
+    cached = cache.get_many([stats_key, games_key])
+
+    missing = {}
+    stats = cached.get(stats_key)
+    if stats is None:
+        stats = missing[stats_key] = PlayerStatsService.get(user.id)
+    active_games = cached.get(games_key)
+    if active_games is None:
+        active_games = missing[games_key] = GamblingGame.objects.filter(
+            status='active'
+        ).count()
+    if missing:
+        cache.set_many(missing, timeout=GAMBLING_CACHE_TIMEOUT)
+
+    return dict(stats, active_games=active_games)
+
+def get_request_gambling_counters(request):
+    """``get_gambling_counters`` once per request, shared by middleware and templates"""
+    if not hasattr(request, '_gambling_counters'):
+        request._gambling_counters = get_gambling_counters(request.user)
+    return request._gambling_counters
+
+def get_user_active_bets_count(user):
+    """Number of the user's open bets, from the cached counters"""
+    return get_gambling_counters(user)['active_bets']
+
+def invalidate_user_active_bets(user_ids):
+    cache.delete_many([get_player_stats_key(i) for i in user_ids])
+
+def invalidate_active_games_count():
+    cache.delete(get_active_games_count_key())
+
 def get_game_cache_key(game_id):
-    return f'game:{game_id}' 
\ No newline at end of file
+    return GameCache.data_key(game_id, GameCache.get_version(game_id))
@@ -26,12 +26,16 @@ app.conf.beat_schedule = {
     },
     'update-game-statistics': {
         'task': 'gambling.tasks.update_game_statistics',
-        'schedule': crontab(minute='*/5'),  # Every 5 minutes
+        'schedule': crontab(minute='15'),  # Hourly consistency check
     },
     'send-game-notifications': {
         'task': 'gambling.tasks.send_game_notifications',
         'schedule': crontab(minute='*/1'),  # Every minute
     },
+    'deliver-outbox': {
+        'task': 'gambling.tasks.deliver_outbox',
+        'schedule': crontab(minute='*/1'),  # Picks up retries
+    },
 }
 
 # Configure task routing
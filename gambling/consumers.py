@@ -3,12 +3,16 @@ from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.core.exceptions import ObjectDoesNotExist
 from .models import GamblingGame
+from .cache import GameCache
+from .odds import OddsStream
 
 class GamblingConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         """Handle WebSocket connection"""
         self.user = self.scope["user"]
         self.game_groups = set()
+        # Last odds snapshot sent to this client, per game
+        self.odds_snapshots = {}
         
         # Add user to their personal group
         if self.user.is_authenticated:
@@ -55,9 +59,17 @@ class GamblingConsumer(AsyncWebsocketConsumer):
                 'error': str(e)
             }))
     
+    @staticmethod
+    def parse_game_id(data):
+        """The requested game id as an int, matching the ids in group events"""
+        try:
+            return int(data.get('game_id'))
+        except (TypeError, ValueError):
+            return None
+
     async def handle_watch_game(self, data):
         """Handle request to watch a game"""
-        game_id = data.get('game_id')
+        game_id = self.parse_game_id(data)
         if not game_id:
             return
         
@@ -78,6 +90,10 @@ class GamblingConsumer(AsyncWebsocketConsumer):
                 'game_id': game_id
             }))
             
+            # Start the live odds stream with a full snapshot
+            snapshot = await self.get_odds_snapshot(game_id)
+            await self.send_odds_snapshot(game_id, snapshot)
+            
         except ObjectDoesNotExist:
             await self.send(text_data=json.dumps({
                 'error': 'Game not found'
@@ -85,7 +101,7 @@ class GamblingConsumer(AsyncWebsocketConsumer):
     
     async def handle_unwatch_game(self, data):
         """Handle request to unwatch a game"""
-        game_id = data.get('game_id')
+        game_id = self.parse_game_id(data)
         if not game_id:
             return
             
@@ -96,6 +112,7 @@ class GamblingConsumer(AsyncWebsocketConsumer):
                 self.channel_name
             )
             self.game_groups.remove(group_name)
+            self.odds_snapshots.pop(game_id, None)
     
     async def game_update(self, event):
         """Handle game update event"""
@@ -121,7 +138,46 @@ class GamblingConsumer(AsyncWebsocketConsumer):
             'data': event['data']
         }))
     
+    async def odds_snapshot(self, event):
+        """Handle throttled odds snapshot event"""
+        await self.send_odds_snapshot(event['game_id'], event['snapshot'])
+    
+    async def send_odds_snapshot(self, game_id, snapshot):
+        """Send a snapshot, delta-encoded against the client's last one"""
+        previous = self.odds_snapshots.get(game_id)
+        if previous is not None and snapshot['seq'] <= previous['seq']:
+            return
+        
+        if previous is None:
+            message = {
+                'type': 'odds_snapshot',
+                'game_id': game_id,
+                'data': snapshot
+            }
+        else:
+            delta = OddsStream.diff(previous, snapshot)
+            if delta is None:
+                self.odds_snapshots[game_id] = snapshot
+                return
+            message = {
+                'type': 'odds_delta',
+                'game_id': game_id,
+                'data': delta
+            }
+        
+        self.odds_snapshots[game_id] = snapshot
+        await self.send(text_data=json.dumps(message))
+    
+    @database_sync_to_async
+    def get_odds_snapshot(self, game_id):
+        """Build the current odds snapshot for a game"""
+        game = GamblingGame.objects.select_related('aggregate').get(id=game_id)
+        return OddsStream.build_snapshot(game)
+    
     @database_sync_to_async
     def get_game(self, game_id):
-        """Get game from database"""
-        return GamblingGame.objects.get(id=game_id) 
\ No newline at end of file
+        """Get game through the game cache"""
+        game = GameCache.get(game_id)
+        if game is None:
+            raise GamblingGame.DoesNotExist(f"Game {game_id} does not exist")
+        return game 
\ No newline at end of file
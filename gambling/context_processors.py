@@ -1,36 +1,29 @@
-from .models import GamblingGame
+from .cache import get_request_gambling_counters
 
 def active_games(request):
     """Add active games count to context"""
     if request.user.is_authenticated:
-        active_games_count = GamblingGame.objects.filter(
-            status='active'
-        ).count()
-        
-        user_active_bets = request.user.gamblingbet_set.filter(
-            status='placed',
-            game__status='active'
-        ).count()
-        
+        counters = get_request_gambling_counters(request)
         return {
-            'active_games_count': active_games_count,
-            'user_active_bets': user_active_bets
+            'active_games_count': counters['active_games'],
+            'user_active_bets': counters['active_bets']
         }
     return {}
 
 def user_gambling_stats(request):
     """Add user gambling statistics to context"""
     if request.user.is_authenticated:
-        total_bets = request.user.gamblingbet_set.count()
-        won_bets = request.user.gamblingbet_set.filter(
-            status='won'
-        ).count()
-        
+        counters = get_request_gambling_counters(request)
+        total_bets = counters['total_bets']
+        won_bets = counters['won_bets']
+
         win_rate = (won_bets / total_bets * 100) if total_bets > 0 else 0
-        
+
         return {
             'user_total_bets': total_bets,
             'user_won_bets': won_bets,
-            'user_win_rate': round(win_rate, 2)
+            'user_win_rate': round(win_rate, 2),
+            'user_total_wagered': counters['total_wagered'],
+            'user_total_won': counters['total_won']
         }
-    return {} 
\ No newline at end of file
+    return {}
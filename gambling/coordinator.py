@@ -0,0 +1,113 @@
+from django.db import transaction
+from django.utils import timezone
+from .models import GamblingGame, GamblingBet
+from .settlement import SettlementEngine
+from .exceptions import InvalidGameStateError
+from .fairness import FairnessEngine
+from .notifications import GamblingNotifier
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SettlementCoordinator:
+    """Single entry point for completing games.
+
+    A game is claimed by locking its row with ``SELECT ... FOR UPDATE SKIP
+    LOCKED`` and flipping it from ``active`` to ``completed`` in the same
+    short transaction. Concurrent callers skip rows another worker holds
+    and re-check the status under the lock, so each game is claimed exactly
+    once and N workers can split the expired games between them. Bets are
+    settled after the claim commits; ``SettlementEngine`` only touches
+    ``placed`` bets, so ``resume_unsettled`` can finish a claim whose worker
+    died.
+    """
+
+    BATCH_SIZE = 20
+
+    @staticmethod
+    @transaction.atomic
+    def claim_batch(limit=None, game_ids=None, expired_only=True, result=None):
+        """Claim up to ``limit`` active games and mark them completed
+
+        Each game gets a fresh provably fair draw unless ``result`` is given.
+        Pool games have nothing to draw, so they are only claimed with one.
+        """
+        games = GamblingGame.objects.select_for_update(skip_locked=True).filter(
+            status='active'
+        )
+        if result is None:
+            games = games.exclude(game_type__in=SettlementEngine.POOL_GAME_TYPES)
+        if expired_only:
+            games = games.filter(end_time__lte=timezone.now())
+        if game_ids is not None:
+            games = games.filter(pk__in=game_ids)
+        games = list(games.order_by('end_time')[:limit or SettlementCoordinator.BATCH_SIZE])
+
+        for game in games:
+            game.result = FairnessEngine.draw(game) if result is None else result
+            game.status = 'completed'
+            game.save()
+
+        return games
+
+    @staticmethod
+    def settle_claimed(game):
+        """Settle the bets of a game this worker has claimed"""
+        SettlementEngine.settle_game(game)
+
+        try:
+            GamblingNotifier.notify_game_completed(game)
+        except Exception as e:
+            logger.error(f"Error sending game completion notification: {e}")
+
+    @staticmethod
+    def complete(game, result=None):
+        """Complete one game now; raises if it is not active or already claimed"""
+        claimed = SettlementCoordinator.claim_batch(
+            limit=1,
+            game_ids=[game.pk],
+            expired_only=False,
+            result=result
+        )
+        if not claimed:
+            raise InvalidGameStateError(game.status, 'completed', game.pk)
+
+        SettlementCoordinator.settle_claimed(claimed[0])
+        return claimed[0]
+
+    @staticmethod
+    def settle_due_game(game_id):
+        """Claim and settle ``game_id`` if it has expired; returns True if settled"""
+        claimed = SettlementCoordinator.claim_batch(limit=1, game_ids=[game_id])
+        if not claimed:
+            return False
+
+        SettlementCoordinator.settle_claimed(claimed[0])
+        return True
+
+    @staticmethod
+    def settle_due(limit=None):
+        """Claim and settle one batch of expired games; returns their ids"""
+        settled = []
+        for game in SettlementCoordinator.claim_batch(limit):
+            try:
+                SettlementCoordinator.settle_claimed(game)
+                settled.append(game.id)
+                logger.info(f"Completed game {game.id}")
+            except Exception as e:
+                logger.error(f"Error settling claimed game {game.id}: {e}")
+        return settled
+
+    @staticmethod
+    def resume_unsettled():
+        """Finish completed games that still have placed bets"""
+        game_ids = GamblingBet.objects.filter(
+            status='placed',
+            game__status='completed'
+        ).values_list('game_id', flat=True).distinct()
+
+        resumed = []
+        for game in GamblingGame.objects.filter(pk__in=list(game_ids)):
+            SettlementEngine.settle_game(game)
+            resumed.append(game.id)
+        return resumed
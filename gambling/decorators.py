@@ -2,8 +2,7 @@ from functools import wraps
 from django.core.exceptions import PermissionDenied
 from django.shortcuts import redirect
 from django.contrib import messages
-from django.utils import timezone
-from .models import GamblingBet
+from .ratelimit import BetRateLimiter
 from .exceptions import (
     RateLimitExceededError,
     GameClosedError,
@@ -25,32 +24,10 @@ def check_betting_limits(view_func):
     """Decorator to check betting limits"""
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
-        user = request.user
-        
-        # Check bets per minute
-        recent_bets = GamblingBet.objects.filter(
-            user=user,
-            placed_at__gte=timezone.now() - timezone.timedelta(minutes=1)
-        ).count()
-        
-        if recent_bets >= 5:
-            messages.error(
-                request,
-                "You are placing bets too frequently. Please wait."
-            )
-            return redirect('gambling:game_list')
-        
-        # Check daily bet limit
-        daily_bets = GamblingBet.objects.filter(
-            user=user,
-            placed_at__date=timezone.now().date()
-        ).count()
-        
-        if daily_bets >= 100:
-            messages.error(
-                request,
-                "You have reached your daily betting limit."
-            )
+        try:
+            BetRateLimiter.check(request.user)
+        except RateLimitExceededError as e:
+            messages.error(request, str(e))
             return redirect('gambling:game_list')
             
         return view_func(request, *args, **kwargs)
@@ -0,0 +1,228 @@
+import hashlib
+import hmac
+import secrets
+import logging
+
+logger = logging.getLogger(__name__)
+
+def seed_hash(seed):
+    """SHA-256 of a hex seed, as hex; the published commitment to the seed"""
+    return hashlib.sha256(bytes.fromhex(seed)).hexdigest()
+
+class FairRNG:
+    """Deterministic random numbers from ``HMAC-SHA256(server_seed, client_seed:nonce:round)``.
+
+    All state lives on the instance, so separate draws never share a
+    sequence and can run in any thread or process. Numbers are taken
+    four bytes at a time with rejection sampling, so results carry no
+    modulo bias; a new round is hashed when a digest runs out.
+    """
+
+    def __init__(self, server_seed, client_seed, nonce=0):
+        self.key = bytes.fromhex(server_seed)
+        self.client_seed = client_seed
+        self.nonce = nonce
+        self.round = 0
+        self.buffer = b''
+
+    def _next_uint32(self):
+        if len(self.buffer) < 4:
+            message = f'{self.client_seed}:{self.nonce}:{self.round}'.encode()
+            self.buffer = hmac.new(self.key, message, hashlib.sha256).digest()
+            self.round += 1
+        value = int.from_bytes(self.buffer[:4], 'big')
+        self.buffer = self.buffer[4:]
+        return value
+
+    def randbelow(self, n):
+        """Uniform integer in ``[0, n)``"""
+        limit = 2 ** 32 - (2 ** 32 % n)
+        while True:
+            value = self._next_uint32()
+            if value < limit:
+                return value % n
+
+    def result(self, game_type):
+        """Game result dict for ``game_type``, or ``None`` for unknown types"""
+        if game_type == 'dice':
+            return {'number': self.randbelow(6) + 1}
+        elif game_type == 'coin':
+            return {'side': ('heads', 'tails')[self.randbelow(2)]}
+        elif game_type == 'roulette':
+            return {'number': self.randbelow(37)}
+        return None
+
+class FairnessEngine:
+    """Provably fair game results by per-game commit and reveal.
+
+    When a game is created it gets its own random server seed, and only
+    ``sha256(server_seed)`` is published as ``server_seed_hash``. Every
+    bet carries a client seed that the player can choose. At settlement
+    the bets' seeds are combined into the game's client seed, the server
+    seed is revealed and the result is ``FairRNG(server_seed,
+    client_seed)``. The server seed is fixed before any bet, and the
+    client seed is not known until betting closes, so neither side can
+    pick the result. Settlement order makes no difference.
+
+    Games settled before the commitments were introduced took their seed
+    from a ``SeedChain`` and are verified against its terminal hash.
+    """
+
+    BATCH_SIZE = 1000
+
+    @staticmethod
+    def commit(game):
+        """Give ``game`` a secret server seed and publish its hash; returns the seed"""
+        from .models import GamblingGame, GameSeed
+
+        seed = secrets.token_hex(32)
+        GameSeed.objects.create(game=game, seed=seed)
+        game.server_seed_hash = seed_hash(seed)
+        GamblingGame.objects.filter(pk=game.pk).update(
+            server_seed_hash=game.server_seed_hash
+        )
+        return seed
+
+    @staticmethod
+    def new_client_seed():
+        """Client seed for a bet whose player did not choose one"""
+        return secrets.token_hex(16)
+
+    @staticmethod
+    def combine_client_seeds(bet_seeds):
+        """Game client seed from ``(bet_id, client_seed)`` pairs in bet order"""
+        lines = '\n'.join(f'{bet_id}:{client_seed}' for bet_id, client_seed in bet_seeds)
+        return hashlib.sha256(lines.encode()).hexdigest()
+
+    @staticmethod
+    def client_seed_for(game):
+        from .models import GamblingBet
+
+        return FairnessEngine.combine_client_seeds(
+            GamblingBet.objects.filter(game_id=game.pk).order_by('id').values_list(
+                'id', 'client_seed'
+            )
+        )
+
+    @staticmethod
+    def draw(game):
+        """Reveal the server seed of ``game`` and return its result
+
+        The caller saves the game. A game created before seeds were
+        committed gets its seed now.
+        """
+        from .models import GameSeed
+
+        seed = GameSeed.objects.filter(game_id=game.pk).values_list(
+            'seed', flat=True
+        ).first()
+        if seed is None:
+            logger.warning(f"Game {game.pk} had no committed seed; committing at settlement")
+            seed = FairnessEngine.commit(game)
+
+        game.server_seed = seed
+        game.client_seed = FairnessEngine.client_seed_for(game)
+        return FairRNG(game.server_seed, game.client_seed).result(game.game_type)
+
+    @staticmethod
+    def verify_game(game_type, server_seed_hash, server_seed, client_seed, result, bet_seeds):
+        """Check one committed game; ``bet_seeds`` are its bets' ``(id, client_seed)``"""
+        try:
+            return (
+                seed_hash(server_seed) == server_seed_hash
+                and FairnessEngine.combine_client_seeds(bet_seeds) == client_seed
+                and FairRNG(server_seed, client_seed).result(game_type) == result
+            )
+        except (TypeError, ValueError):
+            return False
+
+    @staticmethod
+    def verify_rows(rows, terminal_hashes):
+        """Check ``(id, game_type, chain_id, index, server_seed, client_seed, result)`` rows
+
+        For games settled on a seed chain. Rows must be sorted by
+        ``(chain_id, index)``. ``terminal_hashes`` maps chain id to its
+        published terminal hash. Returns the ids of games whose seed is
+        not on its chain or whose result does not match the seeds.
+        """
+        failed = []
+        previous_chain, previous_index, previous_seed = None, 0, None
+        for game_id, game_type, chain_id, index, server_seed, client_seed, result in rows:
+            if chain_id != previous_chain:
+                previous_chain, previous_index = chain_id, 0
+                previous_seed = terminal_hashes.get(chain_id)
+
+            if index <= previous_index:
+                # A seed can only be used once
+                failed.append(game_id)
+                continue
+
+            try:
+                link = server_seed
+                for _ in range(index - previous_index):
+                    link = seed_hash(link)
+                valid = link == previous_seed and (
+                    FairRNG(server_seed, client_seed).result(game_type) == result
+                )
+            except (TypeError, ValueError):
+                valid = False
+
+            if valid:
+                previous_index, previous_seed = index, server_seed
+            else:
+                failed.append(game_id)
+        return failed
+
+    @staticmethod
+    def verify(games=None, chunk_size=None):
+        """Re-derive and check the results of settled games
+
+        Returns the ids of games that fail verification.
+        """
+        from .models import GamblingGame, SeedChain
+
+        chunk_size = chunk_size or FairnessEngine.BATCH_SIZE
+        if games is None:
+            games = GamblingGame.objects.all()
+
+        chained = games.exclude(seed_chain=None)
+        terminal_hashes = dict(SeedChain.objects.filter(
+            id__in=chained.values('seed_chain_id')
+        ).values_list('id', 'terminal_hash'))
+        rows = chained.order_by('seed_chain_id', 'seed_index').values_list(
+            'id', 'game_type', 'seed_chain_id', 'seed_index',
+            'server_seed', 'client_seed', 'result'
+        ).iterator(chunk_size=chunk_size)
+        failed = FairnessEngine.verify_rows(rows, terminal_hashes)
+
+        committed = games.filter(seed_chain=None).exclude(server_seed='').order_by('id').values_list(
+            'id', 'game_type', 'server_seed_hash', 'server_seed', 'client_seed', 'result'
+        )
+        chunk = []
+        for row in committed.iterator(chunk_size=chunk_size):
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                failed.extend(FairnessEngine._verify_committed(chunk))
+                chunk = []
+        if chunk:
+            failed.extend(FairnessEngine._verify_committed(chunk))
+        return failed
+
+    @staticmethod
+    def _verify_committed(rows):
+        from .models import GamblingBet
+
+        bet_seeds = {}
+        for game_id, bet_id, client_seed in GamblingBet.objects.filter(
+            game_id__in=[row[0] for row in rows]
+        ).order_by('game_id', 'id').values_list('game_id', 'id', 'client_seed'):
+            bet_seeds.setdefault(game_id, []).append((bet_id, client_seed))
+
+        return [
+            game_id
+            for game_id, game_type, committed_hash, server_seed, client_seed, result in rows
+            if not FairnessEngine.verify_game(
+                game_type, committed_hash, server_seed, client_seed,
+                result, bet_seeds.get(game_id, [])
+            )
+        ]
@@ -0,0 +1,133 @@
+from array import array
+from decimal import Decimal, ROUND_DOWN, ROUND_HALF_EVEN, getcontext
+
+# Amounts are settled to 8 decimal places; one base unit is 0.00000001
+UNIT_PLACES = 8
+UNIT = Decimal(1).scaleb(-UNIT_PLACES)
+
+_POW10 = [10 ** i for i in range(80)]
+
+_UNITS_PER = 10 ** UNIT_PLACES
+
+def to_units(amount):
+    """Exact integer base units of a Decimal with at most 8 decimal places"""
+    numerator, denominator = amount.as_integer_ratio()
+    scale, rest = divmod(_UNITS_PER, denominator)
+    if rest:
+        raise ValueError(f"{amount} has more than {UNIT_PLACES} decimal places")
+    return numerator * scale
+
+def from_units(units):
+    """Decimal amount of ``units`` base units, quantized to 8 places"""
+    return Decimal(units).scaleb(-UNIT_PLACES)
+
+def load_units(amounts):
+    """Pack Decimal amounts into a compact int64 array of base units"""
+    return array('q', (to_units(amount) for amount in amounts))
+
+def _digits(n):
+    # Number of decimal digits of a positive int, from its bit length
+    d = (n.bit_length() * 1233) >> 12
+    return d + 1 if n >= _POW10[d] else d
+
+def _divide(n, divisor, rounding):
+    q, r = divmod(n, divisor)
+    if rounding == ROUND_HALF_EVEN:
+        twice = 2 * r
+        if twice > divisor or (twice == divisor and q & 1):
+            q += 1
+    return q
+
+class Multiplier:
+    """A Decimal factor applied to base-unit amounts the way ``Decimal`` would.
+
+    ``amount * factor`` in the default context is the exact product rounded
+    half-even to the context precision; ``quantize`` then rounds that to 8
+    places. Both steps are reproduced on plain integers, so a payout matches
+    ``(amount * factor).quantize(Decimal('0.00000001'), rounding)`` exactly.
+    """
+
+    def __init__(self, factor, rounding=ROUND_DOWN):
+        sign, digits, exponent = factor.as_tuple()
+        if sign or not isinstance(exponent, int):
+            raise ValueError(f"Multiplier must be finite and not negative: {factor}")
+        self.factor = factor
+        self.coefficient = int(''.join(map(str, digits)) or '0')
+        # The product of units and coefficient is in units of 10 ** -shift base units
+        self.shift = -exponent
+        self.rounding = rounding
+        self.precision = getcontext().prec
+
+        # Below this remainder, rounding the product to the context precision
+        # cannot carry into the result, so one divmod gives the rounded-down
+        # payout for any int64 amount
+        excess = _digits((2 ** 63) * self.coefficient) - self.precision
+        self.fast = rounding == ROUND_DOWN and self.shift > max(excess, 0)
+        if self.fast:
+            self.divisor = _POW10[self.shift]
+            self.limit = self.divisor - _POW10[max(excess, 0)]
+
+    def apply(self, units):
+        """Payout in base units for one amount in base units"""
+        product = units * self.coefficient
+        if not product:
+            return 0
+
+        # Round the product to the context precision, as Decimal multiplication does
+        excess = _digits(product) - self.precision
+        shift = self.shift
+        if excess > 0:
+            product = _divide(product, _POW10[excess], ROUND_HALF_EVEN)
+            shift -= excess
+
+        if shift <= 0:
+            return product * _POW10[-shift]
+        return _divide(product, _POW10[shift], self.rounding)
+
+    def apply_all(self, amounts):
+        """Payouts for an array of base-unit amounts, as an int64 array"""
+        if not self.fast:
+            return array('q', map(self.apply, amounts))
+
+        coefficient, divisor, limit, apply = (
+            self.coefficient, self.divisor, self.limit, self.apply
+        )
+        payouts = array('q', bytes(8 * len(amounts)))
+        for i, units in enumerate(amounts):
+            payout, rest = divmod(units * coefficient, divisor)
+            payouts[i] = payout if rest < limit else apply(units)
+        return payouts
+
+def pro_rata(amounts, prize_pool, winning_total, distribute_remainder=False):
+    """Split ``prize_pool`` over winning stakes ``amounts`` (base units)
+
+    Each payout is ``amount * (prize_pool / winning_total)`` rounded down to
+    8 places, matching ``calculate_win_amount``. The base units that
+    rounding leaves over are returned as the remainder. With
+    ``distribute_remainder`` they are handed out one unit each, largest
+    fractional share first (ties to the earliest bet), so the payouts add
+    up to the floor of the prize pool. Returns ``(payouts, remainder)``.
+    """
+    if not winning_total:
+        return array('q', bytes(8 * len(amounts))), 0
+
+    multiplier = Multiplier(prize_pool / winning_total, ROUND_DOWN)
+    payouts = multiplier.apply_all(amounts)
+    pool_units = int(prize_pool.scaleb(UNIT_PLACES).to_integral_value(ROUND_DOWN))
+    remainder = max(pool_units - sum(payouts), 0)
+
+    if distribute_remainder and remainder:
+        # share_i = amounts[i] * numerator / denominator base units, exactly
+        pool_n, pool_d = prize_pool.as_integer_ratio()
+        total_n, total_d = winning_total.as_integer_ratio()
+        numerator = pool_n * total_d
+        denominator = pool_d * total_n
+        order = sorted(
+            range(len(amounts)),
+            key=lambda i: -((amounts[i] * numerator) % denominator)
+        )
+        for i in order[:remainder]:
+            payouts[i] += 1
+        remainder -= min(remainder, len(amounts))
+
+    return payouts, remainder
@@ -60,6 +60,11 @@ class PlaceBetForm(forms.Form):
             MaxValueValidator(Decimal('1.00000000'))
         ]
     )
+    client_seed = forms.CharField(
+        max_length=64,
+        required=False,
+        help_text='Optional; mixed into the game result so you can verify it'
+    )
     
     def __init__(self, *args, game=None, **kwargs):
         super().__init__(*args, **kwargs)
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from decimal import Decimal
+from gambling.fixedpoint import from_units, load_units, pro_rata
+from gambling.utils import calculate_win_amount
+import random
+import time
+
+class Command(BaseCommand):
+    help = 'Compare pro-rata payout math on Decimal and on integer base units'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='10000,100000,1000000',
+            help='Comma separated list of winning bet counts'
+        )
+        parser.add_argument(
+            '--fee',
+            default='2.00',
+            help='Game fee percentage deducted from the pool'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for the generated stakes'
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        fee = Decimal(options['fee'])
+
+        for size in [int(size) for size in options['sizes'].split(',')]:
+            amounts = [Decimal(rng.randint(100, 100000)).scaleb(-2) for _ in range(size)]
+            winning_total = sum(amounts, Decimal('0'))
+            total_pool = winning_total * 3
+            prize_pool = total_pool - total_pool * (fee / 100)
+
+            start = time.perf_counter()
+            expected = [
+                calculate_win_amount(amount, prize_pool, winning_total)
+                for amount in amounts
+            ]
+            decimal_time = time.perf_counter() - start
+
+            units = load_units(amounts)
+            start = time.perf_counter()
+            payouts, remainder = pro_rata(units, prize_pool, winning_total)
+            integer_time = time.perf_counter() - start
+
+            matches = list(map(from_units, payouts)) == expected
+            style = self.style.SUCCESS if matches else self.style.ERROR
+            self.stdout.write(style(
+                f"{size:>8} bets: decimal {decimal_time:.3f}s, "
+                f"integer {integer_time:.3f}s "
+                f"({decimal_time / max(integer_time, 1e-9):.1f}x), "
+                f"{remainder} units undistributed, "
+                f"{'identical' if matches else 'MISMATCH'}"
+            ))
@@ -0,0 +1,115 @@
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from decimal import Decimal
+from gambling.models import GamblingGame, GamblingBet
+from gambling.services import GamblingService
+from gambling.settlement import SettlementEngine
+import random
+import time
+
+User = get_user_model()
+
+class Command(BaseCommand):
+    help = 'Benchmark bet settlement for games of different sizes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='1000,10000,100000',
+            help='Comma separated list of bet counts to benchmark'
+        )
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=200,
+            help='Number of distinct bettors'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=SettlementEngine.CHUNK_SIZE,
+            help='Settlement chunk size'
+        )
+        parser.add_argument(
+            '--legacy',
+            action='store_true',
+            help='Also time the per-bet process_bet_result loop'
+        )
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+
+        for size in sizes:
+            timings = self.run_size(size, options)
+            line = f"{size:>7} bets: engine {timings['engine']:.3f}s"
+            if 'legacy' in timings:
+                speedup = timings['legacy'] / max(timings['engine'], 1e-9)
+                line += f", legacy {timings['legacy']:.3f}s ({speedup:.1f}x)"
+            self.stdout.write(self.style.SUCCESS(line))
+
+    def run_size(self, size, options):
+        """Time settlement of ``size`` bets; all data is rolled back"""
+        timings = {}
+        result = {'number': 3}
+
+        with transaction.atomic():
+            game, users = self.create_fixture(size, options['users'])
+            start = time.perf_counter()
+            SettlementEngine.settle(
+                game,
+                result,
+                chunk_size=options['chunk_size'],
+                notify=False
+            )
+            timings['engine'] = time.perf_counter() - start
+            transaction.set_rollback(True)
+
+        if options['legacy']:
+            with transaction.atomic():
+                game, users = self.create_fixture(size, options['users'])
+                bets = GamblingBet.objects.filter(
+                    game=game,
+                    status='placed'
+                ).select_related('game')
+                start = time.perf_counter()
+                for bet in bets:
+                    GamblingService.process_bet_result(bet, result)
+                timings['legacy'] = time.perf_counter() - start
+                transaction.set_rollback(True)
+
+        return timings
+
+    def create_fixture(self, size, user_count):
+        """Create a dice game with ``size`` placed bets"""
+        suffix = random.randint(0, 10 ** 9)
+        User.objects.bulk_create([
+            User(username=f'bench_{suffix}_{i}')
+            for i in range(user_count)
+        ])
+        users = list(User.objects.filter(username__startswith=f'bench_{suffix}_'))
+
+        game = GamblingGame.objects.create(
+            title=f'Settlement benchmark {size}',
+            description='Benchmark game',
+            game_type='dice',
+            status='active',
+            end_time=timezone.now() + timezone.timedelta(hours=1)
+        )
+
+        GamblingBet.objects.bulk_create(
+            [
+                GamblingBet(
+                    game=game,
+                    user=users[i % len(users)],
+                    amount=Decimal('1.00'),
+                    fee_amount=Decimal('0.02'),
+                    bet_data={'number': (i % 6) + 1},
+                    status='placed'
+                )
+                for i in range(size)
+            ],
+            batch_size=5000
+        )
+        return game, users
@@ -1,7 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from gambling.models import GamblingGame
-from gambling.services import GamblingService
+from gambling.coordinator import SettlementCoordinator
 import logging
 
 logger = logging.getLogger(__name__)
@@ -35,18 +35,14 @@ class Command(BaseCommand):
         
         self.stdout.write(f"Found {expired_games.count()} expired games")
         
-        for game in expired_games:
-            try:
-                if not dry_run:
-                    GamblingService.complete_game(game)
-                self.stdout.write(
-                    self.style.SUCCESS(f"Completed game {game.id}")
-                )
-            except Exception as e:
+        while not dry_run:
+            settled = SettlementCoordinator.settle_due()
+            for game_id in settled:
                 self.stdout.write(
-                    self.style.ERROR(f"Error completing game {game.id}: {str(e)}")
+                    self.style.SUCCESS(f"Completed game {game_id}")
                 )
-                logger.error(f"Error completing game {game.id}: {str(e)}")
+            if len(settled) < SettlementCoordinator.BATCH_SIZE:
+                break
         
         # Cleanup old games
         cutoff_date = timezone.now() - timezone.timedelta(days=days)
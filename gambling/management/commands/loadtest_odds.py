@@ -0,0 +1,179 @@
+from django.core.management.base import BaseCommand
+from channels.layers import InMemoryChannelLayer
+from decimal import Decimal
+from gambling.consumers import GamblingConsumer
+import asyncio
+import json
+import random
+import time
+
+GROUP = 'game_loadtest'
+
+class SimulatedConsumer:
+    """Stand-in for one connected ``GamblingConsumer``
+
+    Reuses the consumer's own snapshot handler, so the delta encoding
+    being measured is the code that runs in production.
+    """
+
+    send_odds_snapshot = GamblingConsumer.send_odds_snapshot
+
+    def __init__(self, channel, stats):
+        self.channel = channel
+        self.stats = stats
+        self.odds_snapshots = {}
+
+    async def send(self, text_data):
+        self.stats['frames'] += 1
+        self.stats['bytes'] += len(text_data)
+
+    async def bet_placed(self, event):
+        await self.send(text_data=json.dumps({
+            'type': 'bet_placed',
+            'game_id': event['game_id'],
+            'data': event['data']
+        }))
+
+    async def odds_snapshot(self, event):
+        await self.send_odds_snapshot(event['game_id'], event['snapshot'])
+
+    async def run(self, layer):
+        while True:
+            event = await layer.receive(self.channel)
+            if event['type'] == 'loadtest.stop':
+                return
+            await getattr(self, event['type'])(event)
+            self.stats['latencies'].append(time.perf_counter() - event['sent_at'])
+
+class Command(BaseCommand):
+    help = 'Load test live odds fan-out against an in-memory channel layer'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--consumers',
+            type=int,
+            default=2000,
+            help='Number of simulated watching sockets'
+        )
+        parser.add_argument(
+            '--bets',
+            type=int,
+            default=2000,
+            help='Number of bets to simulate'
+        )
+        parser.add_argument(
+            '--rate',
+            type=int,
+            default=500,
+            help='Bets per second'
+        )
+        parser.add_argument(
+            '--options',
+            type=int,
+            default=6,
+            help='Number of distinct bet options'
+        )
+        parser.add_argument(
+            '--interval-ms',
+            type=int,
+            default=500,
+            help='Snapshot interval for the throttled stream'
+        )
+        parser.add_argument(
+            '--skip-naive',
+            action='store_true',
+            help='Only run the throttled stream'
+        )
+
+    def handle(self, *args, **options):
+        modes = ['throttled'] if options['skip_naive'] else ['naive', 'throttled']
+        for mode in modes:
+            stats = asyncio.run(self.run_mode(mode, options))
+            self.report(mode, stats)
+
+    async def run_mode(self, mode, options):
+        """Replay the same bet stream to every consumer in one mode"""
+        consumer_count = options['consumers']
+        layer = InMemoryChannelLayer(capacity=options['bets'] + 100)
+        stats = {'frames': 0, 'bytes': 0, 'latencies': []}
+
+        consumers = []
+        for _ in range(consumer_count):
+            channel = await layer.new_channel()
+            await layer.group_add(GROUP, channel)
+            consumers.append(SimulatedConsumer(channel, stats))
+        readers = [asyncio.ensure_future(c.run(layer)) for c in consumers]
+
+        rng = random.Random(42)
+        pools = {}
+        total_pool = Decimal('0')
+        total_bets = 0
+        delay = 1 / options['rate']
+        interval = options['interval_ms'] / 1000
+        seq = 0
+        last_publish = time.perf_counter()
+        dirty = False
+
+        start = time.perf_counter()
+        for _ in range(options['bets']):
+            key = json.dumps({'number': rng.randint(1, options['options'])})
+            amount = Decimal(rng.randint(1, 100))
+            pools[key] = pools.get(key, Decimal('0')) + amount
+            total_pool += amount
+            total_bets += 1
+
+            if mode == 'naive':
+                await layer.group_send(GROUP, {
+                    'type': 'bet_placed',
+                    'game_id': 0,
+                    'data': {'amount': str(amount), 'total_pool': str(total_pool)},
+                    'sent_at': time.perf_counter()
+                })
+            else:
+                dirty = True
+                if time.perf_counter() - last_publish >= interval:
+                    seq += 1
+                    await self.publish(layer, seq, pools, total_pool, total_bets)
+                    last_publish = time.perf_counter()
+                    dirty = False
+
+            await asyncio.sleep(delay)
+
+        if dirty:
+            seq += 1
+            await self.publish(layer, seq, pools, total_pool, total_bets)
+
+        await layer.group_send(GROUP, {'type': 'loadtest.stop'})
+        await asyncio.gather(*readers)
+        stats['elapsed'] = time.perf_counter() - start
+        stats['bets'] = options['bets']
+        return stats
+
+    async def publish(self, layer, seq, pools, total_pool, total_bets):
+        """Send one snapshot in the format ``OddsStream`` publishes"""
+        values = {'total_pool': str(total_pool), 'total_bets': total_bets}
+        prize_pool = total_pool * Decimal('0.98')
+        for key, amount in pools.items():
+            values[f'pool:{key}'] = str(amount)
+            values[f'odds:{key}'] = str((prize_pool / amount).quantize(Decimal('0.0001')))
+
+        await layer.group_send(GROUP, {
+            'type': 'odds_snapshot',
+            'game_id': 0,
+            'snapshot': {'seq': seq, 'values': values},
+            'sent_at': time.perf_counter()
+        })
+
+    def report(self, mode, stats):
+        latencies = sorted(stats['latencies'])
+        if latencies:
+            p50 = latencies[len(latencies) // 2] * 1000
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+        else:
+            p50 = p99 = 0
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{mode:>9}: {stats['bets']} bets in {stats['elapsed']:.2f}s, "
+            f"{stats['frames']} frames, {stats['bytes'] / 1024:.1f} KiB sent, "
+            f"fan-out p50 {p50:.1f}ms p99 {p99:.1f}ms"
+        ))
@@ -1,7 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from gambling.models import GamblingGame
-from gambling.services import GamblingService
+from gambling.coordinator import SettlementCoordinator
 
 class Command(BaseCommand):
     help = 'Process completed gambling games and distribute winnings'
@@ -24,20 +24,17 @@ class Command(BaseCommand):
         
         self.stdout.write(f'Found {expired_games.count()} games to process')
         
-        for game in expired_games:
-            try:
-                self.stdout.write(f'Processing game {game.id}: {game.title}')
-                
-                if not dry_run:
-                    GamblingService.complete_game(game)
-                    self.stdout.write(
-                        self.style.SUCCESS(f'Successfully completed game {game.id}')
-                    )
-                else:
-                    self.stdout.write(f'Would complete game {game.id} (dry run)')
-                    
-            except Exception as e:
+        if dry_run:
+            for game in expired_games:
+                self.stdout.write(f'Would complete game {game.id} (dry run)')
+            return
+        
+        # Claim games in batches; games held by a running worker are skipped
+        while True:
+            settled = SettlementCoordinator.settle_due()
+            for game_id in settled:
                 self.stdout.write(
-                    self.style.ERROR(f'Error processing game {game.id}: {str(e)}')
+                    self.style.SUCCESS(f'Successfully completed game {game_id}')
                 )
-                continue 
\ No newline at end of file
+            if len(settled) < SettlementCoordinator.BATCH_SIZE:
+                break 
\ No newline at end of file
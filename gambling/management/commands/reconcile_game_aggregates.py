@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand
+from gambling.models import GamblingGame
+from gambling.aggregates import GameAggregateService
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Verify denormalized game aggregates against the raw bets table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Overwrite mismatching aggregates with the computed values'
+        )
+        parser.add_argument(
+            '--game-id',
+            type=int,
+            help='Only reconcile this game'
+        )
+        parser.add_argument(
+            '--status',
+            help='Only reconcile games with this status'
+        )
+
+    def handle(self, *args, **options):
+        fix = options['fix']
+        games = GamblingGame.objects.all()
+
+        if options['game_id']:
+            games = games.filter(id=options['game_id'])
+        if options['status']:
+            games = games.filter(status=options['status'])
+
+        checked = 0
+        mismatched = 0
+        for game in games.iterator():
+            checked += 1
+            mismatches = GameAggregateService.reconcile(game, fix=fix)
+            if not mismatches:
+                continue
+
+            mismatched += 1
+            for field, (stored, expected) in mismatches.items():
+                self.stdout.write(
+                    self.style.WARNING(
+                        f'Game {game.id}: {field} is {stored}, expected {expected}'
+                    )
+                )
+            if fix:
+                logger.warning(f"Repaired aggregate for game {game.id}")
+                self.stdout.write(
+                    self.style.SUCCESS(f'Fixed aggregate for game {game.id}')
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Checked {checked} games. Found {mismatched} mismatching aggregates'
+            )
+        )
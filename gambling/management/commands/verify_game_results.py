@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from gambling.models import GamblingGame
+from gambling.fairness import FairnessEngine
+import time
+
+class Command(BaseCommand):
+    help = 'Re-derive settled game results from their revealed seeds and check them'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--game-id',
+            type=int,
+            help='Only verify this game'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=FairnessEngine.BATCH_SIZE,
+            help='Rows fetched per database round trip'
+        )
+
+    def handle(self, *args, **options):
+        games = GamblingGame.objects.exclude(server_seed='')
+        if options['game_id']:
+            games = games.filter(id=options['game_id'])
+
+        start = time.perf_counter()
+        checked = games.count()
+        failed = FairnessEngine.verify(games, options['chunk_size'])
+        elapsed = time.perf_counter() - start
+
+        for game_id in failed:
+            self.stdout.write(
+                self.style.WARNING(f'Game {game_id}: result does not match its seeds')
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Verified {checked} games in {elapsed:.2f}s. '
+                f'{len(failed)} failed verification'
+            )
+        )
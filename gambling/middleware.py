@@ -1,9 +1,10 @@
-from django.utils import timezone
 from django.urls import resolve
 from django.contrib import messages
 from django.http import HttpResponseRedirect
 import logging
-from .models import GamblingGame
+from .cache import get_request_gambling_counters
+from .exceptions import RateLimitExceededError
+from .ratelimit import BetRateLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -22,30 +23,21 @@ class GamblingMiddleware:
         return response
     
     def process_active_games(self, request):
-        """Process active games for the current user"""
+        """Attach the user's open bet count on gambling pages
+        
+        Expired games are settled by ``GameScheduler``, so this is only a
+        cache read; the counters are invalidated on bet placement and
+        settlement, and the context processors reuse the same read.
+        """
         try:
             # Get current URL name
-            current_url = resolve(request.path_info).url_name
+            current_url = resolve(request.path_info).view_name
             
             # Only process on gambling-related pages
             if current_url and current_url.startswith('gambling:'):
-                # Auto-complete expired games
-                expired_games = GamblingGame.objects.filter(
-                    status='active',
-                    end_time__lte=timezone.now()
-                )
-                
-                for game in expired_games:
-                    try:
-                        game.complete()
-                    except Exception as e:
-                        logger.error(f"Error auto-completing game {game.id}: {str(e)}")
-                
-                # Update request user's active bets count
-                request.user.active_bets_count = request.user.gamblingbet_set.filter(
-                    status='placed',
-                    game__status='active'
-                ).count()
+                request.user.active_bets_count = get_request_gambling_counters(
+                    request
+                )['active_bets']
                 
         except Exception as e:
             logger.error(f"Error in GamblingMiddleware: {str(e)}")
@@ -56,38 +48,22 @@ class GamblingRateLimitMiddleware:
 
     def __call__(self, request):
         if request.user.is_authenticated:
-            self.check_rate_limits(request)
+            response = self.check_rate_limits(request)
+            if response is not None:
+                return response
             
         return self.get_response(request)
     
     def check_rate_limits(self, request):
         """Check and enforce gambling rate limits"""
         try:
-            current_url = resolve(request.path_info).url_name
+            view_name = resolve(request.path_info).view_name
             
-            if current_url == 'gambling:place_bet':
-                # Check bet frequency
-                recent_bets = request.user.gamblingbet_set.filter(
-                    placed_at__gte=timezone.now() - timezone.timedelta(minutes=1)
-                ).count()
-                
-                if recent_bets >= 5:  # Max 5 bets per minute
-                    raise RateLimitExceeded("Betting too frequently. Please wait.")
+            if view_name == 'gambling:place_bet':
+                BetRateLimiter.check(request.user)
                 
-                # Check daily betting limit
-                daily_bets = request.user.gamblingbet_set.filter(
-                    placed_at__date=timezone.now().date()
-                )
-                
-                daily_amount = sum(bet.amount for bet in daily_bets)
-                if daily_amount >= request.user.daily_betting_limit:
-                    raise RateLimitExceeded("Daily betting limit reached.")
-                
-        except RateLimitExceeded as e:
+        except RateLimitExceededError as e:
             messages.error(request, str(e))
             return HttpResponseRedirect(request.META.get('HTTP_REFERER', '/'))
         except Exception as e:
             logger.error(f"Error in GamblingRateLimitMiddleware: {str(e)}")
-
-class RateLimitExceeded(Exception):
-    pass 
\ No newline at end of file
@@ -0,0 +1,105 @@
+# Generated by Django 4.2.17 on 2026-10-18 09:12
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+import django.db.models.deletion
+import json
+
+
+def option_key(bet_data):
+    return json.dumps(bet_data, sort_keys=True, separators=(",", ":"))
+
+
+def backfill_aggregates(apps, schema_editor):
+    GamblingBet = apps.get_model("gambling", "GamblingBet")
+    GameAggregate = apps.get_model("gambling", "GameAggregate")
+    rows = GamblingBet.objects.values("game_id").annotate(
+        total_pool=Sum("amount"),
+        total_bets=Count("id"),
+        unique_players=Count("user", distinct=True),
+        fee_collected=Sum("fee_amount"),
+        total_paid_out=Sum("win_amount", filter=Q(status="won")),
+    ).order_by()
+
+    option_totals = {}
+    bets = GamblingBet.objects.values_list("game_id", "bet_data", "amount")
+    for game_id, bet_data, amount in bets.iterator():
+        options = option_totals.setdefault(game_id, {})
+        option = options.setdefault(option_key(bet_data), [Decimal("0"), 0])
+        option[0] += amount
+        option[1] += 1
+
+    GameAggregate.objects.bulk_create(
+        (
+            GameAggregate(
+                game_id=row["game_id"],
+                total_pool=row["total_pool"] or Decimal("0"),
+                total_bets=row["total_bets"],
+                unique_players=row["unique_players"],
+                fee_collected=row["fee_collected"] or Decimal("0"),
+                total_paid_out=row["total_paid_out"] or Decimal("0"),
+                option_totals={
+                    key: {"amount": str(amount), "bets": count}
+                    for key, (amount, count) in option_totals.get(row["game_id"], {}).items()
+                },
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gambling", "0002_game_bet"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GameAggregate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "total_pool",
+                    models.DecimalField(
+                        decimal_places=8, default=Decimal("0"), max_digits=18
+                    ),
+                ),
+                ("total_bets", models.PositiveIntegerField(default=0)),
+                ("unique_players", models.PositiveIntegerField(default=0)),
+                (
+                    "fee_collected",
+                    models.DecimalField(
+                        decimal_places=8, default=Decimal("0"), max_digits=18
+                    ),
+                ),
+                (
+                    "total_paid_out",
+                    models.DecimalField(
+                        decimal_places=8, default=Decimal("0"), max_digits=18
+                    ),
+                ),
+                ("option_totals", models.JSONField(default=dict)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "game",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="aggregate",
+                        to="gambling.gamblinggame",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(backfill_aggregates, migrations.RunPython.noop),
+    ]
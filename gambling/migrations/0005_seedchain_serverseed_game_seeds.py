@@ -0,0 +1,85 @@
+# Generated by Django 4.2.17 on 2026-10-18 16:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gambling", "0004_emailoutbox"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SeedChain",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("terminal_hash", models.CharField(max_length=64, unique=True)),
+                ("length", models.PositiveIntegerField()),
+                ("next_index", models.PositiveIntegerField(default=1)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ServerSeed",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("index", models.PositiveIntegerField()),
+                ("seed", models.CharField(max_length=64)),
+                (
+                    "chain",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="seeds",
+                        to="gambling.seedchain",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("chain", "index")},
+            },
+        ),
+        migrations.AddField(
+            model_name="gamblinggame",
+            name="seed_chain",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="games",
+                to="gambling.seedchain",
+            ),
+        ),
+        migrations.AddField(
+            model_name="gamblinggame",
+            name="seed_index",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="gamblinggame",
+            name="server_seed",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="gamblinggame",
+            name="client_seed",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 4.2.17 on 2026-10-18 17:20
+
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+import django.db.models.deletion
+
+
+def backfill_player_stats(apps, schema_editor):
+    GamblingBet = apps.get_model("gambling", "GamblingBet")
+    PlayerStats = apps.get_model("gambling", "PlayerStats")
+    # Bets used to be created as "pending", which settlement never picked up
+    GamblingBet.objects.filter(status="pending").update(status="placed")
+    rows = GamblingBet.objects.values("user_id").annotate(
+        active_bets=Count("id", filter=Q(status="placed")),
+        total_bets=Count("id"),
+        won_bets=Count("id", filter=Q(status="won")),
+        total_wagered=Sum("amount"),
+        total_won=Sum("win_amount", filter=Q(status="won")),
+    ).order_by()
+    PlayerStats.objects.bulk_create(
+        (
+            PlayerStats(
+                user_id=row["user_id"],
+                active_bets=row["active_bets"],
+                total_bets=row["total_bets"],
+                won_bets=row["won_bets"],
+                total_wagered=row["total_wagered"] or Decimal("0"),
+                total_won=row["total_won"] or Decimal("0"),
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("gambling", "0005_seedchain_serverseed_game_seeds"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="gamblingbet",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("placed", "Placed"),
+                    ("active", "Active"),
+                    ("won", "Won"),
+                    ("lost", "Lost"),
+                    ("cancelled", "Cancelled"),
+                ],
+                default="pending",
+                max_length=20,
+            ),
+        ),
+        migrations.CreateModel(
+            name="PlayerStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("active_bets", models.PositiveIntegerField(default=0)),
+                ("total_bets", models.PositiveIntegerField(default=0)),
+                ("won_bets", models.PositiveIntegerField(default=0)),
+                (
+                    "total_wagered",
+                    models.DecimalField(
+                        decimal_places=8, default=Decimal("0"), max_digits=18
+                    ),
+                ),
+                (
+                    "total_won",
+                    models.DecimalField(
+                        decimal_places=8, default=Decimal("0"), max_digits=18
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="gambling_stats",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(backfill_player_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.17 on 2026-10-18 19:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+import hashlib
+import secrets
+
+
+def commit_open_games(apps, schema_editor):
+    GamblingGame = apps.get_model("gambling", "GamblingGame")
+    GameSeed = apps.get_model("gambling", "GameSeed")
+    games = GamblingGame.objects.filter(
+        status__in=["pending", "active"], server_seed_hash=""
+    )
+    for game in games.iterator():
+        seed = secrets.token_hex(32)
+        GameSeed.objects.create(game=game, seed=seed)
+        GamblingGame.objects.filter(pk=game.pk).update(
+            server_seed_hash=hashlib.sha256(bytes.fromhex(seed)).hexdigest()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gambling", "0006_playerstats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="gamblinggame",
+            name="server_seed_hash",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="gamblingbet",
+            name="client_seed",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.CreateModel(
+            name="GameSeed",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("seed", models.CharField(max_length=64)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "game",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="seed",
+                        to="gambling.gamblinggame",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(commit_open_games, migrations.RunPython.noop),
+    ]
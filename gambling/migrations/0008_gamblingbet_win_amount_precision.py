@@ -0,0 +1,20 @@
+# Generated by Django 4.2.17 on 2026-10-18 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gambling", "0007_gameseed_seed_commitments"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="gamblingbet",
+            name="win_amount",
+            field=models.DecimalField(
+                blank=True, decimal_places=8, max_digits=18, null=True
+            ),
+        ),
+    ]
@@ -1,14 +1,30 @@
 from django.db import models
 from django.conf import settings
-from django.db.models import Sum, Count
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from decimal import Decimal
 from tasks.models import ArbitrationTask
 
 class GamblingGameQuerySet(models.QuerySet):
     def with_stats(self):
+        """Annotate stats from the denormalized GameAggregate row"""
         return self.annotate(
-            total_pool=Sum('bets__amount'),
-            total_bets=Count('bets'),
-            unique_players=Count('bets__user', distinct=True)
+            total_pool=Coalesce(
+                'aggregate__total_pool',
+                Value(Decimal('0')),
+                output_field=models.DecimalField(max_digits=18, decimal_places=8)
+            ),
+            total_bets=Coalesce(
+                'aggregate__total_bets',
+                Value(0),
+                output_field=models.IntegerField()
+            ),
+            unique_players=Coalesce(
+                'aggregate__unique_players',
+                Value(0),
+                output_field=models.IntegerField()
+            )
         )
 
 class GamblingGame(models.Model):
@@ -51,6 +67,20 @@ class GamblingGame(models.Model):
     start_time = models.DateTimeField(null=True, blank=True)
     end_time = models.DateTimeField(null=True, blank=True)
     result = models.JSONField(null=True, blank=True)
+    # Provably fair draw: the hash committed at creation, then the revealed
+    # server seed and the client seed combined from the bets. Games settled
+    # before commitments record their place in a seed chain instead.
+    server_seed_hash = models.CharField(max_length=64, blank=True)
+    seed_chain = models.ForeignKey(
+        'SeedChain',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='games'
+    )
+    seed_index = models.PositiveIntegerField(null=True, blank=True)
+    server_seed = models.CharField(max_length=64, blank=True)
+    client_seed = models.CharField(max_length=64, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     objects = GamblingGameQuerySet.as_manager()
@@ -61,6 +91,7 @@ class GamblingGame(models.Model):
 class GamblingBet(models.Model):
     STATUS_CHOICES = (
         ('pending', 'Pending'),
+        ('placed', 'Placed'),
         ('active', 'Active'),
         ('won', 'Won'),
         ('lost', 'Lost'),
@@ -85,9 +116,10 @@ class GamblingBet(models.Model):
         choices=STATUS_CHOICES,
         default='pending'
     )
+    # Payouts are settled to 8 places, like balances and aggregates
     win_amount = models.DecimalField(
-        max_digits=10,
-        decimal_places=2,
+        max_digits=18,
+        decimal_places=8,
         null=True,
         blank=True
     )
@@ -97,12 +129,139 @@ class GamblingBet(models.Model):
         null=True,
         blank=True
     )
+    # Chosen by the player, or random; mixed into the game's client seed
+    client_seed = models.CharField(max_length=64, blank=True)
     placed_at = models.DateTimeField(auto_now_add=True)
     result_time = models.DateTimeField(null=True, blank=True)
 
     def __str__(self):
         return f"{self.user.username}'s bet on {self.game.title}"
 
+class GameAggregate(models.Model):
+    """Running per-game totals maintained on bet placement and settlement"""
+    game = models.OneToOneField(
+        GamblingGame,
+        on_delete=models.CASCADE,
+        related_name='aggregate'
+    )
+    total_pool = models.DecimalField(
+        max_digits=18,
+        decimal_places=8,
+        default=Decimal('0')
+    )
+    total_bets = models.PositiveIntegerField(default=0)
+    unique_players = models.PositiveIntegerField(default=0)
+    fee_collected = models.DecimalField(
+        max_digits=18,
+        decimal_places=8,
+        default=Decimal('0')
+    )
+    total_paid_out = models.DecimalField(
+        max_digits=18,
+        decimal_places=8,
+        default=Decimal('0')
+    )
+    # {option_key: {'amount': '12.50', 'bets': 3}}
+    option_totals = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Aggregate for {self.game}"
+
+class PlayerStats(models.Model):
+    """Running per-user betting counters maintained on bet placement and settlement"""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='gambling_stats'
+    )
+    # Bets placed and not yet settled or refunded
+    active_bets = models.PositiveIntegerField(default=0)
+    total_bets = models.PositiveIntegerField(default=0)
+    won_bets = models.PositiveIntegerField(default=0)
+    total_wagered = models.DecimalField(
+        max_digits=18,
+        decimal_places=8,
+        default=Decimal('0')
+    )
+    total_won = models.DecimalField(
+        max_digits=18,
+        decimal_places=8,
+        default=Decimal('0')
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Gambling stats for {self.user_id}"
+
+class EmailOutbox(models.Model):
+    """Queued notification emails, delivered in batches by a Celery worker"""
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed')
+    )
+
+    kind = models.CharField(max_length=30)
+    game = models.ForeignKey(
+        GamblingGame,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='outbox_emails'
+    )
+    recipient = models.EmailField()
+    # Per-recipient template variables
+    context = models.JSONField(default=dict, blank=True)
+    dedupe_key = models.CharField(max_length=255, unique=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'])
+        ]
+
+    def __str__(self):
+        return f"{self.kind} to {self.recipient} ({self.status})"
+
+class SeedChain(models.Model):
+    """A server-seed hash chain used by games settled before per-game commitments"""
+    terminal_hash = models.CharField(max_length=64, unique=True)
+    length = models.PositiveIntegerField()
+    next_index = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Seed chain {self.terminal_hash[:12]} ({self.next_index - 1}/{self.length} used)"
+
+class GameSeed(models.Model):
+    """Secret server seed of a game, kept off the game row until it is revealed"""
+    game = models.OneToOneField(
+        GamblingGame,
+        on_delete=models.CASCADE,
+        related_name='seed'
+    )
+    seed = models.CharField(max_length=64)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+class ServerSeed(models.Model):
+    """Secret seed ``index`` of a chain; ``sha256(seed[i]) == seed[i - 1]``"""
+    chain = models.ForeignKey(
+        SeedChain,
+        on_delete=models.CASCADE,
+        related_name='seeds'
+    )
+    index = models.PositiveIntegerField()
+    seed = models.CharField(max_length=64)
+
+    class Meta:
+        unique_together = ('chain', 'index')
+
 class GamblingTransaction(models.Model):
     TRANSACTION_TYPES = (
         ('bet', 'Bet Placed'),
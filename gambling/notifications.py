@@ -5,6 +5,7 @@ from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 import json
 from django.urls import reverse
+from .outbox import NotificationOutbox
 import logging
 
 logger = logging.getLogger(__name__)
@@ -35,33 +36,9 @@ class GamblingNotifier:
     def notify_game_ending_soon(game):
         """Notify users about game ending soon"""
         try:
-            # Email notifications
-            bet_users = game.gamblingbet_set.values_list(
-                'user__email', flat=True
-            ).distinct()
-            
-            for email in bet_users:
-                context = {
-                    'game': game,
-                    'game_url': settings.SITE_URL + reverse(
-                        'gambling:game_detail',
-                        args=[game.id]
-                    )
-                }
-                
-                html_message = render_to_string(
-                    'gambling/email/game_ending_soon.html',
-                    context
-                )
-                
-                send_mail(
-                    subject=f"Game Ending Soon: {game.title}",
-                    message="",
-                    html_message=html_message,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[email],
-                    fail_silently=True
-                )
+            # Email notifications are queued and sent in batches by
+            # the outbox worker
+            NotificationOutbox.enqueue_game('game_ending_soon', game)
             
             # WebSocket notification
             channel_layer = get_channel_layer()
@@ -83,33 +60,9 @@ class GamblingNotifier:
     def notify_game_completed(game):
         """Notify about game completion"""
         try:
-            # Email notifications
-            bet_users = game.gamblingbet_set.values_list(
-                'user__email', flat=True
-            ).distinct()
-            
-            for email in bet_users:
-                context = {
-                    'game': game,
-                    'game_url': settings.SITE_URL + reverse(
-                        'gambling:game_detail',
-                        args=[game.id]
-                    )
-                }
-                
-                html_message = render_to_string(
-                    'gambling/email/game_completed.html',
-                    context
-                )
-                
-                send_mail(
-                    subject=f"Game Completed: {game.title}",
-                    message="",
-                    html_message=html_message,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[email],
-                    fail_silently=True
-                )
+            # Email notifications are queued and sent in batches by
+            # the outbox worker
+            NotificationOutbox.enqueue_game('game_completed', game)
             
             # WebSocket notification
             channel_layer = get_channel_layer()
@@ -152,20 +105,6 @@ class GamblingNotifier:
                 recipient_list=[bet.user.email],
                 fail_silently=True
             )
-            
-            # WebSocket notification
-            channel_layer = get_channel_layer()
-            async_to_sync(channel_layer.group_send)(
-                f"game_{bet.game.id}",
-                {
-                    "type": "bet_placed",
-                    "game_id": bet.game.id,
-                    "data": {
-                        "amount": str(bet.amount),
-                        "total_pool": str(bet.game.total_pool)
-                    }
-                }
-            )
         except Exception as e:
             logger.error(f"Error sending bet placement notification: {e}")
     
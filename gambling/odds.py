@@ -0,0 +1,139 @@
+from django.core.cache import cache
+from django.db import transaction
+from channels.layers import get_channel_layer
+from asgiref.sync import async_to_sync
+from .models import GamblingGame
+from .pools import PoolIndex
+from .settlement import SettlementEngine
+from .settings import GAMBLING_CACHE_PREFIX, GAMBLING_ODDS_INTERVAL_MS
+from .utils import calculate_win_multiplier
+from decimal import Decimal
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+class OddsStream:
+    """Throttled live odds for games watched over ``GamblingConsumer``.
+
+    Bets only mark a game as changed. The first change in an interval
+    queues one publish, which sends a full snapshot to the ``game_<id>``
+    group at most every ``GAMBLING_ODDS_INTERVAL_MS``. Each consumer then
+    delta-encodes the snapshot against the last one it sent its client.
+    """
+
+    @staticmethod
+    def pending_key(game_id):
+        return f'{GAMBLING_CACHE_PREFIX}:odds_pending:{game_id}'
+
+    @staticmethod
+    def seq_key(game_id):
+        return f'{GAMBLING_CACHE_PREFIX}:odds_seq:{game_id}'
+
+    @staticmethod
+    def touch(game_id):
+        """Record that a game's pools changed; publishes after commit"""
+        transaction.on_commit(lambda: OddsStream.enqueue(game_id))
+
+    @staticmethod
+    def enqueue(game_id):
+        """Queue a throttled snapshot unless one is already pending"""
+        from .tasks import publish_odds_snapshot
+
+        interval = GAMBLING_ODDS_INTERVAL_MS / 1000
+        key = OddsStream.pending_key(game_id)
+        if not cache.add(key, 1, timeout=int(interval) + 30):
+            return
+
+        try:
+            publish_odds_snapshot.apply_async(args=[game_id], countdown=interval)
+        except Exception as e:
+            cache.delete(key)
+            logger.error(f"Error queueing odds snapshot for game {game_id}: {e}")
+
+    @staticmethod
+    def next_seq(game_id):
+        key = OddsStream.seq_key(game_id)
+        if cache.add(key, 1, timeout=None):
+            return 1
+        return cache.incr(key)
+
+    @staticmethod
+    def get_odds(game):
+        """Payout multipliers settlement would apply to each backed option
+
+        Pool games pay out the shared pool; every other game pays its fixed
+        multiplier however the money is spread.
+        """
+        if SettlementEngine.is_pool(game):
+            return PoolIndex.get_odds(game)
+        return {
+            key: calculate_win_multiplier(game.game_type, json.loads(key)).quantize(
+                Decimal('0.0001')
+            )
+            for key, amount in PoolIndex.get_pools(game).items()
+            if amount > 0
+        }
+
+    @staticmethod
+    def build_snapshot(game, seq=None):
+        """Return a flat ``{field: value}`` snapshot of a game's pools"""
+        aggregate = PoolIndex.get_aggregate(game)
+        snapshot = {
+            'total_pool': str(aggregate.total_pool),
+            'total_bets': aggregate.total_bets
+        }
+        for key, amount in PoolIndex.get_pools(game).items():
+            snapshot[f'pool:{key}'] = str(amount)
+        for key, multiplier in OddsStream.get_odds(game).items():
+            snapshot[f'odds:{key}'] = str(multiplier)
+
+        return {
+            'seq': seq if seq is not None else cache.get(OddsStream.seq_key(game.id), 0),
+            'values': snapshot
+        }
+
+    @staticmethod
+    def publish(game_id):
+        """Send the current snapshot of a game to everyone watching it"""
+        cache.delete(OddsStream.pending_key(game_id))
+
+        game = GamblingGame.objects.select_related('aggregate').filter(
+            pk=game_id
+        ).first()
+        if game is None:
+            return
+
+        snapshot = OddsStream.build_snapshot(game, seq=OddsStream.next_seq(game_id))
+        channel_layer = get_channel_layer()
+        async_to_sync(channel_layer.group_send)(
+            f"game_{game_id}",
+            {
+                "type": "odds_snapshot",
+                "game_id": game_id,
+                "snapshot": snapshot
+            }
+        )
+
+    @staticmethod
+    def diff(previous, current):
+        """Delta-encode ``current`` against ``previous``; None if unchanged"""
+        old_values = previous['values']
+        new_values = current['values']
+
+        changed = {
+            field: value
+            for field, value in new_values.items()
+            if old_values.get(field) != value
+        }
+        removed = [field for field in old_values if field not in new_values]
+
+        if not changed and not removed:
+            return None
+
+        return {
+            'seq': current['seq'],
+            'base_seq': previous['seq'],
+            'changed': changed,
+            'removed': removed
+        }
@@ -0,0 +1,201 @@
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+from .models import EmailOutbox
+from .settings import (
+    GAMBLING_EMAIL_BATCH_SIZE,
+    GAMBLING_EMAIL_MAX_ATTEMPTS,
+    GAMBLING_EMAIL_RETRY_DELAY
+)
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+class NotificationOutbox:
+    """Queue-table delivery for game notification emails.
+
+    Callers only insert ``EmailOutbox`` rows, one per recipient, keyed by a
+    dedupe key so the same event is never mailed twice. A Celery worker
+    claims due rows in batches, renders each template once per game and
+    distinct set of per-recipient variables, and sends the whole batch over
+    a single SMTP connection. Failed rows are retried with backoff.
+    """
+
+    # kind: (template, subject)
+    MESSAGES = {
+        'game_ending_soon': (
+            'gambling/email/game_ending_soon.html',
+            'Game Ending Soon: {title}'
+        ),
+        'game_completed': (
+            'gambling/email/game_completed.html',
+            'Game Completed: {title}'
+        )
+    }
+
+    # Claimed rows are hidden from other workers for this long
+    CLAIM_TIMEOUT = 300
+
+    @staticmethod
+    def dedupe_key(kind, game_id, recipient):
+        return f'{kind}:{game_id}:{recipient}'
+
+    @staticmethod
+    def enqueue_game(kind, game):
+        """Queue ``kind`` for every distinct bettor on ``game``"""
+        recipients = game.bets.exclude(
+            user__email=''
+        ).values_list('user__email', flat=True).distinct()
+
+        emails = [
+            EmailOutbox(
+                kind=kind,
+                game=game,
+                recipient=email,
+                dedupe_key=NotificationOutbox.dedupe_key(kind, game.id, email)
+            )
+            for email in recipients
+        ]
+        EmailOutbox.objects.bulk_create(emails, ignore_conflicts=True)
+
+        if emails:
+            NotificationOutbox.schedule_delivery()
+        return len(emails)
+
+    @staticmethod
+    def schedule_delivery():
+        transaction.on_commit(NotificationOutbox.kick_delivery)
+
+    @staticmethod
+    def kick_delivery():
+        """Start a delivery run now; the deliver-outbox beat is the backstop"""
+        from .tasks import deliver_outbox
+
+        try:
+            deliver_outbox.delay()
+        except Exception as e:
+            logger.error(f"Error queueing outbox delivery: {e}")
+
+    @staticmethod
+    @transaction.atomic
+    def claim(batch_size=None):
+        """Lease a batch of due rows so no other worker sends them"""
+        batch_size = batch_size or GAMBLING_EMAIL_BATCH_SIZE
+        now = timezone.now()
+
+        emails = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True).filter(
+                status='pending',
+                next_attempt_at__lte=now
+            ).select_related('game').order_by('id')[:batch_size]
+        )
+        if emails:
+            EmailOutbox.objects.filter(pk__in=[e.pk for e in emails]).update(
+                next_attempt_at=now + timezone.timedelta(
+                    seconds=NotificationOutbox.CLAIM_TIMEOUT
+                )
+            )
+        return emails
+
+    @staticmethod
+    def render(email, rendered):
+        """Return ``(subject, html)``, rendering each variant only once"""
+        variant = (
+            email.kind,
+            email.game_id,
+            json.dumps(email.context, sort_keys=True)
+        )
+        if variant not in rendered:
+            template, subject = NotificationOutbox.MESSAGES[email.kind]
+            context = {
+                'game': email.game,
+                'game_url': settings.SITE_URL + reverse(
+                    'gambling:place_bet',
+                    args=[email.game_id]
+                ),
+                **email.context
+            }
+            rendered[variant] = (
+                subject.format(title=email.game.title),
+                render_to_string(template, context)
+            )
+        return rendered[variant]
+
+    @staticmethod
+    def deliver(batch_size=None, connection=None):
+        """Send one batch of due emails; returns delivery counts"""
+        emails = NotificationOutbox.claim(batch_size)
+        if not emails:
+            return {'claimed': 0, 'sent': 0, 'failed': 0}
+
+        rendered = {}
+        sent = []
+        failed = []
+        connection = connection or get_connection(fail_silently=False)
+
+        try:
+            connection.open()
+        except Exception as e:
+            logger.error(f"Error opening mail connection: {e}")
+            NotificationOutbox._record_failures(emails, e)
+            return {'claimed': len(emails), 'sent': 0, 'failed': len(emails)}
+
+        try:
+            for email in emails:
+                try:
+                    subject, html_message = NotificationOutbox.render(email, rendered)
+                    message = EmailMultiAlternatives(
+                        subject=subject,
+                        body='',
+                        from_email=settings.DEFAULT_FROM_EMAIL,
+                        to=[email.recipient],
+                        connection=connection
+                    )
+                    message.attach_alternative(html_message, 'text/html')
+                    connection.send_messages([message])
+                    sent.append(email.pk)
+                except Exception as e:
+                    logger.error(f"Error sending outbox email {email.pk}: {e}")
+                    failed.append((email, e))
+        finally:
+            connection.close()
+
+        if sent:
+            EmailOutbox.objects.filter(pk__in=sent).update(
+                status='sent',
+                sent_at=timezone.now(),
+                last_error=''
+            )
+        for email, error in failed:
+            NotificationOutbox._record_failures([email], error)
+
+        logger.info(
+            f"Delivered outbox batch: {len(sent)} sent, {len(failed)} failed, "
+            f"{len(rendered)} templates rendered"
+        )
+        return {'claimed': len(emails), 'sent': len(sent), 'failed': len(failed)}
+
+    @staticmethod
+    def _record_failures(emails, error):
+        """Back off failed rows, giving up after the maximum attempts"""
+        now = timezone.now()
+        for email in emails:
+            attempts = email.attempts + 1
+            if attempts >= GAMBLING_EMAIL_MAX_ATTEMPTS:
+                status = 'failed'
+                next_attempt_at = now
+            else:
+                status = 'pending'
+                next_attempt_at = now + timezone.timedelta(
+                    seconds=GAMBLING_EMAIL_RETRY_DELAY * 2 ** email.attempts
+                )
+            EmailOutbox.objects.filter(pk=email.pk).update(
+                status=status,
+                attempts=attempts,
+                last_error=str(error)[:1000],
+                next_attempt_at=next_attempt_at
+            )
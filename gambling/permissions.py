@@ -1,7 +1,7 @@
 from rest_framework import permissions
-from django.utils import timezone
 from .models import GamblingBet
 from .exceptions import RateLimitExceededError
+from .ratelimit import BetRateLimiter
 
 class CanPlaceBets(permissions.BasePermission):
     """Permission to check if user can place bets"""
@@ -30,27 +30,7 @@ class CanPlaceBets(permissions.BasePermission):
         return True
     
     def _check_rate_limits(self, user):
-        # Check bets per minute
-        recent_bets = GamblingBet.objects.filter(
-            user=user,
-            placed_at__gte=timezone.now() - timezone.timedelta(minutes=1)
-        ).count()
-        
-        if recent_bets >= 5:
-            raise RateLimitExceededError(
-                "You are placing bets too frequently. Please wait."
-            )
-        
-        # Check daily bet limit
-        daily_bets = GamblingBet.objects.filter(
-            user=user,
-            placed_at__date=timezone.now().date()
-        ).count()
-        
-        if daily_bets >= 100:
-            raise RateLimitExceededError(
-                "You have reached your daily betting limit."
-            )
+        BetRateLimiter.check(user)
 
 class IsGameActive(permissions.BasePermission):
     """Permission to check if game is active"""
@@ -0,0 +1,60 @@
+from decimal import Decimal
+from .models import GameAggregate
+from .utils import get_bet_option_key
+
+class PoolIndex:
+    """Per-option pool totals for pari-mutuel games.
+
+    Reads the ``option_totals`` hash that ``GameAggregateService`` keeps up
+    to date on every bet, so pool sizes, payout multipliers and live odds
+    come from a single row instead of a scan of the bets table.
+    """
+
+    @staticmethod
+    def get_aggregate(game):
+        try:
+            return game.aggregate
+        except GameAggregate.DoesNotExist:
+            return GameAggregate(game=game)
+
+    @staticmethod
+    def get_pools(game):
+        """Return ``{option_key: total amount}`` for a game"""
+        aggregate = PoolIndex.get_aggregate(game)
+        return {
+            key: Decimal(option['amount'])
+            for key, option in aggregate.option_totals.items()
+        }
+
+    @staticmethod
+    def get_option_total(game, option):
+        """Total staked on ``option`` (bet data dict or option key)"""
+        key = option if isinstance(option, str) else get_bet_option_key(option)
+        return PoolIndex.get_pools(game).get(key, Decimal('0'))
+
+    @staticmethod
+    def get_prize_pool(game, deduct_fee=True):
+        """Total pool, net of the game fee unless ``deduct_fee`` is False"""
+        total_pool = PoolIndex.get_aggregate(game).total_pool
+        if not deduct_fee:
+            return total_pool
+        return total_pool - total_pool * (game.fee_percentage / 100)
+
+    @staticmethod
+    def get_payout_multiplier(game, option, deduct_fee=True):
+        """Payout per unit staked if ``option`` wins, or 0 if nobody backed it"""
+        option_total = PoolIndex.get_option_total(game, option)
+        if option_total <= 0:
+            return Decimal('0')
+        return PoolIndex.get_prize_pool(game, deduct_fee) / option_total
+
+    @staticmethod
+    def get_odds(game):
+        """Return live ``{option_key: payout multiplier}`` for every option"""
+        pools = PoolIndex.get_pools(game)
+        prize_pool = PoolIndex.get_prize_pool(game)
+        return {
+            key: (prize_pool / amount).quantize(Decimal('0.0001'))
+            for key, amount in pools.items()
+            if amount > 0
+        }
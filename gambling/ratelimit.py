@@ -0,0 +1,125 @@
+from django.core.cache import cache
+from django.db import transaction
+from decimal import Decimal
+import time
+from juryim.cache import require_shared_cache
+from .exceptions import RateLimitExceededError
+from .settings import (
+    GAMBLING_CACHE_PREFIX,
+    GAMBLING_MAX_BETS_PER_MINUTE,
+    GAMBLING_MAX_DAILY_BETS,
+    GAMBLING_MAX_DAILY_AMOUNT
+)
+
+# Amounts are counted in integer units so they can use cache.incr
+AMOUNT_UNITS = Decimal('100000000')
+
+class SlidingWindowCounter:
+    """Approximate sliding-window counter stored in the Django cache.
+
+    Counts go into fixed windows keyed by ``int(now // window)``. The
+    estimate for the sliding window ending now is the current window plus
+    the previous window weighted by how much of it still overlaps.
+    """
+
+    def __init__(self, name, window):
+        self.name = name
+        self.window = window
+
+    def keys(self, user_id, now):
+        index = int(now // self.window)
+        prefix = f'{GAMBLING_CACHE_PREFIX}:ratelimit:{self.name}:{user_id}'
+        return f'{prefix}:{index}', f'{prefix}:{index - 1}'
+
+    def estimate(self, values, user_id, now):
+        """Estimate the windowed total from a ``get_many`` result"""
+        current_key, previous_key = self.keys(user_id, now)
+        elapsed = (now % self.window) / self.window
+        current = values.get(current_key, 0)
+        previous = values.get(previous_key, 0)
+        return current + previous * (1 - elapsed)
+
+    def add(self, user_id, value, now):
+        current_key, _ = self.keys(user_id, now)
+        timeout = self.window * 2
+        if cache.add(current_key, value, timeout=timeout):
+            return
+        try:
+            cache.incr(current_key, value)
+        except ValueError:
+            # Key expired between add() and incr()
+            cache.set(current_key, value, timeout=timeout)
+
+class BetRateLimiter:
+    """Shared bet rate limiting for the middleware, decorators and API.
+
+    Checking limits is one ``get_many`` round-trip to the cache and never
+    touches the database. Bets are counted once they are committed. The
+    counters must live in a cache every process shares, otherwise each
+    worker would enforce its own copy of the limits.
+    """
+
+    bets_per_minute = SlidingWindowCounter('bets_minute', 60)
+    bets_per_day = SlidingWindowCounter('bets_day', 86400)
+    amount_per_day = SlidingWindowCounter('amount_day', 86400)
+
+    @classmethod
+    def counters(cls):
+        return (cls.bets_per_minute, cls.bets_per_day, cls.amount_per_day)
+
+    @classmethod
+    def get_usage(cls, user_id, now=None):
+        """Return the current windowed usage for a user"""
+        require_shared_cache('Bet rate limits')
+        now = now if now is not None else time.time()
+        keys = []
+        for counter in cls.counters():
+            keys.extend(counter.keys(user_id, now))
+        values = cache.get_many(keys)
+
+        return {
+            'bets_per_minute': cls.bets_per_minute.estimate(values, user_id, now),
+            'bets_per_day': cls.bets_per_day.estimate(values, user_id, now),
+            'amount_per_day': (
+                Decimal(cls.amount_per_day.estimate(values, user_id, now))
+                / AMOUNT_UNITS
+            )
+        }
+
+    @classmethod
+    def check(cls, user, amount=None):
+        """Raise RateLimitExceededError if the user may not bet right now"""
+        usage = cls.get_usage(user.id)
+
+        if usage['bets_per_minute'] >= GAMBLING_MAX_BETS_PER_MINUTE:
+            raise RateLimitExceededError(
+                "You are placing bets too frequently. Please wait."
+            )
+
+        if usage['bets_per_day'] >= GAMBLING_MAX_DAILY_BETS:
+            raise RateLimitExceededError(
+                "You have reached your daily betting limit."
+            )
+
+        daily_limit = getattr(user, 'daily_betting_limit', None) or GAMBLING_MAX_DAILY_AMOUNT
+        if daily_limit is not None:
+            spent = usage['amount_per_day'] + (amount or 0)
+            over = spent > daily_limit if amount else spent >= daily_limit
+            if over:
+                raise RateLimitExceededError("Daily betting limit reached.")
+
+        return usage
+
+    @classmethod
+    def record(cls, user_id, amount, now=None):
+        """Count a placed bet against the user's limits"""
+        require_shared_cache('Bet rate limits')
+        now = now if now is not None else time.time()
+        cls.bets_per_minute.add(user_id, 1, now)
+        cls.bets_per_day.add(user_id, 1, now)
+        cls.amount_per_day.add(user_id, int(Decimal(amount) * AMOUNT_UNITS), now)
+
+    @classmethod
+    def record_on_commit(cls, user_id, amount):
+        """Count a bet once the surrounding transaction commits"""
+        transaction.on_commit(lambda: cls.record(user_id, amount))
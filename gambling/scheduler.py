@@ -0,0 +1,87 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from .models import GamblingGame
+from .settings import GAMBLING_CACHE_PREFIX, GAMBLING_SCHEDULER_HORIZON
+import logging
+
+logger = logging.getLogger(__name__)
+
+class GameScheduler:
+    """Fires settlement once per game at its ``end_time``.
+
+    Every active game gets a ``settle_game`` task queued with
+    ``eta=end_time``, so the broker holds the timers in end-time order.
+    ``dispatch_due`` re-arms anything ending within the horizon, covering
+    timers lost with a broker restart and games whose end time moved.
+    ``settle`` goes through ``SettlementCoordinator``, so duplicate timers
+    settle a game only once.
+    """
+
+    @staticmethod
+    def timer_key(game_id):
+        return f'{GAMBLING_CACHE_PREFIX}:settle_timer:{game_id}'
+
+    @staticmethod
+    def schedule(game):
+        """Arm the settlement timer for ``game`` once the save commits"""
+        game_id = game.id
+        end_time = game.end_time
+        transaction.on_commit(lambda: GameScheduler.enqueue(game_id, end_time))
+
+    @staticmethod
+    def enqueue(game_id, end_time):
+        """Queue ``settle_game`` for ``end_time`` unless already armed for it"""
+        from .tasks import settle_game
+
+        key = GameScheduler.timer_key(game_id)
+        marker = end_time.isoformat()
+        if cache.get(key) == marker:
+            return False
+
+        remaining = (end_time - timezone.now()).total_seconds()
+        cache.set(key, marker, timeout=max(int(remaining), 0) + GAMBLING_SCHEDULER_HORIZON)
+        try:
+            settle_game.apply_async(args=[game_id], eta=end_time)
+        except Exception as e:
+            # dispatch_due re-arms the timer once the broker is back
+            cache.delete(key)
+            logger.error(f"Error scheduling settlement for game {game_id}: {e}")
+            return False
+        return True
+
+    @staticmethod
+    def dispatch_due(horizon=None):
+        """Arm timers for every active game ending within ``horizon`` seconds"""
+        horizon = horizon or GAMBLING_SCHEDULER_HORIZON
+        games = GamblingGame.objects.filter(
+            status='active',
+            end_time__lte=timezone.now() + timezone.timedelta(seconds=horizon)
+        ).values_list('id', 'end_time')
+
+        armed = 0
+        for game_id, end_time in games:
+            if GameScheduler.enqueue(game_id, end_time):
+                armed += 1
+        return armed
+
+    @staticmethod
+    def settle(game_id):
+        """Complete ``game_id`` if it is due; returns True if this call settled it"""
+        from .coordinator import SettlementCoordinator
+
+        game = GamblingGame.objects.filter(pk=game_id).first()
+        if game is None or game.status != 'active':
+            return False
+
+        if game.end_time > timezone.now():
+            # End time was pushed back after the timer was armed
+            GameScheduler.enqueue(game.id, game.end_time)
+            return False
+
+        if not SettlementCoordinator.settle_due_game(game.id):
+            logger.info(f"Game {game_id} was already claimed")
+            return False
+
+        logger.info(f"Settled game {game_id} on schedule")
+        return True
@@ -1,12 +1,10 @@
 from decimal import Decimal
 from django.utils import timezone
-from django.db.models import Sum
 from django.core.mail import send_mass_mail
 from .models import GamblingGame, GamblingBet, GamblingTransaction
 from tasks.models import ArbitrationTask
 from tasks.services import TaskService
 from django.db import transaction
-import random
 from financial.services import SecurityService
 from django.core.cache import cache
 from .utils import (
@@ -14,12 +12,20 @@ from .utils import (
     check_bet_result,
     calculate_win_multiplier
 )
+from .fairness import FairnessEngine
 from .exceptions import (
     GameClosedError,
+    InvalidBetError,
     InvalidGameStateError,
     TransactionError
 )
 from .notifications import GamblingNotifier
+from .coordinator import SettlementCoordinator
+from .ratelimit import BetRateLimiter
+from .aggregates import GameAggregateService, PlayerStatsService
+from .pools import PoolIndex
+from .odds import OddsStream
+from .cache import GameCache, invalidate_user_active_bets
 import logging
 
 logger = logging.getLogger(__name__)
@@ -43,9 +49,7 @@ class GamblingService:
     @staticmethod
     def calculate_required_arbitrators(game):
         """Calculate required arbitrators based on total bet amount"""
-        total_bets = GamblingBet.objects.filter(game=game).aggregate(
-            total=Sum('amount')
-        )['total'] or 0
+        total_bets = PoolIndex.get_prize_pool(game, deduct_fee=False)
         
         if total_bets < 1000:
             return 3
@@ -55,33 +59,17 @@ class GamblingService:
             return 7
 
     @staticmethod
-    def process_game_result(game, result):
-        """Process game result and distribute winnings"""
+    def process_pool_result(game, result):
+        """Process a pari-mutuel game result and distribute winnings"""
         if result == 'uncertain':
             return GamblingService.process_uncertain_result(game)
-            
-        winning_bets = GamblingBet.objects.filter(
-            game=game,
-            bet_option=result
-        )
-        
-        total_bets = GamblingBet.objects.filter(game=game).aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-        
-        fee_amount = total_bets * (game.fee_percentage / 100)
-        prize_pool = total_bets - fee_amount
-        
-        winning_amount = winning_bets.aggregate(
-            total=Sum('amount')
-        )['total'] or 0
         
-        if winning_amount > 0:
-            for bet in winning_bets:
-                payout = (bet.amount / winning_amount) * prize_pool
-                bet.is_winner = True
-                bet.payout_amount = payout
-                bet.save()
+        # The coordinator claims the game and settles it pro rata from the
+        # per-option pool index
+        completed = SettlementCoordinator.complete(game, result)
+        game.result = completed.result
+        game.status = completed.status
+        return game
 
     @staticmethod
     def process_uncertain_result(game):
@@ -93,29 +81,49 @@ class GamblingService:
             refund_amount = bet.amount * (1 - fee_percentage)
             bet.payout_amount = refund_amount
             bet.save()
+        GameCache.invalidate_on_commit(game.id)
 
     @staticmethod
     @transaction.atomic
-    def place_bet(game, user, amount, bet_data):
-        """Place a bet on a game"""
+    def place_bet(game, user, amount, bet_data, client_seed=None):
+        """Place a bet on a game
+
+        ``client_seed`` is mixed into the game's result; a random one is
+        used when the player does not choose one.
+        """
         if game.status != 'active':
             raise GameClosedError("Game is not active")
             
         if game.end_time <= timezone.now():
             raise GameClosedError("Game has ended")
         
+        if client_seed and len(client_seed) > 64:
+            raise InvalidBetError("Client seed must be at most 64 characters")
+        
         # Create bet
         bet = GamblingBet.objects.create(
             game=game,
             user=user,
             amount=amount,
             bet_data=bet_data,
-            fee_amount=GamblingService.calculate_fee(amount, game.fee_percentage)
+            fee_amount=GamblingService.calculate_fee(amount, game.fee_percentage),
+            client_seed=client_seed or FairnessEngine.new_client_seed(),
+            status='placed'
         )
         
-        # Update game pool
-        game.total_pool += amount
-        game.save(update_fields=['total_pool'])
+        # Update game aggregate counters
+        aggregate = GameAggregateService.record_bet(bet)
+        game.total_pool = aggregate.total_pool
+        PlayerStatsService.record_bet(bet)
+        GameCache.invalidate_on_commit(game.id)
+        
+        # Watchers get a throttled odds snapshot once the bet commits,
+        # whether or not the email below goes out
+        OddsStream.touch(game.id)
+        
+        # Count the bet against the user's rate limits once committed
+        BetRateLimiter.record_on_commit(user.id, amount)
+        transaction.on_commit(lambda: invalidate_user_active_bets([user.id]))
         
         # Send notification
         try:
@@ -126,32 +134,17 @@ class GamblingService:
         return bet
 
     @staticmethod
-    @transaction.atomic
     def complete_game(game):
         """Complete a game and process results"""
         if game.status != 'active':
-            raise InvalidGameStateError("Game is not active")
-        
-        # Generate result
-        result = generate_game_result(game.game_type)
-        game.result = result
-        game.status = 'completed'
-        game.save()
-        
-        # Process bets
-        bets = game.gamblingbet_set.filter(status='placed')
-        for bet in bets:
-            try:
-                GamblingService.process_bet_result(bet, result)
-            except Exception as e:
-                logger.error(f"Error processing bet {bet.id}: {e}")
-        
-        # Send notifications
-        try:
-            GamblingNotifier.notify_game_completed(game)
-        except Exception as e:
-            logger.error(f"Error sending game completion notification: {e}")
+            raise InvalidGameStateError(game.status, 'completed', game.pk)
         
+        # The coordinator claims the game row, so concurrent callers can
+        # never settle the same game twice
+        completed = SettlementCoordinator.complete(game)
+        game.result = completed.result
+        game.status = completed.status
+        GameCache.invalidate_on_commit(game.id)
         return game
 
     @staticmethod
@@ -159,7 +152,12 @@ class GamblingService:
     def process_bet_result(bet, game_result):
         """Process the result of a bet"""
         if bet.status != 'placed':
-            raise InvalidGameStateError("Bet has already been processed")
+            raise InvalidGameStateError(
+                bet.status,
+                'settled',
+                bet.game_id,
+                "Bet has already been processed"
+            )
         
         # Check if bet wins
         is_winner = check_bet_result(
@@ -198,32 +196,31 @@ class GamblingService:
     def cancel_game(game):
         """Cancel a game and refund bets"""
         if game.status not in ['pending', 'active']:
-            raise InvalidGameStateError("Game cannot be cancelled")
+            raise InvalidGameStateError(game.status, 'cancelled', game.pk)
         
         game.status = 'cancelled'
         game.save()
         
         # Refund bets
-        bets = game.gamblingbet_set.filter(status='placed')
+        bets = game.bets.filter(status='placed')
+        refunded_users = set()
         for bet in bets:
             try:
                 bet.status = 'refunded'
                 bet.save()
+                PlayerStatsService.record_refund(bet)
+                refunded_users.add(bet.user_id)
             except Exception as e:
                 logger.error(f"Error refunding bet {bet.id}: {e}")
+        transaction.on_commit(lambda: invalidate_user_active_bets(refunded_users))
         
+        GameCache.invalidate_on_commit(game.id)
         return game
 
     @staticmethod
     def generate_game_result(game):
-        """Generate random result based on game type"""
-        if game.game_type == 'dice':
-            return {'number': random.randint(1, 6)}
-        elif game.game_type == 'coin':
-            return {'side': random.choice(['heads', 'tails'])}
-        elif game.game_type == 'roulette':
-            return {'number': random.randint(0, 36)}
-        return None
+        """Reveal the game's committed seed and return its provably fair result"""
+        return FairnessEngine.draw(game)
 
     @staticmethod
     @transaction.atomic
@@ -262,7 +259,12 @@ class GamblingService:
         if game.status != 'active':
             return False
         
-        game.result = result
-        game.status = 'completed'
-        game.save()
+        # Claimed and settled like every other completion, so the bets are
+        # paid exactly once even if the game is completed concurrently
+        try:
+            completed = SettlementCoordinator.complete(game, result)
+        except InvalidGameStateError:
+            return False
+        game.result = completed.result
+        game.status = completed.status
         return True 
\ No newline at end of file
@@ -60,6 +60,19 @@ GAMBLING_MAX_BETS_PER_MINUTE = getattr(
     5
 )
 
+GAMBLING_MAX_DAILY_AMOUNT = getattr(
+    settings,
+    'GAMBLING_MAX_DAILY_AMOUNT',
+    None  # no amount limit unless configured
+)
+
+# How far ahead the scheduler sweep arms settlement timers
+GAMBLING_SCHEDULER_HORIZON = getattr(
+    settings,
+    'GAMBLING_SCHEDULER_HORIZON',
+    300  # seconds
+)
+
 # WebSocket Settings
 GAMBLING_WS_GROUP_PREFIX = getattr(
     settings,
@@ -67,6 +80,13 @@ GAMBLING_WS_GROUP_PREFIX = getattr(
     'gambling'
 )
 
+# Minimum interval between live odds snapshots for one game
+GAMBLING_ODDS_INTERVAL_MS = getattr(
+    settings,
+    'GAMBLING_ODDS_INTERVAL_MS',
+    500
+)
+
 # Notification Settings
 GAMBLING_EMAIL_NOTIFICATIONS = getattr(
     settings,
@@ -74,6 +94,25 @@ GAMBLING_EMAIL_NOTIFICATIONS = getattr(
     True
 )
 
+# Outbox emails sent per worker batch over one SMTP connection
+GAMBLING_EMAIL_BATCH_SIZE = getattr(
+    settings,
+    'GAMBLING_EMAIL_BATCH_SIZE',
+    200
+)
+
+GAMBLING_EMAIL_MAX_ATTEMPTS = getattr(
+    settings,
+    'GAMBLING_EMAIL_MAX_ATTEMPTS',
+    5
+)
+
+GAMBLING_EMAIL_RETRY_DELAY = getattr(
+    settings,
+    'GAMBLING_EMAIL_RETRY_DELAY',
+    60  # seconds, doubled after every failed attempt
+)
+
 GAMBLING_NOTIFICATION_TYPES = getattr(
     settings,
     'GAMBLING_NOTIFICATION_TYPES',
@@ -107,6 +146,19 @@ GAMBLING_CACHE_TIMEOUT = getattr(
     300  # 5 minutes
 )
 
+# In-process game cache in front of the shared cache
+GAMBLING_GAME_CACHE_L1_SIZE = getattr(
+    settings,
+    'GAMBLING_GAME_CACHE_L1_SIZE',
+    512  # games
+)
+
+GAMBLING_GAME_CACHE_L1_TIMEOUT = getattr(
+    settings,
+    'GAMBLING_GAME_CACHE_L1_TIMEOUT',
+    2  # seconds a process trusts its copy without checking the version
+)
+
 # Cleanup Settings
 GAMBLING_CLEANUP_DAYS = getattr(
     settings,
@@ -0,0 +1,243 @@
+from array import array
+from decimal import Decimal, ROUND_DOWN
+from django.db import transaction
+from django.db.models import BigIntegerField, F, Value
+from django.db.models.functions import Cast, Round
+from django.utils import timezone
+from .models import GamblingBet
+from .aggregates import GameAggregateService, PlayerStatsService
+from .pools import PoolIndex
+from .cache import GameCache, invalidate_user_active_bets
+from .fixedpoint import UNIT_PLACES, Multiplier, from_units, pro_rata
+from .utils import (
+    check_bet_result,
+    calculate_win_multiplier,
+    get_bet_option_key
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SettlementEngine:
+    """Set-based settlement of all placed bets on a game.
+
+    Bets are grouped by their option key, so ``check_bet_result`` and
+    ``calculate_win_multiplier`` run once per distinct option instead of
+    once per bet. Results are written in chunks, each in its own short
+    transaction, and only bets still in ``placed`` status are touched, so a
+    settlement that is interrupted can simply be run again.
+    """
+
+    CHUNK_SIZE = 2000
+    # Pari-mutuel games: winners share the pool, and the winning option
+    # comes from arbitration rather than a draw
+    POOL_GAME_TYPES = ('lottery',)
+
+    @staticmethod
+    def is_pool(game):
+        return game.game_type in SettlementEngine.POOL_GAME_TYPES
+
+    @staticmethod
+    def group_bet_units(game, chunk_size=None):
+        """Return ``{option_key: (bet_data, bet_ids, amounts)}`` with int64 arrays
+
+        Amounts are read as integer base units straight from the database,
+        so no ``Decimal`` is built per bet.
+        """
+        chunk_size = chunk_size or SettlementEngine.CHUNK_SIZE
+        groups = {}
+
+        bets = GamblingBet.objects.filter(
+            game=game,
+            status='placed'
+        ).annotate(
+            units=Cast(
+                Round(F('amount') * Value(10 ** UNIT_PLACES)),
+                BigIntegerField()
+            )
+        ).values_list('id', 'units', 'bet_data').order_by('id')
+
+        for bet_id, units, bet_data in bets.iterator(chunk_size=chunk_size):
+            key = get_bet_option_key(bet_data)
+            if key not in groups:
+                groups[key] = (bet_data, array('q'), array('q'))
+            groups[key][1].append(bet_id)
+            groups[key][2].append(units)
+
+        return groups
+
+    @staticmethod
+    def resolve_outcomes(game, result, groups):
+        """Split bets grouped by ``group_bet_units`` into winners and losers
+
+        Fixed-odds payouts are ``amount * multiplier`` computed on base
+        units, one ``Multiplier`` per winning option.
+        """
+        winners = []
+        losers = []
+
+        for bet_data, bet_ids, amounts in groups.values():
+            if check_bet_result(bet_data, result, game.game_type):
+                multiplier = Multiplier(
+                    calculate_win_multiplier(game.game_type, bet_data),
+                    ROUND_DOWN
+                )
+                payouts = multiplier.apply_all(amounts)
+                winners.extend(zip(bet_ids, map(from_units, payouts)))
+            else:
+                losers.extend(bet_ids)
+
+        return winners, losers
+
+    @staticmethod
+    def resolve_pool_outcomes(game, result, groups):
+        """Split bets grouped by ``group_bet_units`` for a pari-mutuel game
+
+        Winners share the prize pool pro rata; the pool sizes come from the
+        per-option pool index, not from the grouped bets.
+        """
+        winning_key = get_bet_option_key(result)
+        winning_total = PoolIndex.get_option_total(game, winning_key)
+        prize_pool = PoolIndex.get_prize_pool(game)
+        winners = []
+        losers = []
+
+        for key, (bet_data, bet_ids, amounts) in groups.items():
+            if key == winning_key:
+                # Same payouts as calculate_win_amount, computed on base units
+                payouts, _ = pro_rata(amounts, prize_pool, winning_total)
+                winners.extend(zip(bet_ids, map(from_units, payouts)))
+            else:
+                losers.extend(bet_ids)
+
+        return winners, losers
+
+    @staticmethod
+    def settle(game, result, chunk_size=None, notify=True):
+        """Settle every placed bet on ``game`` against ``result``"""
+        chunk_size = chunk_size or SettlementEngine.CHUNK_SIZE
+        groups = SettlementEngine.group_bet_units(game, chunk_size)
+        winners, losers = SettlementEngine.resolve_outcomes(game, result, groups)
+        return SettlementEngine.write_results(
+            game, winners, losers, chunk_size, notify
+        )
+
+    @staticmethod
+    def settle_game(game, chunk_size=None, notify=True):
+        """Settle ``game`` against its stored result, pro rata for pool games"""
+        if SettlementEngine.is_pool(game):
+            return SettlementEngine.settle_pool(game, game.result, chunk_size, notify)
+        return SettlementEngine.settle(game, game.result, chunk_size, notify)
+
+    @staticmethod
+    def settle_pool(game, result, chunk_size=None, notify=True):
+        """Settle a pari-mutuel game where ``result`` is the winning option"""
+        chunk_size = chunk_size or SettlementEngine.CHUNK_SIZE
+        groups = SettlementEngine.group_bet_units(game, chunk_size)
+        winners, losers = SettlementEngine.resolve_pool_outcomes(game, result, groups)
+        return SettlementEngine.write_results(
+            game, winners, losers, chunk_size, notify
+        )
+
+    @staticmethod
+    def write_results(game, winners, losers, chunk_size, notify=True):
+        """Write resolved winners and losers in chunks"""
+        result_time = timezone.now()
+
+        won_count = 0
+        total_won = Decimal('0')
+        for start in range(0, len(winners), chunk_size):
+            chunk = winners[start:start + chunk_size]
+            count, amount = SettlementEngine._write_winners(chunk, result_time)
+            won_count += count
+            total_won += amount
+
+        lost_count = 0
+        for start in range(0, len(losers), chunk_size):
+            chunk = losers[start:start + chunk_size]
+            lost_count += SettlementEngine._write_losers(chunk, result_time)
+
+        GameAggregateService.record_settlement(game, total_won)
+        SettlementEngine._invalidate_player_caches(game)
+        GameCache.invalidate_on_commit(game.id)
+
+        if notify and (won_count or lost_count):
+            SettlementEngine._schedule_notifications(game)
+
+        logger.info(
+            f"Settled game {game.id}: {won_count} won, {lost_count} lost, "
+            f"{total_won} paid out"
+        )
+
+        return {
+            'won': won_count,
+            'lost': lost_count,
+            'total_won': total_won
+        }
+
+    @staticmethod
+    @transaction.atomic
+    def _write_winners(chunk, result_time):
+        """Write one chunk of winning bets, skipping already settled ones"""
+        win_amounts = dict(chunk)
+        open_ids = GamblingBet.objects.select_for_update().filter(
+            pk__in=win_amounts.keys(),
+            status='placed'
+        ).values_list('pk', flat=True)
+
+        bets = [
+            GamblingBet(
+                pk=bet_id,
+                status='won',
+                win_amount=win_amounts[bet_id],
+                result_time=result_time
+            )
+            for bet_id in open_ids
+        ]
+        GamblingBet.objects.bulk_update(
+            bets,
+            ['status', 'win_amount', 'result_time']
+        )
+        PlayerStatsService.record_settled([bet.pk for bet in bets], result_time)
+        return len(bets), sum((bet.win_amount for bet in bets), Decimal('0'))
+
+    @staticmethod
+    @transaction.atomic
+    def _write_losers(chunk, result_time):
+        """Write one chunk of losing bets with a single conditional UPDATE"""
+        lost = GamblingBet.objects.filter(
+            pk__in=chunk,
+            status='placed'
+        ).update(
+            status='lost',
+            win_amount=0,
+            result_time=result_time
+        )
+        PlayerStatsService.record_settled(chunk, result_time)
+        return lost
+
+    @staticmethod
+    def _invalidate_player_caches(game):
+        """Drop cached open bet counts for everyone who bet on the game"""
+        user_ids = list(
+            GamblingBet.objects.filter(game=game).values_list(
+                'user_id', flat=True
+            ).distinct()
+        )
+        transaction.on_commit(lambda: invalidate_user_active_bets(user_ids))
+
+    @staticmethod
+    def _schedule_notifications(game):
+        """Hand per-bet notifications to Celery once the results are committed"""
+        game_id = game.id
+        transaction.on_commit(lambda: SettlementEngine._queue_notifications(game_id))
+
+    @staticmethod
+    def _queue_notifications(game_id):
+        from .tasks import notify_settled_bets
+
+        try:
+            notify_settled_bets.delay(game_id)
+        except Exception as e:
+            # The results are committed; only the notifications are lost
+            logger.error(f"Error queueing result notifications for game {game_id}: {e}")
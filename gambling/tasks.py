@@ -5,27 +5,28 @@ from .models import GamblingGame, GamblingBet
 from .services import GamblingService
 from .utils import generate_game_result
 from .notifications import GamblingNotifier
+from .aggregates import GameAggregateService
+from .odds import OddsStream
+from .outbox import NotificationOutbox
+from .scheduler import GameScheduler
+from .coordinator import SettlementCoordinator
+from .settings import GAMBLING_EMAIL_BATCH_SIZE
 import logging
 
 logger = logging.getLogger(__name__)
 
+@shared_task
+def settle_game(game_id):
+    """Settle a game when its scheduled end time is reached"""
+    return GameScheduler.settle(game_id)
+
 @shared_task
 def process_completed_games():
-    """Process all completed games that haven't been processed yet"""
+    """Arm settlement timers for expired and soon-ending games"""
     try:
-        expired_games = GamblingGame.objects.filter(
-            status='active',
-            end_time__lte=timezone.now()
-        )
-        
-        for game in expired_games:
-            try:
-                with transaction.atomic():
-                    GamblingService.complete_game(game)
-                logger.info(f"Successfully completed game {game.id}")
-            except Exception as e:
-                logger.error(f"Error completing game {game.id}: {str(e)}")
-                continue
+        armed = GameScheduler.dispatch_due()
+        if armed:
+            logger.info(f"Armed settlement timers for {armed} games")
                 
     except Exception as e:
         logger.error(f"Error in process_completed_games task: {str(e)}")
@@ -58,18 +59,17 @@ def cleanup_expired_games():
 
 @shared_task
 def update_game_statistics():
-    """Update statistics for active games"""
+    """Verify and repair aggregate statistics for active games"""
     try:
         active_games = GamblingGame.objects.filter(status='active')
         
         for game in active_games:
             try:
-                stats = GamblingService.calculate_game_stats(game)
-                # Update game statistics
-                game.total_bets = stats['total_bets']
-                game.unique_players = stats['unique_players']
-                game.save(update_fields=['total_bets', 'unique_players'])
-                logger.info(f"Updated statistics for game {game.id}")
+                mismatches = GameAggregateService.reconcile(game, fix=True)
+                if mismatches:
+                    logger.warning(
+                        f"Repaired aggregate for game {game.id}: {sorted(mismatches)}"
+                    )
             except Exception as e:
                 logger.error(f"Error updating stats for game {game.id}: {str(e)}")
                 continue
@@ -105,6 +105,35 @@ def process_bet_result(bet_id):
         logger.error(f"Error in process_bet_result task: {str(e)}")
         raise
 
+@shared_task
+def notify_settled_bets(game_id):
+    """Send result notifications for the bets of a settled game"""
+    bets = GamblingBet.objects.filter(
+        game_id=game_id,
+        status__in=['won', 'lost']
+    ).select_related('game', 'user')
+    
+    for bet in bets.iterator(chunk_size=500):
+        try:
+            GamblingNotifier.notify_bet_result(bet)
+        except Exception as e:
+            logger.error(f"Error sending result notification for bet {bet.id}: {e}")
+
+@shared_task
+def publish_odds_snapshot(game_id):
+    """Publish a throttled live odds snapshot for a game"""
+    OddsStream.publish(game_id)
+
+@shared_task
+def deliver_outbox():
+    """Send a batch of queued notification emails"""
+    result = NotificationOutbox.deliver()
+    
+    # Keep draining while full batches are coming back
+    if result['claimed'] >= GAMBLING_EMAIL_BATCH_SIZE:
+        deliver_outbox.delay()
+    return result
+
 @shared_task
 def send_game_notifications():
     """Send notifications for game events"""
@@ -144,19 +173,21 @@ def send_game_notifications():
 
 @shared_task
 def complete_expired_games():
-    """Complete games that have expired"""
-    now = timezone.now()
-    expired_games = GamblingGame.objects.filter(
-        status='active',
-        end_time__lte=now
-    )
+    """Claim and settle a batch of expired games
     
-    for game in expired_games:
-        try:
-            GamblingService.complete_game(game)
-            logger.info(f"Completed expired game {game.id}")
-        except Exception as e:
-            logger.error(f"Error completing game {game.id}: {e}")
+    Each run claims its own batch with SKIP LOCKED, so several workers
+    running this task split the expired games between them.
+    """
+    settled = SettlementCoordinator.settle_due()
+    
+    # More games may be waiting; let any free worker take the next batch
+    if len(settled) >= SettlementCoordinator.BATCH_SIZE:
+        complete_expired_games.delay()
+    
+    # Finish games whose worker died between claim and settlement
+    for game_id in SettlementCoordinator.resume_unsettled():
+        logger.warning(f"Resumed settlement of game {game_id}")
+    return settled
 
 @shared_task
 def notify_ending_soon_games():
@@ -1,28 +1,18 @@
 from django import template
 from django.utils import timezone
 from ..models import GamblingGame, GamblingBet
+from ..aggregates import UserGameStatsService
 
 register = template.Library()
 
 @register.simple_tag
 def get_user_game_stats(user, game):
-    """Get user statistics for a specific game"""
-    bets = GamblingBet.objects.filter(
-        user=user,
-        game=game
-    )
-    
-    total_amount = sum(bet.amount for bet in bets)
-    won_amount = sum(
-        bet.win_amount for bet in bets.filter(status='won')
-        if hasattr(bet, 'win_amount')
-    )
-    
-    return {
-        'total_bets': bets.count(),
-        'total_amount': total_amount,
-        'won_amount': won_amount
-    }
+    """Get user statistics for a specific game
+
+    Uses the stats attached by ``UserGameStatsService.attach`` when the
+    view prefetched them for the page, otherwise runs one query.
+    """
+    return UserGameStatsService.get(user, game)
 
 @register.filter
 def time_until_end(game):
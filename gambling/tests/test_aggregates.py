@@ -0,0 +1,253 @@
+from django.test import TestCase, RequestFactory
+from django.template import Template, Context
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+from decimal import Decimal
+from unittest.mock import patch
+from ..models import GamblingGame, GamblingBet, GameAggregate, PlayerStats
+from ..aggregates import GameAggregateService, PlayerStatsService, UserGameStatsService
+from ..context_processors import active_games, user_gambling_stats
+from ..settlement import SettlementEngine
+from ..services import GamblingService
+from ..templatetags.gambling_tags import render_game_card
+
+User = get_user_model()
+
+@patch('gambling.services.GamblingNotifier')
+class GameAggregateServiceTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.other = User.objects.create_user(
+            username='otheruser',
+            password='testpass123'
+        )
+        self.game = GamblingGame.objects.create(
+            title='Test Game',
+            description='Test Description',
+            game_type='dice',
+            end_time=timezone.now() + timezone.timedelta(hours=1),
+            fee_percentage=Decimal('2.0'),
+            status='active'
+        )
+
+    def place(self, user, amount, number):
+        return GamblingService.place_bet(
+            game=self.game,
+            user=user,
+            amount=Decimal(amount),
+            bet_data={'number': number}
+        )
+
+    def test_place_bet_updates_aggregate(self, mock_notifier):
+        self.place(self.user, '10.00', 6)
+        self.place(self.user, '5.00', 3)
+        self.place(self.other, '5.00', 6)
+
+        aggregate = GameAggregate.objects.get(game=self.game)
+        self.assertEqual(aggregate.total_pool, Decimal('20.00'))
+        self.assertEqual(aggregate.total_bets, 3)
+        self.assertEqual(aggregate.unique_players, 2)
+        self.assertEqual(aggregate.fee_collected, Decimal('0.40'))
+        self.assertEqual(aggregate.option_totals['{"number":6}']['bets'], 2)
+        self.assertEqual(
+            Decimal(aggregate.option_totals['{"number":6}']['amount']),
+            Decimal('15.00')
+        )
+
+    def test_missing_aggregate_is_seeded_from_existing_bets(self, mock_notifier):
+        self.place(self.user, '10.00', 6)
+        self.place(self.other, '5.00', 3)
+        GameAggregate.objects.filter(game=self.game).delete()
+
+        self.place(self.user, '2.00', 6)
+
+        aggregate = GameAggregate.objects.get(game=self.game)
+        self.assertEqual(aggregate.total_pool, Decimal('17.00'))
+        self.assertEqual(aggregate.total_bets, 3)
+        self.assertEqual(aggregate.unique_players, 2)
+        self.assertEqual(aggregate.option_totals['{"number":6}']['bets'], 2)
+        self.assertEqual(GameAggregateService.reconcile(self.game), {})
+
+    def test_with_stats_reads_aggregate(self, mock_notifier):
+        self.place(self.user, '10.00', 6)
+
+        with self.assertNumQueries(1):
+            game = GamblingGame.objects.with_stats().get(pk=self.game.pk)
+        self.assertEqual(game.total_pool, Decimal('10.00'))
+        self.assertEqual(game.total_bets, 1)
+        self.assertEqual(game.unique_players, 1)
+
+    def test_reconcile_detects_and_fixes_drift(self, mock_notifier):
+        self.place(self.user, '10.00', 6)
+        self.assertEqual(GameAggregateService.reconcile(self.game), {})
+
+        GamblingBet.objects.create(
+            game=self.game,
+            user=self.other,
+            amount=Decimal('4.00'),
+            fee_amount=Decimal('0.08'),
+            bet_data={'number': 1}
+        )
+        mismatches = GameAggregateService.reconcile(self.game, fix=True)
+        self.assertIn('total_pool', mismatches)
+        self.assertIn('unique_players', mismatches)
+
+        self.assertEqual(GameAggregateService.reconcile(self.game), {})
+        stats = GameAggregateService.get_stats(GamblingGame.objects.get(pk=self.game.pk))
+        self.assertEqual(stats['total_pool'], Decimal('14.00'))
+        self.assertEqual(stats['average_bet'], Decimal('7.00'))
+
+@patch('gambling.settlement.SettlementEngine._schedule_notifications')
+@patch('gambling.services.GamblingNotifier')
+class PlayerStatsServiceTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.game = GamblingGame.objects.create(
+            title='Test Game',
+            description='Test Description',
+            game_type='dice',
+            end_time=timezone.now() + timezone.timedelta(hours=1),
+            fee_percentage=Decimal('2.0'),
+            status='active'
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def place(self, amount, number):
+        return GamblingService.place_bet(
+            game=self.game,
+            user=self.user,
+            amount=Decimal(amount),
+            bet_data={'number': number}
+        )
+
+    def test_counters_follow_placement_and_settlement(self, mock_notifier, mock_schedule):
+        self.place('10.00', 6)
+        self.place('5.00', 3)
+
+        stats = PlayerStats.objects.get(user=self.user)
+        self.assertEqual(stats.active_bets, 2)
+        self.assertEqual(stats.total_bets, 2)
+        self.assertEqual(stats.total_wagered, Decimal('10.00') + Decimal('5.00'))
+
+        SettlementEngine.settle(self.game, {'number': 6}, notify=False)
+
+        stats.refresh_from_db()
+        self.assertEqual(stats.active_bets, 0)
+        self.assertEqual(stats.won_bets, 1)
+        self.assertEqual(stats.total_won, Decimal('55.00'))
+        self.assertEqual(PlayerStatsService.reconcile(self.user.id), {})
+
+    def test_cancel_game_refunds_active_bets(self, mock_notifier, mock_schedule):
+        self.place('10.00', 6)
+        self.place('5.00', 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            GamblingService.cancel_game(self.game)
+
+        self.assertFalse(GamblingBet.objects.filter(game=self.game, status='placed').exists())
+        stats = PlayerStats.objects.get(user=self.user)
+        self.assertEqual(stats.active_bets, 0)
+        self.assertEqual(stats.total_bets, 2)
+        self.assertEqual(PlayerStatsService.reconcile(self.user.id), {})
+
+    def test_missing_row_is_computed_from_bets(self, mock_notifier, mock_schedule):
+        self.place('10.00', 6)
+        PlayerStats.objects.filter(user=self.user).delete()
+
+        self.assertEqual(PlayerStatsService.get(self.user.id)['total_bets'], 1)
+
+    def test_context_processors_share_one_cache_read(self, mock_notifier, mock_schedule):
+        self.place('10.00', 6)
+        request = RequestFactory().get('/')
+        request.user = self.user
+
+        # First render fills the cache: the counter row and the active game count
+        with self.assertNumQueries(2):
+            active_games(request)
+            context = user_gambling_stats(request)
+        self.assertEqual(context['user_total_bets'], 1)
+
+        request = RequestFactory().get('/')
+        request.user = self.user
+        with patch('gambling.cache.cache.get_many', wraps=cache.get_many) as get_many:
+            with self.assertNumQueries(0):
+                games = active_games(request)
+                user_gambling_stats(request)
+        self.assertEqual(get_many.call_count, 1)
+        self.assertEqual(games, {'active_games_count': 1, 'user_active_bets': 1})
+
+@patch('gambling.services.GamblingNotifier')
+class UserGameStatsServiceTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.games = [
+            GamblingGame.objects.create(
+                title=f'Game {i}',
+                description='Test Description',
+                game_type='dice',
+                end_time=timezone.now() + timezone.timedelta(hours=1),
+                fee_percentage=Decimal('2.0'),
+                status='active'
+            )
+            for i in range(30)
+        ]
+        for game in self.games[:10]:
+            GamblingService.place_bet(
+                game=game,
+                user=self.user,
+                amount=Decimal('10.00'),
+                bet_data={'number': 6}
+            )
+        GamblingBet.objects.filter(game=self.games[0]).update(
+            status='won',
+            win_amount=Decimal('19.60')
+        )
+
+    def test_lobby_stats_take_one_query(self, mock_notifier):
+        template = Template(
+            '{% load gambling_tags %}'
+            '{% for game in games %}'
+            '{% get_user_game_stats user game as stats %}{{ stats.total_bets }},'
+            '{% endfor %}'
+        )
+
+        with self.assertNumQueries(2):
+            games = UserGameStatsService.attach(
+                self.user, GamblingGame.objects.order_by('id')
+            )
+            rendered = template.render(Context({'games': games, 'user': self.user}))
+
+        self.assertEqual(rendered, '1,' * 10 + '0,' * 20)
+
+    def test_attached_stats_match_bets(self, mock_notifier):
+        games = UserGameStatsService.attach(self.user, self.games[:2] + self.games[-1:])
+
+        with self.assertNumQueries(0):
+            contexts = [render_game_card(game, self.user) for game in games]
+
+        self.assertEqual(contexts[0]['user_stats'], {
+            'total_bets': 1,
+            'total_amount': Decimal('10.00'),
+            'won_amount': Decimal('19.60'),
+        })
+        self.assertEqual(contexts[1]['user_stats']['won_amount'], Decimal('0'))
+        self.assertEqual(contexts[2]['user_stats'], UserGameStatsService.empty())
+
+    def test_unattached_game_loads_alone(self, mock_notifier):
+        with self.assertNumQueries(1):
+            stats = UserGameStatsService.get(self.user, self.games[0])
+
+        self.assertEqual(stats['total_bets'], 1)
@@ -4,8 +4,12 @@ from django.core.cache import cache
 from django.urls import reverse
 from django.utils import timezone
 from decimal import Decimal
+from threading import Barrier, Thread
+from unittest.mock import patch
+import time
 from ..models import GamblingGame, GamblingBet
 from ..cache import (
+    GameCache,
     get_cached_game,
     cache_game,
     get_cached_game_stats,
@@ -178,4 +182,95 @@ class GamblingCacheTest(TestCase):
 
     def tearDown(self):
         # Clear cache after each test
-        cache.clear() 
\ No newline at end of file
+        cache.clear()
+
+class GameCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        GameCache.clear_local()
+        self.game = GamblingGame.objects.create(
+            title='Test Game',
+            description='Test Description',
+            game_type='dice',
+            end_time=timezone.now() + timezone.timedelta(hours=1),
+            fee_percentage=Decimal('1.0'),
+            status='active'
+        )
+        cache.clear()
+        GameCache.clear_local()
+
+    def tearDown(self):
+        cache.clear()
+        GameCache.clear_local()
+
+    def test_read_through_attaches_stats_and_aggregate(self):
+        with self.assertNumQueries(1):
+            game = GameCache.get(self.game.id)
+
+        self.assertEqual(game.title, 'Test Game')
+        self.assertEqual(game.total_pool, Decimal('0'))
+        self.assertFalse(game._state.adding)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(GameCache.get(self.game.id).id, self.game.id)
+
+    def test_missing_game_returns_none(self):
+        self.assertIsNone(GameCache.get(self.game.id + 1000))
+
+    def test_l2_serves_other_processes(self):
+        GameCache.get(self.game.id)
+        GameCache.clear_local()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(GameCache.get(self.game.id).title, 'Test Game')
+
+    def test_invalidation_moves_to_a_new_version(self):
+        GameCache.get(self.game.id)
+        version = GameCache.get_version(self.game.id)
+
+        GamblingGame.objects.filter(pk=self.game.pk).update(title='Renamed')
+        GameCache.invalidate(self.game.id)
+
+        self.assertNotEqual(GameCache.get_version(self.game.id), version)
+        self.assertEqual(GameCache.get(self.game.id).title, 'Renamed')
+
+    def test_saving_a_game_invalidates_it(self):
+        GameCache.get(self.game.id)
+
+        self.game.title = 'Saved'
+        self.game.save()
+
+        self.assertEqual(GameCache.get(self.game.id).title, 'Saved')
+
+    def test_returned_games_are_independent_copies(self):
+        first = GameCache.get(self.game.id)
+        first.title = 'Changed locally'
+
+        self.assertEqual(GameCache.get(self.game.id).title, 'Test Game')
+
+    def test_concurrent_misses_load_once(self):
+        payload = GameCache.load(self.game.id)
+        calls = []
+
+        def slow_load(game_id):
+            calls.append(game_id)
+            time.sleep(0.1)
+            return payload
+
+        barrier = Barrier(20)
+        results = []
+
+        def read():
+            barrier.wait()
+            results.append(GameCache.get(self.game.id))
+
+        with patch.object(GameCache, 'load', side_effect=slow_load):
+            threads = [Thread(target=read) for _ in range(20)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 20)
+        self.assertTrue(all(game.id == self.game.id for game in results))
@@ -0,0 +1,100 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from decimal import Decimal
+from unittest.mock import patch
+from ..models import GamblingGame, GamblingBet
+from ..coordinator import SettlementCoordinator
+from ..exceptions import InvalidGameStateError
+from ..services import GamblingService
+
+User = get_user_model()
+
+@patch('gambling.coordinator.GamblingNotifier')
+class SettlementCoordinatorTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.expired = self.create_game(timezone.timedelta(minutes=-1))
+        self.running = self.create_game(timezone.timedelta(hours=1))
+        for number in [1, 2, 3, 4, 5, 6]:
+            GamblingBet.objects.create(
+                user=self.user,
+                game=self.expired,
+                amount=Decimal('1.00'),
+                bet_data={'number': number},
+                fee_amount=Decimal('0.01'),
+                status='placed'
+            )
+
+    def create_game(self, ends_in):
+        game = GamblingGame.objects.create(
+            title='Test Game',
+            description='Test Description',
+            game_type='dice',
+            end_time=timezone.now() + timezone.timedelta(hours=1),
+            fee_percentage=Decimal('1.0'),
+            status='active'
+        )
+        GamblingGame.objects.filter(pk=game.pk).update(
+            end_time=timezone.now() + ends_in
+        )
+        return game
+
+    def test_settle_due_claims_only_expired_games(self, mock_notifier):
+        settled = SettlementCoordinator.settle_due()
+
+        self.assertEqual(settled, [self.expired.id])
+        self.assertEqual(
+            GamblingGame.objects.get(pk=self.running.pk).status,
+            'active'
+        )
+        self.assertFalse(
+            GamblingBet.objects.filter(game=self.expired, status='placed').exists()
+        )
+        self.assertEqual(
+            GamblingBet.objects.filter(game=self.expired, status='won').count(),
+            1
+        )
+
+    def test_game_is_claimed_once(self, mock_notifier):
+        self.assertEqual(len(SettlementCoordinator.claim_batch()), 1)
+        self.assertEqual(SettlementCoordinator.claim_batch(), [])
+
+        with self.assertRaises(InvalidGameStateError) as raised:
+            SettlementCoordinator.complete(self.expired)
+        self.assertEqual(raised.exception.to_status, 'completed')
+        self.assertEqual(raised.exception.game_id, self.expired.pk)
+
+    def test_complete_ignores_end_time(self, mock_notifier):
+        game = SettlementCoordinator.complete(self.running)
+
+        self.assertEqual(game.status, 'completed')
+        self.assertIsNotNone(game.result)
+
+    def test_resume_unsettled_finishes_claimed_game(self, mock_notifier):
+        SettlementCoordinator.claim_batch()
+
+        self.assertEqual(SettlementCoordinator.resume_unsettled(), [self.expired.id])
+        self.assertEqual(SettlementCoordinator.resume_unsettled(), [])
+
+    def test_process_game_result_settles_through_coordinator(self, mock_notifier):
+        self.assertTrue(GamblingService.process_game_result(self.expired, {'number': 3}))
+
+        game = GamblingGame.objects.get(pk=self.expired.pk)
+        self.assertEqual(game.status, 'completed')
+        self.assertEqual(game.result, {'number': 3})
+        won = GamblingBet.objects.get(game=self.expired, status='won')
+        self.assertEqual(won.bet_data, {'number': 3})
+        self.assertEqual(won.win_amount, Decimal('5.50'))
+        self.assertFalse(GamblingService.process_game_result(game, {'number': 4}))
+
+    def test_complete_game_rejects_finished_game(self, mock_notifier):
+        SettlementCoordinator.complete(self.running)
+        self.running.refresh_from_db()
+
+        with self.assertRaises(InvalidGameStateError) as raised:
+            GamblingService.complete_game(self.running)
+        self.assertEqual(raised.exception.from_status, 'completed')
@@ -0,0 +1,158 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from unittest.mock import patch
+from ..models import GamblingGame, GamblingBet, GameSeed
+from ..coordinator import SettlementCoordinator
+from ..services import GamblingService
+from ..fairness import FairRNG, FairnessEngine, seed_hash
+
+User = get_user_model()
+
+SERVER_SEED = 'ab' * 32
+
+class FairRNGTest(TestCase):
+    def test_same_seeds_give_same_result(self):
+        for game_type in ('dice', 'coin', 'roulette'):
+            self.assertEqual(
+                FairRNG(SERVER_SEED, '42').result(game_type),
+                FairRNG(SERVER_SEED, '42').result(game_type)
+            )
+
+    def test_results_are_in_range(self):
+        for client_seed in range(200):
+            rng = FairRNG(SERVER_SEED, str(client_seed))
+            self.assertTrue(1 <= rng.result('dice')['number'] <= 6)
+            self.assertIn(rng.result('coin')['side'], ['heads', 'tails'])
+            self.assertTrue(0 <= rng.result('roulette')['number'] <= 36)
+        self.assertIsNone(FairRNG(SERVER_SEED, '1').result('lottery'))
+
+    def test_concurrent_draws_do_not_interfere(self):
+        expected = [FairRNG(SERVER_SEED, str(i)).result('roulette') for i in range(500)]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(
+                lambda i: FairRNG(SERVER_SEED, str(i)).result('roulette'),
+                range(500)
+            ))
+
+        self.assertEqual(results, expected)
+
+@patch('gambling.services.GamblingNotifier')
+@patch('gambling.coordinator.GamblingNotifier')
+class FairnessEngineTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+
+    def create_game(self, client_seeds=('lucky', None)):
+        game = GamblingGame.objects.create(
+            title='Test Game',
+            description='Test Description',
+            game_type='dice',
+            end_time=timezone.now() + timezone.timedelta(hours=1),
+            fee_percentage=Decimal('1.0'),
+            status='active'
+        )
+        for number, client_seed in enumerate(client_seeds, start=1):
+            GamblingService.place_bet(
+                game=game,
+                user=self.user,
+                amount=Decimal('1.00'),
+                bet_data={'number': number},
+                client_seed=client_seed
+            )
+        GamblingGame.objects.filter(pk=game.pk).update(
+            end_time=timezone.now() - timezone.timedelta(minutes=1)
+        )
+        return game
+
+    def test_new_game_publishes_only_the_seed_hash(self, *mocks):
+        game = self.create_game()
+        game.refresh_from_db()
+
+        self.assertEqual(game.server_seed, '')
+        self.assertEqual(seed_hash(GameSeed.objects.get(game=game).seed), game.server_seed_hash)
+
+    def test_result_is_fixed_by_commitment_and_bets(self, *mocks):
+        games = [self.create_game() for _ in range(3)]
+        expected = {
+            game.pk: FairRNG(
+                GameSeed.objects.get(game=game).seed,
+                FairnessEngine.client_seed_for(game)
+            ).result('dice')
+            for game in games
+        }
+
+        # Settlement order has no effect on any result
+        for game in reversed(games):
+            SettlementCoordinator.complete(game)
+
+        for game in games:
+            game.refresh_from_db()
+            self.assertEqual(game.result, expected[game.pk])
+            self.assertEqual(seed_hash(game.server_seed), game.server_seed_hash)
+        self.assertEqual(FairnessEngine.verify(), [])
+
+    def test_player_seed_is_mixed_into_client_seed(self, *mocks):
+        game = self.create_game(client_seeds=('lucky',))
+        SettlementCoordinator.settle_due()
+
+        game.refresh_from_db()
+        bet = GamblingBet.objects.get(game=game)
+        self.assertEqual(bet.client_seed, 'lucky')
+        self.assertEqual(
+            game.client_seed,
+            FairnessEngine.combine_client_seeds([(bet.id, 'lucky')])
+        )
+        self.assertNotEqual(
+            game.client_seed,
+            FairnessEngine.combine_client_seeds([(bet.id, 'unlucky')])
+        )
+
+    def test_tampered_games_fail_verification(self, *mocks):
+        games = [self.create_game() for _ in range(4)]
+        SettlementCoordinator.settle_due()
+
+        tampered = GamblingGame.objects.get(pk=games[1].pk)
+        GamblingGame.objects.filter(pk=tampered.pk).update(
+            result={'number': tampered.result['number'] % 6 + 1}
+        )
+        GamblingGame.objects.filter(pk=games[2].pk).update(server_seed='cd' * 32)
+        GamblingBet.objects.filter(game=games[3]).update(client_seed='forged')
+
+        self.assertEqual(
+            sorted(FairnessEngine.verify()),
+            sorted([games[1].pk, games[2].pk, games[3].pk])
+        )
+
+    def test_game_without_commitment_gets_seed_at_settlement(self, *mocks):
+        game = self.create_game()
+        GameSeed.objects.filter(game=game).delete()
+        GamblingGame.objects.filter(pk=game.pk).update(server_seed_hash='')
+
+        SettlementCoordinator.settle_due()
+
+        game.refresh_from_db()
+        self.assertEqual(seed_hash(game.server_seed), game.server_seed_hash)
+        self.assertEqual(FairnessEngine.verify(), [])
+
+class ChainVerificationTest(TestCase):
+    def test_verify_rows_follows_the_chain_and_skips_gaps(self):
+        seeds = ['ef' * 32]
+        for _ in range(5):
+            seeds.append(seed_hash(seeds[-1]))
+        # seeds[0] is the terminal hash and sha256(seeds[i]) == seeds[i - 1]
+        seeds.reverse()
+        rows = [
+            (index, 'coin', 1, index, seeds[index], 'c',
+             FairRNG(seeds[index], 'c').result('coin'))
+            for index in (2, 5)
+        ]
+
+        self.assertEqual(FairnessEngine.verify_rows(rows, {1: seeds[0]}), [])
+        self.assertEqual(FairnessEngine.verify_rows(rows, {1: 'ab' * 32}), [2, 5])
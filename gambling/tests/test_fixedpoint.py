@@ -0,0 +1,67 @@
+from django.test import TestCase
+from decimal import Decimal, ROUND_HALF_EVEN
+import random
+from ..fixedpoint import Multiplier, from_units, load_units, pro_rata, to_units
+from ..utils import calculate_win_amount
+
+class FixedPointTest(TestCase):
+    def test_units_round_trip(self):
+        self.assertEqual(to_units(Decimal('12.34')), 1234000000)
+        self.assertEqual(to_units(Decimal('0.00000001')), 1)
+        self.assertEqual(from_units(1234000000), Decimal('12.34000000'))
+
+        with self.assertRaises(ValueError):
+            to_units(Decimal('0.000000001'))
+
+    def test_pro_rata_matches_decimal_path(self):
+        rng = random.Random(7)
+        for _ in range(50):
+            amounts = [
+                Decimal(rng.randint(1, 10 ** 6)).scaleb(-2)
+                for _ in range(rng.randint(1, 100))
+            ]
+            winning_total = sum(amounts, Decimal('0'))
+            total_pool = winning_total + Decimal(rng.randint(0, 10 ** 7)).scaleb(-2)
+            prize_pool = total_pool - total_pool * (Decimal('2.00') / 100)
+
+            payouts, _ = pro_rata(load_units(amounts), prize_pool, winning_total)
+
+            self.assertEqual(
+                [from_units(units) for units in payouts],
+                [calculate_win_amount(a, prize_pool, winning_total) for a in amounts]
+            )
+
+    def test_decimal_precision_is_reproduced(self):
+        # 1/3 rounds to 28 digits, so three thirds pay 0.33333333 each
+        payouts, remainder = pro_rata(load_units([Decimal('1')] * 3), Decimal('1'), Decimal('3'))
+
+        self.assertEqual(list(payouts), [33333333] * 3)
+        self.assertEqual(remainder, 1)
+
+    def test_remainder_distribution(self):
+        amounts = load_units([Decimal('1'), Decimal('2'), Decimal('4')])
+
+        payouts, remainder = pro_rata(
+            amounts, Decimal('1'), Decimal('7'), distribute_remainder=True
+        )
+
+        self.assertEqual(sum(payouts), 100000000)
+        self.assertEqual(remainder, 0)
+        # 4/7 has the largest fractional share, then 2/7
+        self.assertEqual(list(payouts), [14285714, 28571429, 57142857])
+
+    def test_half_even_multiplier_matches_quantize(self):
+        factor = Decimal('1.7') / Decimal('3')
+        multiplier = Multiplier(factor, ROUND_HALF_EVEN)
+        for cents in range(0, 100000, 37):
+            amount = Decimal(cents).scaleb(-2)
+            self.assertEqual(
+                from_units(multiplier.apply(to_units(amount))),
+                (amount * factor).quantize(Decimal('0.00000001'))
+            )
+
+    def test_no_winning_stake_pays_nothing(self):
+        payouts, remainder = pro_rata(load_units([Decimal('1')]), Decimal('5'), Decimal('0'))
+
+        self.assertEqual(list(payouts), [0])
+        self.assertEqual(remainder, 0)
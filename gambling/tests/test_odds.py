@@ -0,0 +1,148 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+from channels.testing import WebsocketCommunicator
+from channels.routing import URLRouter
+from channels.layers import get_channel_layer
+from channels.db import database_sync_to_async
+from decimal import Decimal
+from unittest.mock import patch
+from ..routing import websocket_urlpatterns
+from ..models import GamblingGame
+from ..odds import OddsStream
+from ..services import GamblingService
+
+User = get_user_model()
+
+@patch('gambling.services.GamblingNotifier')
+class OddsStreamTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.game = GamblingGame.objects.create(
+            title='Test Game',
+            description='Test Description',
+            game_type='coin',
+            end_time=timezone.now() + timezone.timedelta(hours=1),
+            fee_percentage=Decimal('10.0'),
+            status='active'
+        )
+        for amount, side in [('40.00', 'heads'), ('60.00', 'tails')]:
+            GamblingService.place_bet(
+                game=self.game,
+                user=self.user,
+                amount=Decimal(amount),
+                bet_data={'side': side}
+            )
+        self.game = GamblingGame.objects.get(pk=self.game.pk)
+
+    def test_build_snapshot(self, mock_notifier):
+        snapshot = OddsStream.build_snapshot(self.game)
+        values = snapshot['values']
+        self.assertEqual(values['total_bets'], 2)
+        self.assertEqual(Decimal(values['pool:{"side":"heads"}']), Decimal('40.00'))
+        # Coin flips pay fixed odds, not a share of the pool
+        self.assertEqual(Decimal(values['odds:{"side":"heads"}']), Decimal('1.9000'))
+
+    def test_pool_game_snapshot_uses_pool_odds(self, mock_notifier):
+        game = GamblingGame.objects.create(
+            title='Test Lottery',
+            description='Test Description',
+            game_type='lottery',
+            end_time=timezone.now() + timezone.timedelta(hours=1),
+            fee_percentage=Decimal('10.0'),
+            status='active'
+        )
+        for amount, ticket in [('40.00', 'a'), ('60.00', 'b')]:
+            GamblingService.place_bet(
+                game=game,
+                user=self.user,
+                amount=Decimal(amount),
+                bet_data={'ticket': ticket}
+            )
+
+        values = OddsStream.build_snapshot(GamblingGame.objects.get(pk=game.pk))['values']
+        self.assertEqual(Decimal(values['odds:{"ticket":"a"}']), Decimal('2.2500'))
+
+    def test_diff_only_sends_changes(self, mock_notifier):
+        previous = {'seq': 1, 'values': {'total_bets': 2, 'odds:a': '2.0', 'odds:b': '3.0'}}
+        current = {'seq': 2, 'values': {'total_bets': 3, 'odds:a': '2.0', 'odds:c': '9.0'}}
+
+        delta = OddsStream.diff(previous, current)
+        self.assertEqual(delta['base_seq'], 1)
+        self.assertEqual(delta['changed'], {'total_bets': 3, 'odds:c': '9.0'})
+        self.assertEqual(delta['removed'], ['odds:b'])
+        self.assertIsNone(OddsStream.diff(current, current))
+
+    @patch('gambling.odds.OddsStream.enqueue')
+    def test_place_bet_touches_odds_after_commit(self, mock_enqueue, mock_notifier):
+        mock_notifier.notify_bet_placed.side_effect = Exception('SMTP unavailable')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            GamblingService.place_bet(
+                game=self.game,
+                user=self.user,
+                amount=Decimal('5.00'),
+                bet_data={'side': 'heads'}
+            )
+            mock_enqueue.assert_not_called()
+
+        mock_enqueue.assert_called_once_with(self.game.id)
+
+    @patch('gambling.tasks.publish_odds_snapshot')
+    def test_enqueue_coalesces_per_game(self, mock_task, mock_notifier):
+        for _ in range(50):
+            OddsStream.enqueue(self.game.id)
+        self.assertEqual(mock_task.apply_async.call_count, 1)
+
+        OddsStream.publish(self.game.id)
+        OddsStream.enqueue(self.game.id)
+        self.assertEqual(mock_task.apply_async.call_count, 2)
+
+class OddsConsumerTest(TestCase):
+    async def test_watch_game_streams_deltas(self):
+        game = await database_sync_to_async(GamblingGame.objects.create)(
+            title='Test Game',
+            description='Test Description',
+            game_type='coin',
+            end_time=timezone.now() + timezone.timedelta(hours=1),
+            fee_percentage=Decimal('10.0'),
+            status='active'
+        )
+        user = await database_sync_to_async(User.objects.create_user)(
+            username='watcher',
+            password='testpass123'
+        )
+        communicator = WebsocketCommunicator(
+            URLRouter(websocket_urlpatterns),
+            "/ws/gambling/"
+        )
+        communicator.scope['user'] = user
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        # Clients may send the id as a string; group events carry an int
+        await communicator.send_json_to({'type': 'watch_game', 'game_id': str(game.id)})
+
+        response = await communicator.receive_json_from()
+        self.assertEqual(response['type'], 'watch_confirmation')
+        response = await communicator.receive_json_from()
+        self.assertEqual(response['type'], 'odds_snapshot')
+        base_seq = response['data']['seq']
+
+        values = dict(response['data']['values'], total_bets=1)
+        await get_channel_layer().group_send(f"game_{game.id}", {
+            'type': 'odds_snapshot',
+            'game_id': game.id,
+            'snapshot': {'seq': base_seq + 1, 'values': values}
+        })
+
+        response = await communicator.receive_json_from()
+        self.assertEqual(response['type'], 'odds_delta')
+        self.assertEqual(response['data']['base_seq'], base_seq)
+        self.assertEqual(response['data']['changed'], {'total_bets': 1})
+
+        await communicator.disconnect()
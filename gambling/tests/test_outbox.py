@@ -0,0 +1,84 @@
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.utils import timezone
+from decimal import Decimal
+from unittest.mock import patch
+from ..models import GamblingGame, GamblingBet, EmailOutbox
+from ..outbox import NotificationOutbox
+
+User = get_user_model()
+
+@override_settings(SITE_URL='http://testserver')
+@patch('gambling.outbox.render_to_string', return_value='<p>done</p>')
+@patch('gambling.outbox.NotificationOutbox.schedule_delivery')
+class NotificationOutboxTest(TestCase):
+    def setUp(self):
+        self.game = GamblingGame.objects.create(
+            title='Test Game',
+            description='Test Description',
+            game_type='dice',
+            end_time=timezone.now() + timezone.timedelta(hours=1),
+            fee_percentage=Decimal('1.0'),
+            status='active'
+        )
+        for i in range(3):
+            user = User.objects.create_user(
+                username=f'user{i}',
+                email=f'user{i}@example.com',
+                password='testpass123'
+            )
+            for number in [1, 2]:
+                GamblingBet.objects.create(
+                    user=user,
+                    game=self.game,
+                    amount=Decimal('1.00'),
+                    bet_data={'number': number},
+                    fee_amount=Decimal('0.01')
+                )
+
+    def test_enqueue_is_deduplicated(self, mock_schedule, mock_render):
+        NotificationOutbox.enqueue_game('game_completed', self.game)
+        NotificationOutbox.enqueue_game('game_completed', self.game)
+
+        self.assertEqual(EmailOutbox.objects.filter(kind='game_completed').count(), 3)
+
+    def test_deliver_renders_once_per_game(self, mock_schedule, mock_render):
+        NotificationOutbox.enqueue_game('game_completed', self.game)
+
+        result = NotificationOutbox.deliver()
+
+        self.assertEqual(result, {'claimed': 3, 'sent': 3, 'failed': 0})
+        self.assertEqual(mock_render.call_count, 1)
+        self.assertEqual(
+            mock_render.call_args[0][1]['game_url'],
+            f'http://testserver/gambling/games/{self.game.id}/'
+        )
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(mail.outbox[0].subject, 'Game Completed: Test Game')
+        self.assertFalse(EmailOutbox.objects.filter(status='pending').exists())
+        self.assertEqual(NotificationOutbox.deliver()['claimed'], 0)
+
+    @patch('django.core.mail.backends.locmem.EmailBackend.send_messages')
+    def test_failed_send_is_retried_with_backoff(self, mock_send, mock_schedule, mock_render):
+        mock_send.side_effect = ConnectionError('SMTP unavailable')
+        NotificationOutbox.enqueue_game('game_ending_soon', self.game)
+
+        result = NotificationOutbox.deliver()
+
+        self.assertEqual(result['failed'], 3)
+        email = EmailOutbox.objects.first()
+        self.assertEqual(email.status, 'pending')
+        self.assertEqual(email.attempts, 1)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+        self.assertIn('SMTP unavailable', email.last_error)
+
+    @patch('gambling.tasks.deliver_outbox')
+    def test_broker_outage_leaves_rows_for_beat(self, mock_task, mock_schedule, mock_render):
+        mock_task.delay.side_effect = ConnectionError('broker down')
+        NotificationOutbox.enqueue_game('game_ending_soon', self.game)
+
+        NotificationOutbox.kick_delivery()
+
+        mock_task.delay.assert_called_once_with()
+        self.assertEqual(EmailOutbox.objects.filter(status='pending').count(), 3)
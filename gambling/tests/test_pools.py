@@ -0,0 +1,134 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from decimal import Decimal
+from unittest.mock import patch
+from ..models import GamblingGame, GamblingBet
+from ..pools import PoolIndex
+from ..services import GamblingService
+from ..settlement import SettlementEngine
+from ..coordinator import SettlementCoordinator
+
+User = get_user_model()
+
+@patch('gambling.services.GamblingNotifier')
+class PoolIndexTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.game = GamblingGame.objects.create(
+            title='Test Game',
+            description='Test Description',
+            game_type='coin',
+            end_time=timezone.now() + timezone.timedelta(hours=1),
+            fee_percentage=Decimal('10.0'),
+            status='active'
+        )
+        for amount, side in [('30.00', 'heads'), ('10.00', 'heads'), ('60.00', 'tails')]:
+            GamblingService.place_bet(
+                game=self.game,
+                user=self.user,
+                amount=Decimal(amount),
+                bet_data={'side': side}
+            )
+        GamblingBet.objects.filter(game=self.game).update(status='placed')
+        self.game = GamblingGame.objects.get(pk=self.game.pk)
+
+    def test_pool_totals(self, mock_notifier):
+        self.assertEqual(PoolIndex.get_option_total(self.game, {'side': 'heads'}), Decimal('40.00'))
+        self.assertEqual(PoolIndex.get_prize_pool(self.game), Decimal('90.00'))
+        self.assertEqual(PoolIndex.get_prize_pool(self.game, deduct_fee=False), Decimal('100.00'))
+
+    def test_odds_need_no_bet_scan(self, mock_notifier):
+        with self.assertNumQueries(1):
+            odds = PoolIndex.get_odds(self.game)
+
+        self.assertEqual(odds['{"side":"heads"}'], Decimal('2.2500'))
+        self.assertEqual(odds['{"side":"tails"}'], Decimal('1.5000'))
+
+    @patch('gambling.settlement.SettlementEngine._schedule_notifications')
+    def test_settle_pool_pays_pro_rata(self, mock_schedule, mock_notifier):
+        summary = SettlementEngine.settle_pool(self.game, {'side': 'heads'})
+
+        self.assertEqual(summary['won'], 2)
+        self.assertEqual(summary['lost'], 1)
+        amounts = sorted(
+            GamblingBet.objects.filter(game=self.game, status='won')
+            .values_list('win_amount', flat=True)
+        )
+        self.assertEqual(amounts, [Decimal('22.50'), Decimal('67.50')])
+
+@patch('gambling.coordinator.GamblingNotifier')
+@patch('gambling.services.GamblingNotifier')
+@patch('gambling.settlement.SettlementEngine._schedule_notifications')
+class PoolSettlementTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.game = GamblingGame.objects.create(
+            title='Test Lottery',
+            description='Test Description',
+            game_type='lottery',
+            end_time=timezone.now() + timezone.timedelta(hours=1),
+            fee_percentage=Decimal('10.0'),
+            status='active'
+        )
+
+    def place_bets(self, game, *bets):
+        for amount, ticket in bets:
+            GamblingService.place_bet(
+                game=game,
+                user=self.user,
+                amount=Decimal(amount),
+                bet_data={'ticket': ticket}
+            )
+
+    def test_pool_game_settles_pro_rata_through_coordinator(self, *mocks):
+        self.place_bets(self.game, ('30.00', 'a'), ('10.00', 'a'), ('60.00', 'b'))
+
+        GamblingService.process_pool_result(self.game, {'ticket': 'a'})
+
+        game = GamblingGame.objects.get(pk=self.game.pk)
+        self.assertEqual(game.status, 'completed')
+        self.assertEqual(game.result, {'ticket': 'a'})
+        amounts = sorted(
+            GamblingBet.objects.filter(game=self.game, status='won')
+            .values_list('win_amount', flat=True)
+        )
+        self.assertEqual(amounts, [Decimal('22.50'), Decimal('67.50')])
+        self.assertEqual(
+            GamblingBet.objects.filter(game=self.game, status='lost').count(),
+            1
+        )
+
+    def test_pool_payouts_keep_settlement_precision(self, *mocks):
+        # Prize pool 30.051 over 30.00 pays 10.017 each; at cents this
+        # would round to 10.02 three times and pay out more than the pool
+        self.place_bets(self.game, ('10.00', 'a'), ('10.00', 'a'), ('10.00', 'a'), ('3.39', 'b'))
+
+        SettlementEngine.settle_pool(self.game, {'ticket': 'a'})
+
+        amounts = list(
+            GamblingBet.objects.filter(game=self.game, status='won')
+            .values_list('win_amount', flat=True)
+        )
+        self.assertEqual(amounts, [Decimal('10.01700000')] * 3)
+        self.assertLessEqual(sum(amounts), PoolIndex.get_prize_pool(self.game))
+
+    def test_expired_pool_game_waits_for_its_result(self, *mocks):
+        self.place_bets(self.game, ('10.00', 'a'))
+        GamblingGame.objects.filter(pk=self.game.pk).update(
+            end_time=timezone.now() - timezone.timedelta(minutes=1)
+        )
+
+        self.assertEqual(SettlementCoordinator.settle_due(), [])
+        self.assertEqual(GamblingGame.objects.get(pk=self.game.pk).status, 'active')
+
+        SettlementCoordinator.complete(self.game, {'ticket': 'a'})
+        bet = GamblingBet.objects.get(game=self.game)
+        self.assertEqual(bet.status, 'won')
+        self.assertEqual(bet.win_amount, Decimal('9.00'))
@@ -0,0 +1,64 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from decimal import Decimal
+from unittest.mock import patch
+from ..exceptions import RateLimitExceededError
+from ..ratelimit import BetRateLimiter, SlidingWindowCounter
+
+User = get_user_model()
+
+class BetRateLimiterTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+
+    def test_check_makes_no_database_queries(self):
+        with self.assertNumQueries(0):
+            BetRateLimiter.check(self.user)
+
+    def test_bets_per_minute_limit(self):
+        now = 1_000_000.0
+        for _ in range(5):
+            BetRateLimiter.record(self.user.id, Decimal('1.00'), now=now)
+
+        with patch('gambling.ratelimit.time.time', return_value=now + 1):
+            with self.assertRaises(RateLimitExceededError):
+                BetRateLimiter.check(self.user)
+
+        # Two minutes later both windows have slid past the bets
+        with patch('gambling.ratelimit.time.time', return_value=now + 120):
+            usage = BetRateLimiter.check(self.user)
+        self.assertEqual(usage['bets_per_minute'], 0)
+
+    def test_daily_amount_limit(self):
+        now = 1_000_000.0
+        BetRateLimiter.record(self.user.id, Decimal('7.50'), now=now)
+
+        with patch('gambling.ratelimit.GAMBLING_MAX_DAILY_AMOUNT', Decimal('10.00')):
+            with patch('gambling.ratelimit.time.time', return_value=now):
+                BetRateLimiter.check(self.user, amount=Decimal('2.50'))
+                with self.assertRaises(RateLimitExceededError):
+                    BetRateLimiter.check(self.user, amount=Decimal('2.51'))
+
+    def test_sliding_window_weights_previous_window(self):
+        counter = SlidingWindowCounter('test', 60)
+        counter.add(self.user.id, 10, now=30.0)
+
+        values = cache.get_many(counter.keys(self.user.id, 75.0))
+        # 15s into the next window, 75% of the previous window still counts
+        self.assertEqual(counter.estimate(values, self.user.id, 75.0), 7.5)
+
+    @override_settings(CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    })
+    def test_refuses_process_local_cache(self):
+        with self.assertRaises(ImproperlyConfigured):
+            BetRateLimiter.check(self.user)
+        with self.assertRaises(ImproperlyConfigured):
+            BetRateLimiter.record(self.user.id, Decimal('1.00'))
@@ -0,0 +1,87 @@
+from django.test import TestCase, RequestFactory
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils import timezone
+from decimal import Decimal
+from unittest.mock import patch
+from ..models import GamblingGame, GamblingBet
+from ..middleware import GamblingMiddleware
+from ..scheduler import GameScheduler
+
+User = get_user_model()
+
+class GameSchedulerTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.game = GamblingGame.objects.create(
+            title='Test Game',
+            description='Test Description',
+            game_type='dice',
+            end_time=timezone.now() + timezone.timedelta(hours=1),
+            fee_percentage=Decimal('1.0'),
+            status='active'
+        )
+        GamblingGame.objects.filter(pk=self.game.pk).update(
+            end_time=timezone.now() - timezone.timedelta(seconds=1)
+        )
+
+    @patch('gambling.tasks.settle_game')
+    def test_dispatch_arms_each_timer_once(self, mock_task):
+        self.assertEqual(GameScheduler.dispatch_due(), 1)
+        self.assertEqual(GameScheduler.dispatch_due(), 0)
+        self.assertEqual(mock_task.apply_async.call_count, 1)
+
+    @patch('gambling.coordinator.GamblingNotifier')
+    def test_settle_runs_once(self, mock_notifier):
+        self.assertTrue(GameScheduler.settle(self.game.id))
+        self.assertFalse(GameScheduler.settle(self.game.id))
+
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.status, 'completed')
+
+    @patch('gambling.tasks.settle_game')
+    def test_settle_rearms_extended_game(self, mock_task):
+        end_time = timezone.now() + timezone.timedelta(hours=2)
+        GamblingGame.objects.filter(pk=self.game.pk).update(end_time=end_time)
+
+        self.assertFalse(GameScheduler.settle(self.game.id))
+        mock_task.apply_async.assert_called_once_with(
+            args=[self.game.id],
+            eta=end_time
+        )
+
+    @patch('gambling.tasks.settle_game')
+    def test_broker_outage_is_rearmed_later(self, mock_task):
+        mock_task.apply_async.side_effect = ConnectionError('broker down')
+        self.assertEqual(GameScheduler.dispatch_due(), 0)
+
+        mock_task.apply_async.side_effect = None
+        self.assertEqual(GameScheduler.dispatch_due(), 1)
+        self.assertEqual(mock_task.apply_async.call_count, 2)
+
+class GamblingMiddlewareCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.middleware = GamblingMiddleware(lambda r: HttpResponse())
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+
+    @patch('gambling.middleware.resolve')
+    def test_active_bets_count_is_cached(self, mock_resolve):
+        mock_resolve.return_value.view_name = 'gambling:game_list'
+
+        request = self.factory.get('/gambling/')
+        request.user = self.user
+        self.middleware(request)
+        self.assertEqual(request.user.active_bets_count, 0)
+
+        with self.assertNumQueries(0):
+            self.middleware(request)
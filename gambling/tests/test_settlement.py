@@ -0,0 +1,89 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from decimal import Decimal
+from unittest.mock import patch
+from ..models import GamblingGame, GamblingBet
+from ..settlement import SettlementEngine
+
+User = get_user_model()
+
+class SettlementEngineTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.game = GamblingGame.objects.create(
+            title='Test Game',
+            description='Test Description',
+            game_type='dice',
+            end_time=timezone.now() + timezone.timedelta(hours=1),
+            fee_percentage=Decimal('1.0'),
+            status='active'
+        )
+        self.bets = [
+            GamblingBet.objects.create(
+                user=self.user,
+                game=self.game,
+                amount=Decimal('2.00'),
+                bet_data={'number': number},
+                fee_amount=Decimal('0.02'),
+                status='placed'
+            )
+            for number in [6, 3, 6, 1]
+        ]
+
+    def test_group_bets_by_option(self):
+        groups = SettlementEngine.group_bet_units(self.game)
+
+        self.assertEqual(len(groups), 3)
+        sizes = sorted(len(bet_ids) for _, bet_ids, _ in groups.values())
+        self.assertEqual(sizes, [1, 1, 2])
+        for _, _, amounts in groups.values():
+            self.assertEqual(set(amounts), {200000000})
+
+    @patch('gambling.settlement.SettlementEngine._schedule_notifications')
+    def test_settle_writes_results(self, mock_notify):
+        summary = SettlementEngine.settle(self.game, {'number': 6}, chunk_size=1)
+
+        self.assertEqual(summary['won'], 2)
+        self.assertEqual(summary['lost'], 2)
+        self.assertEqual(summary['total_won'], Decimal('22.00'))
+
+        won = GamblingBet.objects.filter(game=self.game, status='won')
+        self.assertEqual(won.count(), 2)
+        for bet in won:
+            self.assertEqual(bet.win_amount, Decimal('11.00'))
+            self.assertIsNotNone(bet.result_time)
+
+        lost = GamblingBet.objects.filter(game=self.game, status='lost')
+        self.assertEqual(lost.count(), 2)
+        mock_notify.assert_called_once_with(self.game)
+
+    @patch('gambling.settlement.SettlementEngine._schedule_notifications')
+    def test_settle_is_idempotent(self, mock_notify):
+        SettlementEngine.settle(self.game, {'number': 6})
+        summary = SettlementEngine.settle(self.game, {'number': 3})
+
+        self.assertEqual(summary['won'], 0)
+        self.assertEqual(summary['lost'], 0)
+        self.assertEqual(
+            GamblingBet.objects.filter(game=self.game, status='won').count(),
+            2
+        )
+        mock_notify.assert_called_once()
+
+    @patch('gambling.tasks.notify_settled_bets')
+    def test_broker_outage_does_not_undo_settlement(self, mock_task):
+        mock_task.delay.side_effect = ConnectionError('broker down')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            summary = SettlementEngine.settle(self.game, {'number': 6})
+
+        mock_task.delay.assert_called_once_with(self.game.id)
+        self.assertEqual(summary['won'], 2)
+        self.assertEqual(
+            GamblingBet.objects.filter(game=self.game, status='won').count(),
+            2
+        )
@@ -1,31 +1,21 @@
-import random
 from decimal import Decimal, ROUND_DOWN
 from django.conf import settings
 from django.db import models
 from django.utils import timezone
 import hashlib
+import json
+import secrets
 
 def generate_game_result(game_type, seed=None):
     """Generate random game result"""
+    from .fairness import FairRNG
     if seed is None:
-        # Use current time as seed
-        seed = str(timezone.now().timestamp())
-    
-    # Create deterministic random number generator
-    hash_input = f"{seed}_{game_type}"
-    hash_value = hashlib.sha256(hash_input.encode()).hexdigest()
-    random.seed(hash_value)
-    
-    if game_type == 'dice':
-        return {'number': random.randint(1, 6)}
-        
-    elif game_type == 'coin':
-        return {'side': random.choice(['heads', 'tails'])}
-        
-    elif game_type == 'roulette':
-        return {'number': random.randint(0, 36)}
-        
-    return None
+        server_seed = secrets.token_hex(32)
+    else:
+        # Same seed, same result; no shared random state is touched
+        server_seed = hashlib.sha256(str(seed).encode()).hexdigest()
+
+    return FairRNG(server_seed, game_type).result(game_type)
 
 def calculate_win_amount(bet_amount, total_pool, winning_bets_total):
     """Calculate win amount with proper decimal handling"""
@@ -112,21 +102,8 @@ def calculate_win_multiplier(game_type, bet_data):
 
 def get_game_stats(game):
     """Get game statistics"""
-    total_bets = game.gamblingbet_set.count()
-    unique_players = game.gamblingbet_set.values('user').distinct().count()
-    avg_bet = Decimal('0')
-    if total_bets > 0:
-        avg_bet = game.total_pool / total_bets
-    
-    return {
-        'total_bets': total_bets,
-        'unique_players': unique_players,
-        'average_bet': avg_bet,
-        'total_pool': game.total_pool,
-        'fee_collected': game.gamblingbet_set.aggregate(
-            total_fee=models.Sum('fee_amount')
-        )['total_fee'] or Decimal('0')
-    }
+    from .aggregates import GameAggregateService
+    return GameAggregateService.get_stats(game)
 
 def is_valid_game_duration(start_time, end_time):
     """Validate game duration"""
@@ -149,6 +126,10 @@ def check_bet_result(bet_data, game_result, game_type):
         
     return False
 
+def get_bet_option_key(bet_data):
+    """Return a canonical key identifying the option a bet was placed on"""
+    return json.dumps(bet_data, sort_keys=True, separators=(',', ':'))
+
 def calculate_fee_amount(amount, fee_percentage):
     """Calculate fee amount for a bet"""
     fee_decimal = Decimal(str(fee_percentage)) / Decimal('100')
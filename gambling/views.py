@@ -4,11 +4,14 @@ from django.contrib import messages
 from django.utils import timezone
 from django.db.models import Sum, Q
 from django.db import transaction
-from django.http import JsonResponse
+from django.http import JsonResponse, Http404
 from django.core.paginator import Paginator
 from .models import GamblingGame, GamblingBet, InvitedGambler, Game, Bet
 from .forms import GamblingGameForm, PlaceBetForm, CreateGameForm
 from .services import GamblingService
+from .aggregates import UserGameStatsService
+from .pools import PoolIndex
+from .cache import GameCache
 from .decorators import (
     require_active_game,
     check_betting_limits,
@@ -47,8 +50,21 @@ class GamblingViews:
     @login_required
     def game_list(request):
         """Display list of gambling games"""
-        games = Game.objects.all()
-        return render(request, 'gambling/game_list.html', {'games': games})
+        status = request.GET.get('status', 'active')
+        
+        games = GamblingGame.objects.with_stats()
+        if status != 'all':
+            games = games.filter(status=status)
+        
+        paginator = Paginator(games.order_by('-created_at'), 30)
+        games = paginator.get_page(request.GET.get('page'))
+        # One grouped query for the user's stats on every card of the page
+        games.object_list = UserGameStatsService.attach(request.user, games.object_list)
+        
+        return render(request, 'gambling/game_list.html', {
+            'games': games,
+            'status': status
+        })
 
     @staticmethod
     @login_required
@@ -106,10 +122,16 @@ class GamblingViews:
     @login_required
     def game_detail(request, game_id):
         """Display game details and betting form"""
-        game = get_object_or_404(
-            GamblingGame.objects.with_stats(),
-            id=game_id
-        )
+        if request.method == 'POST':
+            # Bets are checked against the current row, not a cached copy
+            game = get_object_or_404(
+                GamblingGame.objects.with_stats(),
+                id=game_id
+            )
+        else:
+            game = GameCache.get(game_id)
+            if game is None:
+                raise Http404("Game not found")
         
         user_bets = GamblingBet.objects.filter(
             game=game,
@@ -128,7 +150,8 @@ class GamblingViews:
                             game=game,
                             user=request.user,
                             amount=form.cleaned_data['amount'],
-                            bet_data=form.cleaned_data['bet_data']
+                            bet_data=form.cleaned_data['bet_data'],
+                            client_seed=form.cleaned_data.get('client_seed')
                         )
                     messages.success(request, "Bet placed successfully!")
                     return redirect('gambling:game_detail', game_id=game.id)
@@ -140,7 +163,8 @@ class GamblingViews:
         return render(request, 'gambling/game_detail.html', {
             'game': game,
             'form': form,
-            'user_bets': user_bets
+            'user_bets': user_bets,
+            'odds': PoolIndex.get_odds(game)
         })
 
     @staticmethod
@@ -197,7 +221,8 @@ class GamblingViews:
                 game=game,
                 user=request.user,
                 amount=amount,
-                bet_data=bet_data
+                bet_data=bet_data,
+                client_seed=data.get('client_seed')
             )
             
             return JsonResponse({
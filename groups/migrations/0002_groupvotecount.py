@@ -0,0 +1,57 @@
+# Generated by Django 4.2.17 on 2026-10-18 15:30
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def backfill_counts(apps, schema_editor):
+    GroupVoteResponse = apps.get_model("groups", "GroupVoteResponse")
+    GroupVoteCount = apps.get_model("groups", "GroupVoteCount")
+    GroupVoteCount.objects.bulk_create(
+        GroupVoteCount(
+            vote_id=row["vote_id"], option=row["selected_option"], count=row["total"]
+        )
+        for row in GroupVoteResponse.objects.values("vote_id", "selected_option").annotate(
+            total=Count("id")
+        ).order_by()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("groups", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GroupVoteCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("option", models.CharField(max_length=200)),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "vote",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="counts",
+                        to="groups.groupvote",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "group_vote_counts",
+                "unique_together": {("vote", "option")},
+            },
+        ),
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
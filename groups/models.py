@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from decimal import Decimal
 
@@ -74,6 +74,35 @@ class GroupVoteResponse(models.Model):
         db_table = 'group_vote_responses'
         unique_together = ['vote', 'user']
 
+    def save(self, *args, **kwargs):
+        from .tallies import GroupVoteTally
+
+        with transaction.atomic():
+            previous = None
+            if self.pk and not self._state.adding:
+                previous = GroupVoteResponse.objects.filter(pk=self.pk).values_list(
+                    'selected_option', flat=True
+                ).first()
+            super().save(*args, **kwargs)
+            GroupVoteTally.record(self.vote_id, removed=previous, added=self.selected_option)
+
+    def delete(self, *args, **kwargs):
+        from .tallies import GroupVoteTally
+
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            GroupVoteTally.record(self.vote_id, removed=self.selected_option)
+        return result
+
+class GroupVoteCount(models.Model):
+    vote = models.ForeignKey(GroupVote, on_delete=models.CASCADE, related_name='counts')
+    option = models.CharField(max_length=200)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'group_vote_counts'
+        unique_together = ['vote', 'option']
+
 class GroupFund(models.Model):
     group = models.ForeignKey(Group, on_delete=models.CASCADE)
     name = models.CharField(max_length=200)
@@ -2,6 +2,7 @@ from django.core.mail import send_mass_mail
 from django.conf import settings
 from django.utils import timezone
 from .models import Group, GroupMember, GroupVote, GroupVoteResponse
+from .tallies import GroupVoteTally
 
 class GroupService:
     @staticmethod
@@ -54,10 +55,4 @@ class GroupService:
     @staticmethod
     def calculate_vote_results(vote):
         """Calculate the results of a group vote"""
-        responses = GroupVoteResponse.objects.filter(vote=vote)
-        results = {}
-        
-        for response in responses:
-            results[response.selected_option] = results.get(response.selected_option, 0) + 1
-            
-        return results 
\ No newline at end of file
+        return GroupVoteTally.counts(vote)
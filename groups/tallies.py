@@ -0,0 +1,83 @@
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+import logging
+
+logger = logging.getLogger(__name__)
+
+class GroupVoteTally:
+    """Per-option response counters for group votes.
+
+    ``GroupVoteResponse.save`` and ``delete`` keep the counters current,
+    so live results are read in one query per vote. Votes without counter
+    rows fall back to one grouped ``COUNT``. Watchers of
+    ``group_name(vote_id)`` get the new results after each change commits.
+    """
+
+    @staticmethod
+    def group_name(vote_id):
+        return f'group_vote_{vote_id}'
+
+    @staticmethod
+    def record(vote_id, removed=None, added=None):
+        """Move one response from ``removed`` to ``added``; either may be ``None``"""
+        if removed == added:
+            return
+        if removed:
+            GroupVoteTally._increment(vote_id, removed, -1)
+        if added:
+            GroupVoteTally._increment(vote_id, added, 1)
+        transaction.on_commit(lambda: GroupVoteTally.publish(vote_id))
+
+    @staticmethod
+    def _increment(vote_id, option, delta):
+        from .models import GroupVoteCount
+
+        counters = GroupVoteCount.objects.filter(vote_id=vote_id, option=option)
+        if counters.update(count=F('count') + delta) or delta < 0:
+            return
+        try:
+            with transaction.atomic():
+                GroupVoteCount.objects.create(vote_id=vote_id, option=option, count=delta)
+        except IntegrityError:
+            # Another response created the row first
+            counters.update(count=F('count') + delta)
+
+    @staticmethod
+    def counts(vote):
+        """Return ``{option: responses}`` for options chosen at least once"""
+        from .models import GroupVoteCount, GroupVoteResponse
+
+        vote_id = getattr(vote, 'pk', vote)
+        counts = dict(
+            GroupVoteCount.objects.filter(
+                vote_id=vote_id,
+                count__gt=0
+            ).values_list('option', 'count')
+        )
+        if counts:
+            return counts
+
+        return dict(
+            GroupVoteResponse.objects.filter(vote_id=vote_id).values(
+                'selected_option'
+            ).annotate(
+                total=Count('id')
+            ).values_list('selected_option', 'total')
+        )
+
+    @staticmethod
+    def publish(vote_id):
+        counts = GroupVoteTally.counts(vote_id)
+        try:
+            async_to_sync(get_channel_layer().group_send)(
+                GroupVoteTally.group_name(vote_id),
+                {
+                    'type': 'tally_update',
+                    'counts': counts,
+                    'total': sum(counts.values()),
+                }
+            )
+        except Exception as e:
+            logger.error(f"Error publishing results for group vote {vote_id}: {e}")
@@ -0,0 +1,56 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from unittest.mock import patch
+from ..models import Group, GroupVote, GroupVoteCount, GroupVoteResponse
+from ..tallies import GroupVoteTally
+
+User = get_user_model()
+
+class GroupVoteTallyTest(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', password='testpass123')
+        self.members = [
+            User.objects.create_user(username=f'member{i}', password='testpass123')
+            for i in range(3)
+        ]
+        self.group = Group.objects.create(name='Test Group', manager=self.manager)
+        self.vote = GroupVote.objects.create(
+            group=self.group,
+            title='Test Vote',
+            description='Test Description',
+            options=['yes', 'no'],
+            creator=self.manager,
+            deadline=timezone.now() + timezone.timedelta(days=1)
+        )
+
+    def respond(self, user, option):
+        return GroupVoteResponse.objects.create(vote=self.vote, user=user, selected_option=option)
+
+    def test_counters_follow_responses(self):
+        first = self.respond(self.members[0], 'yes')
+        self.respond(self.members[1], 'yes')
+        self.respond(self.members[2], 'no')
+        self.assertEqual(GroupVoteTally.counts(self.vote), {'yes': 2, 'no': 1})
+
+        first.selected_option = 'no'
+        first.save()
+        self.assertEqual(GroupVoteTally.counts(self.vote), {'yes': 1, 'no': 2})
+
+        first.delete()
+        self.assertEqual(GroupVoteTally.counts(self.vote), {'yes': 1, 'no': 1})
+
+    def test_counts_fall_back_to_responses_without_counters(self):
+        self.respond(self.members[0], 'yes')
+        self.respond(self.members[1], 'no')
+        GroupVoteCount.objects.all().delete()
+
+        self.assertEqual(GroupVoteTally.counts(self.vote.pk), {'yes': 1, 'no': 1})
+
+    @patch('groups.tallies.GroupVoteTally.publish')
+    def test_publishes_after_commit(self, mock_publish):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.respond(self.members[0], 'yes')
+            mock_publish.assert_not_called()
+
+        mock_publish.assert_called_once_with(self.vote.pk)
@@ -0,0 +1,21 @@
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+
+# Backends whose state is private to one process, or not kept at all
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+def require_shared_cache(purpose, alias='default'):
+    """Raise ``ImproperlyConfigured`` unless the cache is shared between processes
+
+    Rate limits, wallet nonces and cache versions are only correct if every
+    web and worker process reads and writes the same keys.
+    """
+    backend = caches[alias]
+    if isinstance(backend, PROCESS_LOCAL_BACKENDS):
+        raise ImproperlyConfigured(
+            f"{purpose} need a cache shared by all processes, but CACHES['{alias}'] "
+            f"uses {type(backend).__name__}. Configure django_redis.cache.RedisCache."
+        )
+    return backend
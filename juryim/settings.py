@@ -139,10 +139,26 @@ LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'home'
 LOGOUT_REDIRECT_URL = 'users:login'
 
-# Add channel layers configuration
+# Shared cache; rate limits, wallet nonces and game cache versions must be
+# visible to every web and worker process
+CACHES = {
+    "default": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": "redis://localhost:6379/1",
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+        }
+    }
+}
+
+# Add channel layers configuration; Redis-backed so frames published from
+# Celery workers reach consumers in the ASGI process
 CHANNEL_LAYERS = {
     "default": {
-        "BACKEND": "channels.layers.InMemoryChannelLayer"
+        "BACKEND": "channels_redis.core.RedisChannelLayer",
+        "CONFIG": {
+            "hosts": ["redis://localhost:6379/2"],
+        }
     }
 }
 
@@ -163,6 +179,10 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'financial.tasks.check_deposit_confirmations',
         'schedule': 60.0,  # Run every 60 seconds
     },
+    'scan_deposit_blocks': {
+        'task': 'financial.tasks.scan_deposit_blocks',
+        'schedule': 30.0,  # Run every 30 seconds
+    },
     'process_withdrawals': {
         'task': 'financial.tasks.process_pending_withdrawals',
         'schedule': 60.0,  # Run every 60 seconds
@@ -171,6 +191,10 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'financial.tasks.monitor_system',
         'schedule': 300.0,  # Run every 5 minutes
     },
+    'take_balance_snapshots': {
+        'task': 'financial.tasks.take_balance_snapshots',
+        'schedule': 3600.0,  # Run every hour
+    },
 }
 
 # Blockchain API Settings
@@ -179,6 +203,8 @@ ETH_CHAIN_ID = 1  # 1 for mainnet, 3 for ropsten, etc.
 ETH_WALLET_ADDRESS = 'YOUR_ETH_WALLET_ADDRESS'
 ETH_PRIVATE_KEY = 'YOUR_ETH_PRIVATE_KEY'
 ETHEREUM_RPC_URL = 'https://mainnet.infura.io/v3/YOUR_PROJECT_ID'
+BLOCKCHAIN_TIMEOUT = 10  # Seconds per node request
+BLOCKCHAIN_MAX_CONNECTIONS = 10  # Concurrent requests per network
 
 # USDT Contract Settings (TRC20)
 TRON_API_URL = 'https://api.trongrid.io'
@@ -219,6 +245,7 @@ DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 # Notification Settings
 WITHDRAWAL_NOTIFICATIONS = True
 ADMIN_EMAIL = 'admin@example.com'
+SITE_URL = 'http://localhost:8000'  # Update with your public URL, used for links in emails
 
 # Override settings with local configuration if it exists
 try:
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.17 on 2026-10-18 15:30
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def backfill_counts(apps, schema_editor):
+    ArbitrationVote = apps.get_model("tasks", "ArbitrationVote")
+    ArbitrationVoteCount = apps.get_model("tasks", "ArbitrationVoteCount")
+    ArbitrationVoteCount.objects.bulk_create(
+        ArbitrationVoteCount(task_id=row["task_id"], option=row["vote"], count=row["total"])
+        for row in ArbitrationVote.objects.values("task_id", "vote").annotate(
+            total=Count("id")
+        ).order_by()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArbitrationVoteCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("option", models.CharField(max_length=10)),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "task",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="vote_counts",
+                        to="tasks.arbitrationtask",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("task", "option")},
+            },
+        ),
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
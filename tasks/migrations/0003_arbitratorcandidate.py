@@ -0,0 +1,60 @@
+# Generated by Django 4.2.17 on 2026-10-18 21:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_pool(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    ArbitratorCandidate = apps.get_model("tasks", "ArbitratorCandidate")
+    users = User.objects.filter(is_active=True, credit_score__gte=100).order_by(
+        "id"
+    ).values_list("id", "credit_score")
+    ArbitratorCandidate.objects.bulk_create(
+        ArbitratorCandidate(user_id=user_id, rank=rank, credit_score=score)
+        for rank, (user_id, score) in enumerate(users.iterator(), start=1)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("tasks", "0002_arbitrationvotecount"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArbitratorCandidate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("rank", models.PositiveIntegerField(unique=True)),
+                ("credit_score", models.IntegerField()),
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="arbitrator_candidate",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["credit_score"], name="tasks_arbit_credit__cc891d_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(build_pool, migrations.RunPython.noop),
+    ]
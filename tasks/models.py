@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 
 class Task(models.Model):
@@ -114,3 +114,62 @@ class ArbitrationVote(models.Model):
 
     def __str__(self):
         return f"{self.arbitrator.username}'s vote on {self.task.title}"
+
+    def save(self, *args, **kwargs):
+        from .tallies import ArbitrationTally
+
+        with transaction.atomic():
+            previous = None
+            if self.pk and not self._state.adding:
+                previous = ArbitrationVote.objects.filter(pk=self.pk).values_list(
+                    'vote', flat=True
+                ).first()
+            super().save(*args, **kwargs)
+            ArbitrationTally.record(self.task_id, removed=previous, added=self.vote)
+
+    def delete(self, *args, **kwargs):
+        from .tallies import ArbitrationTally
+
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            ArbitrationTally.record(self.task_id, removed=self.vote)
+        return result
+
+class ArbitrationVoteCount(models.Model):
+    """Running number of votes per option on an arbitration task"""
+    task = models.ForeignKey(
+        ArbitrationTask,
+        on_delete=models.CASCADE,
+        related_name='vote_counts'
+    )
+    option = models.CharField(max_length=10)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('task', 'option')
+
+    def __str__(self):
+        return f"{self.task_id}: {self.option} = {self.count}"
+
+class ArbitratorCandidate(models.Model):
+    """A user who may be drawn as an arbitrator, under a dense rank
+
+    ``ArbitratorPool`` keeps one row per active user with a high enough
+    credit score, and keeps ranks close to ``1..N`` when rows leave, so a
+    uniform draw is a random rank and one primary key lookup.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='arbitrator_candidate'
+    )
+    rank = models.PositiveIntegerField(unique=True)
+    credit_score = models.IntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['credit_score']),
+        ]
+
+    def __str__(self):
+        return f"#{self.rank}: user {self.user_id}"
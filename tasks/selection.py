@@ -0,0 +1,176 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+from users.models import User
+from .models import ArbitrationVote, ArbitratorCandidate
+import random
+
+class ArbitratorPool:
+    """Keeps ``ArbitratorCandidate`` in step with users' eligibility.
+
+    Active users with at least ``MIN_CREDIT_SCORE`` hold one densely ranked
+    row. A leaving user's rank is taken over by the current last row, so
+    ranks stay ``1..N``; a rank freed by a deleted user or a race is only
+    a hole that draws skip.
+    """
+
+    MIN_CREDIT_SCORE = 100
+
+    @staticmethod
+    def qualifies(user):
+        return user.is_active and user.credit_score >= ArbitratorPool.MIN_CREDIT_SCORE
+
+    @staticmethod
+    def sync(user):
+        """Add, update or remove ``user`` after a change to their account"""
+        if ArbitratorPool.qualifies(user):
+            ArbitratorPool.add(user.pk, user.credit_score)
+        else:
+            ArbitratorPool.remove(user.pk)
+
+    @staticmethod
+    def add(user_id, credit_score):
+        if ArbitratorCandidate.objects.filter(user_id=user_id).update(credit_score=credit_score):
+            return
+        for _ in range(3):
+            try:
+                with transaction.atomic():
+                    last = ArbitratorCandidate.objects.aggregate(rank=Max('rank'))['rank'] or 0
+                    ArbitratorCandidate.objects.create(
+                        user_id=user_id,
+                        rank=last + 1,
+                        credit_score=credit_score
+                    )
+                return
+            except IntegrityError:
+                # Another add took the rank, or this user, first
+                if ArbitratorCandidate.objects.filter(user_id=user_id).exists():
+                    return
+
+    @staticmethod
+    @transaction.atomic
+    def remove(user_id):
+        candidate = ArbitratorCandidate.objects.select_for_update().filter(
+            user_id=user_id
+        ).first()
+        if candidate is None:
+            return
+        candidate.delete()
+
+        last = ArbitratorCandidate.objects.select_for_update().order_by('-rank').first()
+        if last is not None and last.rank > candidate.rank:
+            ArbitratorCandidate.objects.filter(pk=last.pk).update(rank=candidate.rank)
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild():
+        """Recreate the pool from the users table with ranks ``1..N``"""
+        ArbitratorCandidate.objects.all().delete()
+        users = User.objects.filter(
+            is_active=True,
+            credit_score__gte=ArbitratorPool.MIN_CREDIT_SCORE
+        ).order_by('id').values_list('id', 'credit_score')
+        ArbitratorCandidate.objects.bulk_create(
+            ArbitratorCandidate(user_id=user_id, rank=rank, credit_score=score)
+            for rank, (user_id, score) in enumerate(users.iterator(), start=1)
+        )
+
+class ArbitratorSelector:
+    """Draws arbitrators from ``ArbitratorCandidate`` without loading users.
+
+    Each draw is a random rank looked up by primary key, so every candidate
+    is equally likely however ids are spread. Weighted draws accept a
+    candidate with probability ``credit_score / highest score``, which
+    makes picks exactly proportional to credit score. Candidates are then
+    checked against the task's margin and existing votes in one query per
+    round. If too few draws succeed, because eligible users are rare, the
+    remaining picks come from a scan of the eligible users.
+    """
+
+    MIN_CREDIT_SCORE = ArbitratorPool.MIN_CREDIT_SCORE
+    # Draws per requested arbitrator before falling back to a scan
+    MAX_DRAWS = 20
+
+    @staticmethod
+    def eligible(arbitration_task, margin=None):
+        """Users who may arbitrate ``arbitration_task`` and are not on it yet"""
+        margin = margin if margin is not None else arbitration_task.margin_requirement
+        users = User.objects.filter(
+            is_active=True,
+            credit_score__gte=ArbitratorSelector.MIN_CREDIT_SCORE,
+            financialaccount__balance__gte=margin
+        ).exclude(
+            id__in=ArbitrationVote.objects.filter(
+                task=arbitration_task
+            ).values('arbitrator_id')
+        )
+        if arbitration_task.arbitrator_id:
+            users = users.exclude(id=arbitration_task.arbitrator_id)
+        return users
+
+    @staticmethod
+    def _draw(high, top_score, chosen, weighted):
+        """One random rank; returns a user id or ``None`` for a miss"""
+        row = ArbitratorCandidate.objects.filter(
+            rank=random.randint(1, high)
+        ).values_list('user_id', 'credit_score').first()
+        if row is None or row[0] in chosen:
+            return None
+        if weighted and random.random() * top_score >= max(row[1], 1):
+            return None
+        return row[0]
+
+    @staticmethod
+    def _scan(users, chosen, count, weighted):
+        """Pick from every remaining eligible user; only for sparse pools"""
+        candidates = list(users.exclude(id__in=chosen).values_list('id', 'credit_score'))
+        picks = []
+        while candidates and len(picks) < count:
+            if weighted:
+                weights = [max(score, 1) for _, score in candidates]
+                index = random.choices(range(len(candidates)), weights=weights)[0]
+            else:
+                index = random.randrange(len(candidates))
+            picks.append(candidates.pop(index)[0])
+        return picks
+
+    @staticmethod
+    def select(arbitration_task, count=None, weighted=True, margin=None):
+        """Return up to ``count`` distinct eligible users in random order
+
+        With ``weighted``, users are picked in proportion to their credit
+        score.
+        """
+        count = count if count is not None else arbitration_task.required_arbitrators
+        if count <= 0:
+            return []
+        pool = ArbitratorCandidate.objects.aggregate(high=Max('rank'), top=Max('credit_score'))
+        if not pool['high']:
+            return []
+
+        users = ArbitratorSelector.eligible(arbitration_task, margin)
+        chosen = []
+        rejected = set()
+        draws = count * ArbitratorSelector.MAX_DRAWS
+        while len(chosen) < count and draws > 0:
+            drawn = []
+            while len(drawn) < count - len(chosen) and draws > 0:
+                draws -= 1
+                picked = ArbitratorSelector._draw(
+                    pool['high'], pool['top'], set(chosen) | rejected | set(drawn), weighted
+                )
+                if picked is not None:
+                    drawn.append(picked)
+            if not drawn:
+                break
+            # Margin, votes and the assigned arbitrator are checked per task
+            ok = set(users.filter(id__in=drawn).values_list('id', flat=True))
+            chosen.extend(user_id for user_id in drawn if user_id in ok)
+            rejected.update(user_id for user_id in drawn if user_id not in ok)
+
+        if len(chosen) < count:
+            chosen.extend(ArbitratorSelector._scan(
+                users, chosen, count - len(chosen), weighted
+            ))
+
+        by_id = User.objects.in_bulk(chosen)
+        return [by_id[user_id] for user_id in chosen if user_id in by_id]
@@ -2,8 +2,9 @@ from django.core.mail import send_mass_mail
 from django.utils import timezone
 from django.db.models import Q
 from .models import Task, ArbitrationTask, ArbitrationVote
+from .selection import ArbitratorSelector
+from .tallies import ArbitrationTally
 from users.models import User
-import random
 
 class TaskService:
     @staticmethod
@@ -29,22 +30,10 @@ class TaskService:
         return int(task.planned_participants / avg_response_rate)
 
     @staticmethod
-    def select_arbitrators(arbitration_task):
+    def select_arbitrators(arbitration_task, weighted=True):
         """Select random arbitrators based on criteria"""
-        eligible_users = User.objects.filter(
-            credit_score__gte=100,  # Basic score requirement
-            financialaccount__balance__gte=arbitration_task.margin_requirement
-        ).exclude(
-            arbitrationvote__arbitration=arbitration_task
-        )
-        
-        required_count = arbitration_task.required_arbitrators
-        selected_users = random.sample(
-            list(eligible_users),
-            min(required_count, len(eligible_users))
-        )
-        
-        return selected_users
+        # Samples in the database instead of loading every eligible user
+        return ArbitratorSelector.select(arbitration_task, weighted=weighted)
 
     @staticmethod
     def notify_arbitrators(arbitration_task, arbitrators):
@@ -71,18 +60,5 @@ class TaskService:
     @staticmethod
     def calculate_arbitration_result(arbitration_task):
         """Calculate final arbitration result based on 2/3 majority rule"""
-        votes = ArbitrationVote.objects.filter(arbitration=arbitration_task)
-        total_votes = votes.count()
-        
-        if total_votes == 0:
-            return 'uncertain'
-            
-        vote_counts = {}
-        for vote in votes:
-            vote_counts[vote.vote_option] = vote_counts.get(vote.vote_option, 0) + 1
-            
-        for option, count in vote_counts.items():
-            if count >= (total_votes * 2/3):
-                return option
-                
-        return 'uncertain' 
\ No newline at end of file
+        # Reads the per-option counters instead of every vote
+        return ArbitrationTally.result(arbitration_task)
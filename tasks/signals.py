@@ -0,0 +1,11 @@
+from django.conf import settings
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from .selection import ArbitratorPool
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def sync_arbitrator_pool(sender, instance, update_fields=None, **kwargs):
+    """Keep the user's arbitrator candidate row in step with their account"""
+    if update_fields is not None and not {'is_active', 'credit_score'} & set(update_fields):
+        return
+    ArbitratorPool.sync(instance)
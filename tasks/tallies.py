@@ -0,0 +1,98 @@
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ArbitrationTally:
+    """Per-option vote counters for arbitration tasks.
+
+    ``ArbitrationVote.save`` and ``delete`` move the counters as votes are
+    cast, changed or withdrawn, so reading a tally or deciding the 2/3
+    majority costs one small query per task instead of loading every
+    vote. Tasks without counter rows fall back to one grouped ``COUNT``.
+    Watchers of ``group_name(task_id)`` get the new tally after each
+    change commits.
+    """
+
+    MAJORITY = 2 / 3
+
+    @staticmethod
+    def group_name(task_id):
+        return f'arbitration_tally_{task_id}'
+
+    @staticmethod
+    def record(task_id, removed=None, added=None):
+        """Move one vote from ``removed`` to ``added``; either may be ``None``"""
+        if removed == added:
+            return
+        if removed:
+            ArbitrationTally._increment(task_id, removed, -1)
+        if added:
+            ArbitrationTally._increment(task_id, added, 1)
+        transaction.on_commit(lambda: ArbitrationTally.publish(task_id))
+
+    @staticmethod
+    def _increment(task_id, option, delta):
+        from .models import ArbitrationVoteCount
+
+        counters = ArbitrationVoteCount.objects.filter(task_id=task_id, option=option)
+        if counters.update(count=F('count') + delta) or delta < 0:
+            return
+        try:
+            with transaction.atomic():
+                ArbitrationVoteCount.objects.create(task_id=task_id, option=option, count=delta)
+        except IntegrityError:
+            # Another vote created the row first
+            counters.update(count=F('count') + delta)
+
+    @staticmethod
+    def counts(task):
+        """Return ``{option: votes}`` for options with at least one vote"""
+        from .models import ArbitrationVote, ArbitrationVoteCount
+
+        task_id = getattr(task, 'pk', task)
+        counts = dict(
+            ArbitrationVoteCount.objects.filter(
+                task_id=task_id,
+                count__gt=0
+            ).values_list('option', 'count')
+        )
+        if counts:
+            return counts
+
+        return dict(
+            ArbitrationVote.objects.filter(task_id=task_id).values('vote').annotate(
+                total=Count('id')
+            ).values_list('vote', 'total')
+        )
+
+    @staticmethod
+    def result(task):
+        """The option with at least 2/3 of the votes, or ``'uncertain'``"""
+        counts = ArbitrationTally.counts(task)
+        total = sum(counts.values())
+        if total == 0:
+            return 'uncertain'
+
+        for option, count in counts.items():
+            if count >= total * ArbitrationTally.MAJORITY:
+                return option
+        return 'uncertain'
+
+    @staticmethod
+    def publish(task_id):
+        counts = ArbitrationTally.counts(task_id)
+        try:
+            async_to_sync(get_channel_layer().group_send)(
+                ArbitrationTally.group_name(task_id),
+                {
+                    'type': 'tally_update',
+                    'counts': counts,
+                    'total': sum(counts.values()),
+                }
+            )
+        except Exception as e:
+            logger.error(f"Error publishing arbitration tally for task {task_id}: {e}")
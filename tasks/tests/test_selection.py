@@ -0,0 +1,107 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from decimal import Decimal
+from unittest.mock import patch
+import random
+from financial.models import FinancialAccount
+from ..models import ArbitrationTask, ArbitrationVote, ArbitratorCandidate
+from ..selection import ArbitratorPool, ArbitratorSelector
+
+User = get_user_model()
+
+class ArbitratorSelectorTest(TestCase):
+    def setUp(self):
+        self.creator = self.user('creator', balance='0')
+        self.task = ArbitrationTask.objects.create(
+            title='Test Task',
+            description='Test Description',
+            creator=self.creator
+        )
+
+    def user(self, username, credit_score=100, balance='50.00', is_active=True):
+        user = User.objects.create_user(
+            username=username,
+            password='testpass123',
+            credit_score=credit_score,
+            is_active=is_active
+        )
+        FinancialAccount.objects.create(user=user, balance=Decimal(balance))
+        return user
+
+    def test_eligible_filters_and_excludes_task_members(self):
+        eligible = self.user('eligible')
+        voter = self.user('voter')
+        assigned = self.user('assigned')
+        self.user('low_credit', credit_score=ArbitratorSelector.MIN_CREDIT_SCORE - 1)
+        self.user('poor', balance='5.00')
+        self.user('inactive', is_active=False)
+        ArbitrationVote.objects.create(task=self.task, arbitrator=voter, vote='approve')
+        self.task.arbitrator = assigned
+        self.task.save()
+
+        users = ArbitratorSelector.eligible(self.task, margin=Decimal('10.00'))
+        self.assertEqual(list(users), [eligible])
+
+    def test_select_returns_distinct_users_up_to_count(self):
+        users = {self.user(f'arbitrator{i}') for i in range(5)}
+
+        picked = ArbitratorSelector.select(self.task, count=3, margin=Decimal('10.00'))
+        self.assertEqual(len(picked), 3)
+        self.assertEqual(len(set(picked)), 3)
+        self.assertTrue(set(picked) <= users)
+
+        picked = ArbitratorSelector.select(self.task, count=10, margin=Decimal('10.00'))
+        self.assertEqual(set(picked), users)
+
+    def test_pool_keeps_ranks_dense(self):
+        users = [self.user(f'arbitrator{i}') for i in range(4)]
+        self.user('low_credit', credit_score=ArbitratorPool.MIN_CREDIT_SCORE - 1)
+        self.user('inactive', is_active=False)
+        self.assertEqual(ArbitratorCandidate.objects.count(), 5)
+
+        users[1].credit_score = 0
+        users[1].save()
+
+        ranks = sorted(ArbitratorCandidate.objects.values_list('rank', flat=True))
+        self.assertEqual(ranks, [1, 2, 3, 4])
+        self.assertFalse(ArbitratorCandidate.objects.filter(user=users[1]).exists())
+
+        users[2].credit_score = 500
+        users[2].save()
+        self.assertEqual(ArbitratorCandidate.objects.get(user=users[2]).credit_score, 500)
+
+        ArbitratorPool.rebuild()
+        self.assertEqual(
+            sorted(ArbitratorCandidate.objects.values_list('rank', flat=True)),
+            [1, 2, 3, 4]
+        )
+
+    def test_weighted_draw_accepts_in_proportion_to_score(self):
+        low = self.user('low', credit_score=100)
+        high = self.user('high', credit_score=900)
+        low_rank = ArbitratorCandidate.objects.get(user=low).rank
+        high_rank = ArbitratorCandidate.objects.get(user=high).rank
+
+        with patch.object(random, 'random', return_value=0.5):
+            with patch.object(random, 'randint', return_value=low_rank):
+                self.assertIsNone(ArbitratorSelector._draw(high_rank, 900, set(), True))
+                self.assertEqual(ArbitratorSelector._draw(high_rank, 900, set(), False), low.id)
+            with patch.object(random, 'randint', return_value=high_rank):
+                self.assertEqual(ArbitratorSelector._draw(high_rank, 900, set(), True), high.id)
+
+    def test_draws_skip_rank_holes(self):
+        kept = self.user('kept')
+        gone = self.user('gone')
+        ArbitratorCandidate.objects.filter(user=gone).delete()
+
+        picked = ArbitratorSelector.select(self.task, count=2, margin=Decimal('10.00'))
+        self.assertEqual(picked, [kept])
+
+    def test_sparse_eligibility_falls_back_to_scan(self):
+        for i in range(30):
+            self.user(f'poor{i}', balance='0')
+        rich = self.user('rich')
+
+        # Draws mostly hit users short of the margin; the scan still finds one
+        picked = ArbitratorSelector.select(self.task, count=1, margin=Decimal('10.00'))
+        self.assertEqual(picked, [rich])
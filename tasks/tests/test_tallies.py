@@ -0,0 +1,61 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from unittest.mock import patch
+from ..models import ArbitrationTask, ArbitrationVote, ArbitrationVoteCount
+from ..tallies import ArbitrationTally
+
+User = get_user_model()
+
+class ArbitrationTallyTest(TestCase):
+    def setUp(self):
+        self.creator = User.objects.create_user(username='creator', password='testpass123')
+        self.arbitrators = [
+            User.objects.create_user(username=f'arbitrator{i}', password='testpass123')
+            for i in range(3)
+        ]
+        self.task = ArbitrationTask.objects.create(
+            title='Test Task',
+            description='Test Description',
+            creator=self.creator
+        )
+
+    def vote(self, arbitrator, option):
+        return ArbitrationVote.objects.create(task=self.task, arbitrator=arbitrator, vote=option)
+
+    def test_counters_follow_votes(self):
+        first = self.vote(self.arbitrators[0], 'approve')
+        self.vote(self.arbitrators[1], 'approve')
+        self.vote(self.arbitrators[2], 'reject')
+        self.assertEqual(ArbitrationTally.counts(self.task), {'approve': 2, 'reject': 1})
+
+        first.vote = 'reject'
+        first.save()
+        self.assertEqual(ArbitrationTally.counts(self.task), {'approve': 1, 'reject': 2})
+
+        first.delete()
+        self.assertEqual(ArbitrationTally.counts(self.task), {'approve': 1, 'reject': 1})
+
+    def test_counts_fall_back_to_votes_without_counters(self):
+        self.vote(self.arbitrators[0], 'approve')
+        self.vote(self.arbitrators[1], 'reject')
+        ArbitrationVoteCount.objects.all().delete()
+
+        self.assertEqual(ArbitrationTally.counts(self.task.pk), {'approve': 1, 'reject': 1})
+
+    def test_result_needs_two_thirds(self):
+        self.assertEqual(ArbitrationTally.result(self.task), 'uncertain')
+
+        self.vote(self.arbitrators[0], 'approve')
+        self.vote(self.arbitrators[1], 'reject')
+        self.assertEqual(ArbitrationTally.result(self.task), 'uncertain')
+
+        self.vote(self.arbitrators[2], 'approve')
+        self.assertEqual(ArbitrationTally.result(self.task), 'approve')
+
+    @patch('tasks.tallies.ArbitrationTally.publish')
+    def test_publishes_after_commit(self, mock_publish):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.vote(self.arbitrators[0], 'approve')
+            mock_publish.assert_not_called()
+
+        mock_publish.assert_called_once_with(self.task.pk)
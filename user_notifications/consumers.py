@@ -19,4 +19,31 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         await self.send(text_data=json.dumps({
             'type': 'notification_update',
             'unread_count': event['unread_count']
-        })) 
\ No newline at end of file
+        })) 
+class TallyConsumer(AsyncWebsocketConsumer):
+    """Streams live vote counts for an arbitration task or a group vote"""
+
+    async def connect(self):
+        if not self.scope['user'].is_authenticated:
+            await self.close()
+            return
+
+        kind = self.scope['url_route']['kwargs']['kind']
+        target_id = self.scope['url_route']['kwargs']['target_id']
+        self.tally_group = (
+            f"arbitration_tally_{target_id}" if kind == 'arbitration'
+            else f"group_vote_{target_id}"
+        )
+        await self.channel_layer.group_add(self.tally_group, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, close_code):
+        if hasattr(self, 'tally_group'):
+            await self.channel_layer.group_discard(self.tally_group, self.channel_name)
+
+    async def tally_update(self, event):
+        await self.send(text_data=json.dumps({
+            'type': 'tally_update',
+            'counts': event['counts'],
+            'total': event['total']
+        }))
@@ -3,4 +3,8 @@ from . import consumers
 
 websocket_urlpatterns = [
     re_path(r'ws/notifications/$', consumers.NotificationConsumer.as_asgi()),
-] 
\ No newline at end of file
+    re_path(
+        r'ws/tallies/(?P<kind>arbitration|group-vote)/(?P<target_id>\d+)/$',
+        consumers.TallyConsumer.as_asgi()
+    ),
+]
@@ -1,3 +1,41 @@
 from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from channels.testing import WebsocketCommunicator
+from channels.routing import URLRouter
+from channels.layers import get_channel_layer
+from channels.db import database_sync_to_async
+from .routing import websocket_urlpatterns
 
-# Create your tests here.
+User = get_user_model()
+
+class TallyConsumerTest(TestCase):
+    def communicator(self, path, user):
+        communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), path)
+        communicator.scope['user'] = user
+        return communicator
+
+    async def test_streams_tally_updates(self):
+        user = await database_sync_to_async(User.objects.create_user)(
+            username='watcher',
+            password='testpass123'
+        )
+        for kind, group in [('arbitration', 'arbitration_tally_7'), ('group-vote', 'group_vote_7')]:
+            communicator = self.communicator(f'/ws/tallies/{kind}/7/', user)
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+
+            await get_channel_layer().group_send(group, {
+                'type': 'tally_update',
+                'counts': {'yes': 2},
+                'total': 2
+            })
+
+            response = await communicator.receive_json_from()
+            self.assertEqual(response, {'type': 'tally_update', 'counts': {'yes': 2}, 'total': 2})
+            await communicator.disconnect()
+
+    async def test_rejects_anonymous_users(self):
+        communicator = self.communicator('/ws/tallies/arbitration/7/', AnonymousUser())
+        connected, _ = await communicator.connect()
+        self.assertFalse(connected)
@@ -35,20 +35,15 @@ class User(AbstractUser):
     email_verification_token = models.CharField(max_length=100, null=True, blank=True)
 
     def get_total_balance(self):
-        from financial.models import Transaction
-        deposits = Transaction.objects.filter(
-            user=self, 
-            type='deposit', 
-            status='completed'
-        ).aggregate(total=models.Sum('amount'))['total'] or Decimal('0')
-        
-        withdrawals = Transaction.objects.filter(
-            user=self, 
-            type='withdrawal', 
-            status='completed'
-        ).aggregate(total=models.Sum('amount'))['total'] or Decimal('0')
-        
-        return deposits - withdrawals
+        from financial.models import FinancialAccount
+        from financial.snapshots import BalanceSnapshots
+        account = FinancialAccount.objects.filter(user=self).first()
+        if account is None:
+            return Decimal('0')
+
+        # Starts from the newest balance snapshot instead of the full history
+        totals = BalanceSnapshots.totals(account)
+        return totals['total_deposited'] - totals['total_withdrawn']
 
     def get_recent_transactions(self):
         from financial.models import Transaction